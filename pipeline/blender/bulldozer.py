@@ -2,9 +2,19 @@ import bpy
 import math
 import os
 import random
+import sys
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts"))
+from geometry import arc_samples, track_path_extras, track_path_geometry
+from lod import load_lod, lod_count, lod_name, lod_param
+from texture_bake import bake_texture, solid_pixels
+from tracing import counter, span
 
 # --- Configuration ---
 OUTPUT_PATH = os.path.join(os.getcwd(), "assets", "models", "bulldozer_components.glb")
+TEXTURE_DIR = os.path.join(os.getcwd(), "assets", "textures")
+CONFIG_PATH = os.path.join(os.getcwd(), "assets", "configs", "bulldozer_mapping.json")
 
 # --- Helper Functions ---
 def clear_scene():
@@ -15,6 +25,9 @@ def tag_contract(obj, damp_id):
     obj["damp_id"] = damp_id
     print(f"   [CONTRACT] Tagged Object '{obj.name}' as '{damp_id}'")
 
+def tag_lod(obj, level):
+    obj["lod"] = level
+
 def tag_material_contract(mat, damp_id):
     mat["damp_id"] = damp_id
     print(f"   [CONTRACT] Tagged Material '{mat.name}' as '{damp_id}'")
@@ -26,132 +39,146 @@ def apply_transforms(obj):
     bpy.context.view_layer.objects.active = obj
     bpy.ops.object.transform_apply(location=True, rotation=True, scale=True)
 
-def create_track_link(name, material):
+def create_track_link(name, material, grouser=True):
     bpy.ops.mesh.primitive_cube_add(size=1, location=(0, 0, 0))
     link = bpy.context.object
     link.name = name
     link.scale = (0.8, 0.3, 0.05)
-    bpy.ops.mesh.primitive_cube_add(size=1, location=(0, 0, 0.05))
-    grouser = bpy.context.object
-    grouser.scale = (0.8, 0.05, 0.1)
-    grouser.select_set(True); link.select_set(True); bpy.context.view_layer.objects.active = link; bpy.ops.object.join()
+    if grouser:
+        bpy.ops.mesh.primitive_cube_add(size=1, location=(0, 0, 0.05))
+        grouser = bpy.context.object
+        grouser.scale = (0.8, 0.05, 0.1)
+        grouser.select_set(True); link.select_set(True); bpy.context.view_layer.objects.active = link; bpy.ops.object.join()
     link.data.materials.append(material)
     apply_transforms(link)
     return link
 
-def create_track_path(name, radius=1.0, length=4.0):
-    vertices = []
-    # Segment 1: Top (excluding end point)
-    for i in range(8):
-        vertices.append((0, -length/2 + (i/8)*length, radius))
-    # Segment 2: Front semi-circle (excluding end point)
-    for i in range(16):
-        a = (i/16)*math.pi
-        vertices.append((0, length/2 + math.sin(a)*radius, math.cos(a)*radius))
-    # Segment 3: Bottom (excluding end point)
-    for i in range(8):
-        vertices.append((0, length/2 - (i/8)*length, -radius))
-    # Segment 4: Back semi-circle (excluding end point)
-    for i in range(16):
-        a = math.pi + (i/16)*math.pi
-        vertices.append((0, -length/2 + math.sin(a)*radius, math.cos(a)*radius))
-    
+def create_track_path(name, radius=1.0, length=4.0, samples=256):
+    vertices, faces = track_path_geometry(radius, length)
+
     mesh = bpy.data.meshes.new(name + "_Mesh")
-    # Create a single N-gon face to ensure the mesh has a 'primitive' for GLTF export
-    faces = [list(range(len(vertices)))]
     mesh.from_pydata(vertices, [], faces)
     
     obj = bpy.data.objects.new(name, mesh)
     bpy.context.collection.objects.link(obj)
+    # Arc-length table the runtime places links from (exported as node extras)
+    obj["arc_lut"] = track_path_extras(radius, length, samples)
     return obj
 
-def create_idler_wheel(name, radius, width):
-    bpy.ops.mesh.primitive_cylinder_add(radius=radius, depth=width, location=(0,0,0), rotation=(0, math.pi/2, 0))
-    return bpy.context.object
+def create_idler_wheel(name, radius, width, vertices=32):
+    bpy.ops.mesh.primitive_cylinder_add(vertices=vertices, radius=radius, depth=width, location=(0,0,0), rotation=(0, math.pi/2, 0))
+    wheel = bpy.context.object
+    wheel.name = name
+    return wheel
 
 def generate_texture(name, color):
-    width, height = 512, 512
-    img = bpy.data.images.new(name, width=width, height=height)
-    pixels = list(color) * (width * height)
-    img.pixels = pixels
-    img.file_format = 'PNG'
-    path = os.path.join(os.getcwd(), "assets", "textures", f"{name}.png")
-    img.filepath_raw = path
-    img.save()
-    print(f"Generated {path}")
+    # Flat swatch: bake_texture collapses it to a 1x1 PNG
+    with span("bake_texture", cat="blender", texture=name):
+        path, _, _ = bake_texture(name, solid_pixels(color), TEXTURE_DIR)
+    return path
 
 # --- Execution ---
-clear_scene()
-os.makedirs(os.path.join(os.getcwd(), "assets", "textures"), exist_ok=True)
-
-# 1. Materials
-chassis_mat = create_placeholder_material("chassis_mat")
-tag_material_contract(chassis_mat, "chassis")
-track_mat = create_placeholder_material("track_mat")
-tag_material_contract(track_mat, "track_link")
-cabin_mat = create_placeholder_material("cabin_mat")
-tag_material_contract(cabin_mat, "cabin")
-
-# 2. Body
-bpy.ops.mesh.primitive_cube_add(size=1, location=(0, 0, 1.0))
-body = bpy.context.object
-body.name = "Bulldozer_Body"
-body.scale = (2.5, 4.0, 1.5)
-apply_transforms(body) # BAKE SCALE
-body.data.materials.append(chassis_mat)
-tag_contract(body, "chassis")
-
-# 3. Wheels
-wheel_radius, wheel_width = 0.9, 0.5
-track_x, track_l = 1.5, 4.0
-pos = [(track_x, track_l/2, 0), (track_x, -track_l/2, 0), (-track_x, track_l/2, 0), (-track_x, -track_l/2, 0)]
-for i, p in enumerate(pos):
-    w = create_idler_wheel(f"Wheel_{i}", wheel_radius, wheel_width)
-    w.location = p
-    w.data.materials.append(chassis_mat)
-    apply_transforms(w)
+@span("build bulldozer", cat="blender")
+def build(output_path=OUTPUT_PATH):
+    clear_scene()
+    os.makedirs(TEXTURE_DIR, exist_ok=True)
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+
+    # 1. Materials
+    chassis_mat = create_placeholder_material("chassis_mat")
+    tag_material_contract(chassis_mat, "chassis")
+    track_mat = create_placeholder_material("track_mat")
+    tag_material_contract(track_mat, "track_link")
+    cabin_mat = create_placeholder_material("cabin_mat")
+    tag_material_contract(cabin_mat, "cabin")
+
+    # 2. Body
+    bpy.ops.mesh.primitive_cube_add(size=1, location=(0, 0, 1.0))
+    body = bpy.context.object
+    body.name = "Bulldozer_Body"
+    body.scale = (2.5, 4.0, 1.5)
+    apply_transforms(body) # BAKE SCALE
+    body.data.materials.append(chassis_mat)
+    tag_contract(body, "chassis")
+    tag_lod(body, 0)
+
+    # 3. Wheels (LOD levels re-tessellate the cylinder; levels that would not drop any vertices are skipped)
+    lod = load_lod(CONFIG_PATH)
+    wheel_radius, wheel_width = 0.9, 0.5
+    track_x, track_l = 1.5, 4.0
+    pos = [(track_x, track_l/2, 0), (track_x, -track_l/2, 0), (-track_x, track_l/2, 0), (-track_x, -track_l/2, 0)]
+    wheel_levels = []
+    for level in range(lod_count(lod)):
+        vertices = lod_param(lod, "wheel", "vertices", level, 32)
+        if not wheel_levels or vertices < wheel_levels[-1][1]:
+            wheel_levels.append((level, vertices))
+    for i, p in enumerate(pos):
+        for level, vertices in wheel_levels:
+            w = create_idler_wheel(lod_name(f"Wheel_{i}", level), wheel_radius, wheel_width, vertices)
+            w.location = p
+            w.data.materials.append(chassis_mat)
+            apply_transforms(w)
+
+            # PARENTING STRATEGY
+            # Instead of joining geometry (which destroys object metadata), we parent to the body.
+            # We must ensure transforms are applied *before* parenting to avoid double-transform issues if the parent is moved later (though here parent is at origin).
+            w.parent = body
+
+            tag_contract(w, "wheel")
+            tag_lod(w, level)
+
+    # 4. Cabin
+    bpy.ops.mesh.primitive_cube_add(size=1, location=(0, -1.0, 2.35))
+    cabin = bpy.context.object
+    cabin.name = "Cabin"
+    cabin.scale = (2.0, 2.0, 1.2)
+    apply_transforms(cabin)
+    cabin.data.materials.append(cabin_mat)
 
     # PARENTING STRATEGY
-    # Instead of joining geometry (which destroys object metadata), we parent to the body.
-    # We must ensure transforms are applied *before* parenting to avoid double-transform issues if the parent is moved later (though here parent is at origin).
-    w.parent = body
-
-    tag_contract(w, "wheel")
-
-# 4. Cabin
-bpy.ops.mesh.primitive_cube_add(size=1, location=(0, -1.0, 2.35))
-cabin = bpy.context.object
-cabin.name = "Cabin"
-cabin.scale = (2.0, 2.0, 1.2)
-apply_transforms(cabin)
-cabin.data.materials.append(cabin_mat)
-
-# PARENTING STRATEGY
-cabin.parent = body
-
-tag_contract(cabin, "cabin")
-
-# 5. UVs
-# We need to unwrap each object individually now
-objects_to_unwrap = [body, cabin]
-# Add wheels to unwrap list
-for child in body.children:
-    if "Wheel" in child.name:
-        objects_to_unwrap.append(child)
-
-for o in objects_to_unwrap:
-    bpy.context.view_layer.objects.active = o
-    bpy.ops.object.mode_set(mode='EDIT')
-    bpy.ops.mesh.select_all(action='SELECT')
-    # Increased margin helps separate faces in the UV map
-    bpy.ops.uv.smart_project(angle_limit=66.0, island_margin=0.02)
-    bpy.ops.object.mode_set(mode='OBJECT')
-
-# 6. Assets
-tag_contract(create_track_link("Asset_TrackLink", track_mat), "track_link")
-tag_contract(create_track_path("Asset_TrackPath_L", 1.0, 4.0), "path_l")
-tag_contract(create_track_path("Asset_TrackPath_R", 1.0, 4.0), "path_r")
-
-# 7. Export
-bpy.ops.export_scene.gltf(filepath=OUTPUT_PATH, export_format='GLB', use_selection=False, export_extras=True)
-print(f"Exported to {OUTPUT_PATH}")
+    cabin.parent = body
+
+    tag_contract(cabin, "cabin")
+    tag_lod(cabin, 0)
+
+    # 5. UVs
+    # We need to unwrap each object individually now
+    objects_to_unwrap = [body, cabin]
+    # Add wheels to unwrap list
+    for child in body.children:
+        if "Wheel" in child.name:
+            objects_to_unwrap.append(child)
+
+    for o in objects_to_unwrap:
+        bpy.context.view_layer.objects.active = o
+        bpy.ops.object.mode_set(mode='EDIT')
+        bpy.ops.mesh.select_all(action='SELECT')
+        # Increased margin helps separate faces in the UV map
+        with span("uv.smart_project", cat="blender", object=o.name):
+            bpy.ops.uv.smart_project(angle_limit=66.0, island_margin=0.02)
+        bpy.ops.object.mode_set(mode='OBJECT')
+
+    # 6. Assets
+    link = create_track_link("Asset_TrackLink", track_mat)
+    tag_contract(link, "track_link")
+    tag_lod(link, 0)
+    # Lower detail link: no grouser (half the triangles), from the first level that disables it
+    plain = [level for level in range(1, lod_count(lod)) if not lod_param(lod, "track_link", "grouser", level, True)]
+    if plain:
+        link = create_track_link(lod_name("Asset_TrackLink", plain[0]), track_mat, grouser=False)
+        tag_contract(link, "track_link")
+        tag_lod(link, plain[0])
+    samples = arc_samples(CONFIG_PATH)
+    tag_contract(create_track_path("Asset_TrackPath_L", 1.0, 4.0, samples), "path_l")
+    tag_contract(create_track_path("Asset_TrackPath_R", 1.0, 4.0, samples), "path_r")
+
+    # 7. Export
+    counter("scene", cat="blender", objects=len(bpy.data.objects), meshes=len(bpy.data.meshes))
+    with span("export_scene.gltf", cat="blender"):
+        bpy.ops.export_scene.gltf(filepath=output_path, export_format='GLB', use_selection=False, export_extras=True)
+    print(f"Exported to {output_path}")
+
+if __name__ == "__main__":
+    from registry import seed_random
+    seed_random("bulldozer")
+    build()
@@ -0,0 +1,237 @@
+"""
+Procedural part geometry as plain vertex/face lists.
+
+Kept free of `bpy` so the Blender generators and the Blender-free GLB emitter
+(pipeline/gltf/) build from exactly the same source. Coordinates are Blender's
+(X right, Y forward, Z up); faces are vertex index tuples (tris, quads or n-gons).
+"""
+import base64
+import json
+import math
+import os
+import struct
+
+# Revised Profile (Closed loop Y, Z)
+SOLID_PROFILE = [
+    # Outer surface (Blade face)
+    (0.2, 1.5),   # Top Front
+    (-0.1, 0.8),  # Middle (Curve in)
+    (0.4, 0.0),   # Cutting Edge Tip (Pointy/Parky)
+
+    # Bottom thickness
+    (0.0, 0.0),   # Heel
+
+    # Back surface
+    (-0.3, 0.8),  # Back middle
+    (0.0, 1.5),   # Back Top
+]
+
+def plow_segment_geometry(width=1.0):
+    verts = []
+    faces = []
+
+    # Generate vertices for Left and Right cross-sections
+    for x in [-width/2, width/2]:
+        for y, z in SOLID_PROFILE:
+            verts.append((x, y, z))
+
+    n_pts = len(SOLID_PROFILE)
+
+    # Side faces (lofting)
+    for i in range(n_pts):
+        next_i = (i + 1) % n_pts
+
+        l1 = i
+        l2 = next_i
+        r1 = i + n_pts
+        r2 = next_i + n_pts
+
+        faces.append((l1, r1, r2, l2))
+
+    return verts, faces
+
+def plow_wing_geometry(side, sections=5, length=1.0, curve_amount=0.5):
+    # "Curved Horn" Wing Design
+    # Extends forward (Y+) and curves inward (X towards 0) to funnel gems
+
+    # Key points for the curve
+    # Base: Matches plow side profile roughly
+    # Tip: Forward and Inward
+
+    # Profile at base (attached to plow)
+    base_profile = SOLID_PROFILE
+
+    verts = []
+    faces = []
+
+    # Generate sections along the "horn" length
+    # sections: loft resolution, length: extended forward length, curve_amount: outward flare amount
+
+    for i in range(sections + 1):
+        t = i / sections
+        y_offset = t * length
+
+        # Curve Outward: x offset depends on side
+        # side=1 (Right) -> x moves positive (right)
+        # side=-1 (Left) -> x moves negative (left)
+        x_offset = t * t * curve_amount * side
+
+        # Scale down towards tip
+        scale = 1.0 - (t * 0.5)
+
+        for py, pz in base_profile:
+            # Transform profile point
+            px = 0 # Local x relative to wing base line
+
+            # Apply scale/offset
+            final_x = px + x_offset
+            final_y = py + y_offset
+            final_z = pz * scale
+
+            verts.append((final_x, final_y, final_z))
+
+    n_profile = len(base_profile)
+
+    # Skinning
+    for i in range(sections):
+        offset = i * n_profile
+        next_offset = (i + 1) * n_profile
+
+        for j in range(n_profile):
+            next_j = (j + 1) % n_profile
+
+            # Quads connecting sections
+            v1 = offset + j
+            v2 = next_offset + j
+            v3 = next_offset + next_j
+            v4 = offset + next_j
+
+            # Winding order check
+            if side == 1:
+                 faces.append((v1, v2, v3, v4)) # Normal
+            else:
+                 # Flipped for other side, from the same first vertex so both sides split
+                 # on the same diagonal and stay exact mirrors (shared mesh after optimize.py)
+                 faces.append((v1, v4, v3, v2))
+
+    # Caps, facing outward on both sides (mirrored like the side quads)
+    def reverse(face):
+        return face[:1] + face[:0:-1]
+    # Base cap
+    base_cap = list(range(n_profile))
+    # Tip cap
+    tip_start = sections * n_profile
+    tip_cap = [tip_start + j for j in range(n_profile)]
+    if side == 1:
+        faces += [base_cap, reverse(tip_cap)]
+    else:
+        faces += [reverse(base_cap), tip_cap]
+
+    return verts, faces
+
+def plow_tooth_geometry():
+    # Angled Tooth
+    # Rotated forward around X to dig in
+
+    # Simple wedge, but points down/forward
+    # Tip at (0, 0.6, -0.4) (Forward and Down)
+
+    verts = [
+        (-0.15, 0.0, 0.1), (0.15, 0.0, 0.1),   # Top Back (Attachment)
+        (-0.15, -0.1, -0.1), (0.15, -0.1, -0.1), # Bottom Back
+        (0.0, 0.7, -0.3) # Sharp Tip (Forward Y+, Down Z-)
+    ]
+
+    # Indices: 0,1 TopBack; 2,3 BtmBack; 4 Tip
+
+    faces = [
+        (0, 1, 4), # Top
+        (1, 3, 4), # Right
+        (3, 2, 4), # Bottom
+        (2, 0, 4), # Left
+        (2, 3, 1, 0) # Back
+    ]
+
+    # Rotate slightly to "dig"
+    # Actually, the geometry above is already angled (Tip z is -0.3)
+
+    return verts, faces
+
+def track_path_geometry(radius=1.0, length=4.0):
+    vertices = []
+    # Segment 1: Top (excluding end point)
+    for i in range(8):
+        vertices.append((0, -length/2 + (i/8)*length, radius))
+    # Segment 2: Front semi-circle (excluding end point)
+    for i in range(16):
+        a = (i/16)*math.pi
+        vertices.append((0, length/2 + math.sin(a)*radius, math.cos(a)*radius))
+    # Segment 3: Bottom (excluding end point)
+    for i in range(8):
+        vertices.append((0, length/2 - (i/8)*length, -radius))
+    # Segment 4: Back semi-circle (excluding end point)
+    for i in range(16):
+        a = math.pi + (i/16)*math.pi
+        vertices.append((0, -length/2 + math.sin(a)*radius, math.cos(a)*radius))
+
+    # A single N-gon face ensures the mesh has a 'primitive' for GLTF export
+    faces = [list(range(len(vertices)))]
+    return vertices, faces
+
+def track_path_point(radius, length, s):
+    """Position and unit tangent at arc length `s` along the track_path_geometry loop, in vertex order."""
+    s %= 2 * length + 2 * math.pi * radius
+    arc = math.pi * radius
+    if s < length:
+        return (0, -length/2 + s, radius), (0, 1, 0)
+    s -= length
+    if s < arc:
+        a = s / radius
+        return (0, length/2 + math.sin(a)*radius, math.cos(a)*radius), (0, math.cos(a), -math.sin(a))
+    s -= arc
+    if s < length:
+        return (0, length/2 - s, -radius), (0, -1, 0)
+    a = math.pi + (s - length) / radius
+    return (0, -length/2 + math.sin(a)*radius, math.cos(a)*radius), (0, math.cos(a), -math.sin(a))
+
+def arc_samples(config_path, default=256):
+    """Track LUT resolution from the mapping's assembly.tracks.arcSamples."""
+    if not os.path.exists(config_path):
+        return default
+    with open(config_path) as f:
+        return json.load(f).get("assembly", {}).get("tracks", {}).get("arcSamples", default)
+
+def track_path_lut(radius=1.0, length=4.0, samples=256):
+    """
+    The track loop resampled at `samples` points evenly spaced by arc length,
+    as (positions, tangents). Evaluated on the exact stadium rather than the
+    48-vertex polygon, so links stay evenly spaced on the arcs too. Runs in the
+    direction the runtime has always moved links: from the first vertex onto
+    the back arc.
+    """
+    perimeter = 2 * length + 2 * math.pi * radius
+    positions, tangents = [], []
+    for i in range(samples):
+        p, t = track_path_point(radius, length, -i * perimeter / samples)
+        positions.append(p)
+        tangents.append((-t[0], -t[1], -t[2]))
+    return positions, tangents
+
+def track_path_extras(radius=1.0, length=4.0, samples=256):
+    """
+    track_path_lut packed for the path node's `arc_lut` extras: interleaved
+    little-endian float32 px,py,pz,tx,ty,tz per sample, base64 encoded, already
+    converted to glTF's Y-up axes. The path objects sit at the origin, so the
+    table is in the node's parent space and the quantization scale folded into
+    the node by optimize.py never applies to it.
+    """
+    positions, tangents = track_path_lut(radius, length, samples)
+    values = []
+    for (px, py, pz), (tx, ty, tz) in zip(positions, tangents):
+        values += [px, pz, -py, tx, tz, -ty]
+    return {
+        "count": samples,
+        "length": 2 * length + 2 * math.pi * radius,
+        "layout": "px,py,pz,tx,ty,tz",
+        "data": base64.b64encode(struct.pack(f"<{len(values)}f", *values)).decode("ascii"),
+    }
@@ -0,0 +1,34 @@
+"""
+LOD chain settings, read from the "lod" section of a mapping JSON:
+
+    "lod": {
+        "screenSizes": [0.15, 0.07],
+        "plow_wing": {"sections": [5, 3, 1]}
+    }
+
+`screenSizes` are the projected-size thresholds the renderer switches at (LOD0
+while the asset covers at least screenSizes[0] of the viewport height, and so
+on), so there are len(screenSizes) + 1 levels. Every other key is a damp_id
+with one value per level for each generator parameter. Level N>0 nodes are
+exported as "<name>_LOD<N>" with the same damp_id and a `lod` extra.
+"""
+import json
+import os
+
+def load_lod(config_path):
+    if not os.path.exists(config_path):
+        return {}
+    with open(config_path) as f:
+        return json.load(f).get("lod", {})
+
+def lod_count(lod):
+    return len(lod.get("screenSizes", [])) + 1
+
+def lod_param(lod, damp_id, param, level, default):
+    values = lod.get(damp_id, {}).get(param)
+    if not values:
+        return default
+    return values[min(level, len(values) - 1)]
+
+def lod_name(name, level):
+    return name if level == 0 else f"{name}_LOD{level}"
@@ -0,0 +1,49 @@
+"""
+Generator registry.
+
+Maps asset names to the modules that build them. Every generator module exposes
+`build(output_path, **params)` and expects to start from an empty scene.
+"""
+import importlib
+import json
+import os
+import random
+import sys
+import zlib
+
+import bpy
+import numpy as np
+
+BLENDER_DIR = os.path.dirname(os.path.abspath(__file__))
+if BLENDER_DIR not in sys.path:
+    sys.path.append(BLENDER_DIR)
+
+GENERATORS = {
+    "bulldozer": "bulldozer",
+    "plow": "plow",
+}
+
+def get_generator(name):
+    if name not in GENERATORS:
+        raise KeyError(f"Unknown generator '{name}' (known: {', '.join(sorted(GENERATORS))})")
+    return importlib.import_module(GENERATORS[name]).build
+
+def seed_random(name, params=None):
+    """Seeds `random` and NumPy's global generator from the job, so generators that draw from them export
+    byte-identical GLBs for identical inputs (content-hashed filenames depend on it)."""
+    seed = zlib.crc32(f"{name}:{json.dumps(params or {}, sort_keys=True)}".encode())
+    random.seed(seed)
+    np.random.seed(seed)
+
+def reset_scene():
+    """
+    Removes every object and datablock a generator may have created.
+
+    Freeing the datablocks (not just unlinking objects) keeps names stable between
+    jobs, so a rebuilt material is exported as 'plow_mat' rather than 'plow_mat.001'.
+    """
+    for obj in list(bpy.data.objects):
+        bpy.data.objects.remove(obj, do_unlink=True)
+    for blocks in (bpy.data.meshes, bpy.data.materials, bpy.data.images, bpy.data.textures, bpy.data.curves):
+        for block in list(blocks):
+            blocks.remove(block)
@@ -0,0 +1,61 @@
+import os
+import struct
+
+import bpy
+import numpy as np
+
+# --- Texture Baking ---
+# Blender ships NumPy, so pixel data is handed over as one contiguous float32
+# buffer via `pixels.foreach_set` instead of a Python list of boxed floats.
+# Buffers are (height, width, 4) RGBA in Blender's bottom-up row order.
+
+def solid_pixels(color, width=512, height=512):
+    """A read-only (height, width, 4) view of a single colour (no per-pixel allocation)."""
+    return np.broadcast_to(np.asarray(color, dtype=np.float32), (height, width, 4))
+
+def is_uniform(pixels):
+    return bool(np.all(pixels == pixels[0, 0]))
+
+# Ancillary chunks that can carry save times or tool versions; dropping them keeps rebuilds byte-identical
+VOLATILE_PNG_CHUNKS = {b"tIME", b"tEXt", b"zTXt", b"iTXt"}
+
+def strip_png_metadata(path):
+    """Rewrites a PNG without its VOLATILE_PNG_CHUNKS (pixel data is untouched)."""
+    with open(path, "rb") as f:
+        data = f.read()
+    out, pos = [data[:8]], 8
+    while pos < len(data):
+        length, kind = struct.unpack_from(">I4s", data, pos)
+        end = pos + 12 + length
+        if kind not in VOLATILE_PNG_CHUNKS:
+            out.append(data[pos:end])
+        pos = end
+    with open(path, "wb") as f:
+        f.write(b"".join(out))
+
+def bake_texture(name, pixels, output_dir):
+    """
+    Saves an RGBA float buffer as `<output_dir>/<name>.png`.
+
+    Single-colour buffers are collapsed to a 1x1 image: the material samples the
+    same colour everywhere, and the PNG shrinks from kilobytes to a few bytes.
+    Returns (path, width, height).
+    """
+    pixels = np.asarray(pixels, dtype=np.float32)
+    if is_uniform(pixels):
+        pixels = pixels[:1, :1]
+    height, width = pixels.shape[:2]
+
+    img = bpy.data.images.new(name, width=width, height=height, alpha=True)
+    img.pixels.foreach_set(np.ascontiguousarray(pixels).ravel())
+    img.file_format = 'PNG'
+    path = os.path.join(output_dir, f"{name}.png")
+    img.filepath_raw = path
+    img.save()
+    strip_png_metadata(path)
+
+    # Free the image datablock; the PNG on disk is all the pipeline needs
+    bpy.data.images.remove(img)
+
+    print(f"   [TEXTURE] Baked {path} ({width}x{height})")
+    return path, width, height
@@ -0,0 +1,115 @@
+"""
+Persistent headless Blender worker.
+
+    blender --background --python pipeline/blender/worker.py
+
+Reads one JSON job per line on stdin:
+
+    {"id": 1, "generator": "plow", "output": "/abs/path/plow.glb", "params": {}}
+
+and answers each with one JSON line on stdout, prefixed with PROTOCOL_PREFIX so
+replies can be told apart from Blender's own logging. `{"cmd": "quit"}` exits.
+Generator and helper modules edited since the previous job are reloaded, so a
+long-lived worker always builds from the current source.
+"""
+import importlib
+import json
+import os
+import sys
+import time
+import traceback
+
+import bpy
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts"))
+import registry
+import tracing
+from tracing import span
+
+PROTOCOL_PREFIX = "@@DAMP_WORKER@@ "
+
+_mtimes = {}
+
+def reply(message):
+    sys.stdout.write(PROTOCOL_PREFIX + json.dumps(message) + "\n")
+    sys.stdout.flush()
+
+def pipeline_modules():
+    modules = []
+    for name, module in list(sys.modules.items()):
+        path = getattr(module, "__file__", None)
+        if name == "__main__" or not isinstance(path, str):
+            continue
+        if os.path.dirname(os.path.abspath(path)) == registry.BLENDER_DIR:
+            modules.append(module)
+    return modules
+
+def reload_changed_modules():
+    """Reloads every pipeline module if any of them changed on disk (helpers before generators)."""
+    modules = pipeline_modules()
+    changed = False
+    for module in modules:
+        mtime = os.path.getmtime(module.__file__)
+        if _mtimes.get(module.__name__, mtime) != mtime:
+            changed = True
+        _mtimes[module.__name__] = mtime
+    if not changed:
+        return
+
+    def order(module):
+        if module.__name__ == "registry":
+            return 2
+        return 1 if module.__name__ in registry.GENERATORS.values() else 0
+
+    for module in sorted(modules, key=order):
+        importlib.reload(module)
+    print(f"   [WORKER] Reloaded {len(modules)} module(s)")
+
+def run_job(job):
+    start = time.perf_counter()
+    try:
+        with span(f"job {job['generator']}", cat="blender", params=job.get("params", {})):
+            with span("reload modules", cat="blender"):
+                reload_changed_modules()
+            with span("reset scene", cat="blender"):
+                registry.reset_scene()
+            registry.seed_random(job["generator"], job.get("params", {}))
+            build = registry.get_generator(job["generator"])
+            build(job["output"], **job.get("params", {}))
+        return {"id": job.get("id"), "ok": True, "seconds": time.perf_counter() - start}
+    except Exception as e:
+        return {
+            "id": job.get("id"),
+            "ok": False,
+            "error": f"{type(e).__name__}: {e}",
+            "traceback": traceback.format_exc(),
+            "seconds": time.perf_counter() - start,
+        }
+
+def main():
+    tracing.set_process_name("blender worker")
+    # Import every generator up front so the first job doesn't pay for it
+    with span("import generators", cat="blender"):
+        for name in registry.GENERATORS:
+            registry.get_generator(name)
+        reload_changed_modules()
+
+    reply({"event": "ready", "blender": bpy.app.version_string, "generators": sorted(registry.GENERATORS)})
+    for line in sys.stdin:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            job = json.loads(line)
+        except json.JSONDecodeError as e:
+            reply({"ok": False, "error": f"Invalid job: {e}"})
+            continue
+        if job.get("cmd") == "quit":
+            break
+        result = run_job(job)
+        # The worker outlives the build's merge point only if close() times out; keep the file current
+        tracing.flush()
+        reply(result)
+
+main()
@@ -0,0 +1,290 @@
+# /// script
+# dependencies = [
+#   "numpy",
+# ]
+# ///
+"""
+Physics collision footprints from the exported models.
+
+Projects the tagged components of bulldozer_components.glb and plow.glb onto
+the ground plane, assembled per plow level the way BulldozerRenderer lays
+them out (segment count, wing placement and scale from src/core/graphics.js),
+and reduces each collider to a few convex polygons:
+
+- the projected triangles are rasterized at --cell model units,
+- a piece whose convex hull covers too much empty ground (fill below
+  `minFill`) is split across its principal axis, up to `maxPieces`,
+- every hull is simplified to `maxVertices` by dropping the vertex that
+  removes the least area.
+
+Which damp_ids make up each collider, and its budgets, come from the
+"colliders" section of the mapping configs:
+
+    "colliders": {
+        "plow_wing": {"parts": ["plow_wing"], "maxVertices": 6, "maxPieces": 2, "minFill": 0.8}
+    }
+
+The output, assets/colliders/footprints.json, holds for every plow level
+the convex polygons of each collider (keyed by the Matter.js part label) in
+model units, x right and y forward-negative like the physics world. The
+runtime multiplies them by the renderer scale (10 x dozer visual scale).
+
+    uv run pipeline/colliders/footprints.py
+    uv run pipeline/colliders/footprints.py --levels 30 --cell 0.01
+"""
+import argparse
+import json
+import math
+import os
+import sys
+import time
+
+import numpy as np
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.append(os.path.join(ROOT_DIR, "pipeline", "gltf"))
+
+from glb import node_matrix, read_accessor, read_float_accessor, read_glb
+
+MODELS_DIR = os.path.join(ROOT_DIR, "assets", "models")
+CONFIG_DIR = os.path.join(ROOT_DIR, "assets", "configs")
+OUTPUT_PATH = os.path.join(ROOT_DIR, "assets", "colliders", "footprints.json")
+FORMAT_VERSION = 1
+
+# Mirrors BulldozerRenderer / graphics.js: world units per model unit at dozer level 1, plow z offset
+RENDER_SCALE = 10.0
+PLOW_OFFSET = -4.2
+WINGS_FROM_LEVEL = 3
+
+def plow_segments(level):
+    return math.ceil((26 + level * 14) * 1.5 / 10.0)
+
+def wing_scale(level):
+    return 1.0 + (level - 3) * 0.1 if level > 3 else 1.0
+
+# --- Geometry ---
+def load_parts(path):
+    """[(damp_id, name, world matrix, positions, triangles)] for every LOD0 mesh node, walking the node tree."""
+    gltf, binary = read_glb(path)
+    nodes = gltf.get("nodes", [])
+    parts = []
+
+    def visit(index, parent):
+        node = nodes[index]
+        world = parent @ node_matrix(node)
+        extras = node.get("extras", {})
+        if "mesh" in node and not extras.get("lod"):
+            positions, tris, base = [], [], 0
+            for prim in gltf["meshes"][node["mesh"]]["primitives"]:
+                pos = read_float_accessor(gltf, binary, prim["attributes"]["POSITION"])
+                idx = read_accessor(gltf, binary, prim["indices"]).astype(np.int64) if "indices" in prim else np.arange(len(pos))
+                positions.append(pos)
+                tris.append(idx.reshape(-1, 3) + base)
+                base += len(pos)
+            parts.append((extras.get("damp_id"), node.get("name", ""), world, np.concatenate(positions), np.concatenate(tris)))
+        for child in node.get("children", []):
+            visit(child, world)
+
+    scene = gltf.get("scenes", [{}])[gltf.get("scene", 0)]
+    for root in scene.get("nodes", range(len(nodes))):
+        visit(root, np.eye(4))
+    return parts
+
+def ground_triangles(positions, tris, matrix):
+    """Triangles transformed by matrix and dropped onto the ground: glTF (X, Z), i.e. physics (x, y)."""
+    world = positions @ matrix[:3, :3].T + matrix[:3, 3]
+    return world[tris][:, :, [0, 2]]
+
+def translation(x=0.0, y=0.0, z=0.0):
+    m = np.eye(4)
+    m[:3, 3] = (x, y, z)
+    return m
+
+def scaling(s):
+    return np.diag([s, s, s, 1.0])
+
+def rasterize(triangles, cell):
+    """Occupied cells of the triangle soup: (row, col) int arrays and the grid origin."""
+    origin = triangles.reshape(-1, 2).min(axis=0) - cell
+    occupied = set()
+    for a, b, c in triangles:
+        area = (b[0] - a[0]) * (c[1] - a[1]) - (b[1] - a[1]) * (c[0] - a[0])
+        if abs(area) < 1e-12:
+            # Edge-on (a vertical face, the track path loops): mark the cells under its edges
+            for p, q in ((a, b), (b, c)):
+                steps = int(np.ceil(np.linalg.norm(q - p) / (cell / 2))) + 1
+                line = np.floor((p + np.linspace(0.0, 1.0, steps)[:, None] * (q - p) - origin) / cell).astype(int)
+                occupied.update(zip(line[:, 1].tolist(), line[:, 0].tolist()))
+            continue
+        lo = np.floor((np.minimum(np.minimum(a, b), c) - origin) / cell).astype(int)
+        hi = np.ceil((np.maximum(np.maximum(a, b), c) - origin) / cell).astype(int)
+        cols, rows = np.meshgrid(np.arange(lo[0], hi[0] + 1), np.arange(lo[1], hi[1] + 1))
+        centres = origin + (np.stack([cols, rows], axis=-1) + 0.5) * cell
+        # Same-sign edge functions (either winding)
+        d = [(q[0] - p[0]) * (centres[..., 1] - p[1]) - (q[1] - p[1]) * (centres[..., 0] - p[0]) for p, q in ((a, b), (b, c), (c, a))]
+        inside = ((d[0] >= 0) & (d[1] >= 0) & (d[2] >= 0)) | ((d[0] <= 0) & (d[1] <= 0) & (d[2] <= 0))
+        occupied.update(zip(rows[inside].tolist(), cols[inside].tolist()))
+    cells = np.array(sorted(occupied), dtype=np.int64).reshape(-1, 2)
+    return cells, origin
+
+def convex_hull(points):
+    """Counter-clockwise hull (Andrew's monotone chain), without collinear points."""
+    points = np.unique(np.round(points, 9), axis=0)
+    if len(points) < 3:
+        return points
+
+    def chain(pts):
+        out = []
+        for p in pts:
+            while len(out) >= 2 and (out[-1][0] - out[-2][0]) * (p[1] - out[-2][1]) - (out[-1][1] - out[-2][1]) * (p[0] - out[-2][0]) <= 0:
+                out.pop()
+            out.append(tuple(p))
+        return out
+
+    lower, upper = chain(points), chain(points[::-1])
+    return np.array(lower[:-1] + upper[:-1])
+
+def polygon_area(poly):
+    x, y = poly[:, 0], poly[:, 1]
+    return 0.5 * float(np.dot(x, np.roll(y, -1)) - np.dot(y, np.roll(x, -1)))
+
+def cells_hull(cells, origin, cell):
+    """Hull of the cells' outer corners (only each row's first and last cell can contribute)."""
+    rows = {}
+    for r, c in cells.tolist():
+        lo, hi = rows.get(r, (c, c))
+        rows[r] = (min(lo, c), max(hi, c))
+    corners = []
+    for r, (lo, hi) in rows.items():
+        corners += [(lo, r), (lo, r + 1), (hi + 1, r), (hi + 1, r + 1)]
+    return convex_hull(origin + np.array(corners, dtype=np.float64) * cell)
+
+def fill(cells, hull, cell):
+    return len(cells) * cell * cell / max(polygon_area(hull), 1e-12)
+
+def decompose(cells, origin, cell, max_pieces, min_fill):
+    """Split the worst-filled piece across its principal axis until every hull is full enough or the budget is spent."""
+    pieces = [cells]
+    hulls = [cells_hull(cells, origin, cell)]
+    while len(pieces) < max_pieces:
+        fills = [fill(p, h, cell) for p, h in zip(pieces, hulls)]
+        worst = int(np.argmin(fills))
+        if fills[worst] >= min_fill or len(pieces[worst]) < 2:
+            break
+        piece = pieces.pop(worst)
+        hulls.pop(worst)
+        centres = piece[:, ::-1].astype(np.float64)
+        centred = centres - centres.mean(axis=0)
+        axis = np.linalg.eigh(centred.T @ centred)[1][:, -1]
+        side = centred @ axis >= 0
+        for half in (piece[side], piece[~side]):
+            pieces.append(half)
+            hulls.append(cells_hull(half, origin, cell))
+    return hulls
+
+def simplify(hull, max_vertices):
+    """Drops the vertex whose removal loses the least area until the hull fits the budget."""
+    hull = list(map(tuple, hull))
+    while len(hull) > max(3, max_vertices):
+        n = len(hull)
+        costs = []
+        for i in range(n):
+            a, b, c = hull[i - 1], hull[i], hull[(i + 1) % n]
+            costs.append(abs((b[0] - a[0]) * (c[1] - a[1]) - (b[1] - a[1]) * (c[0] - a[0])))
+        hull.pop(int(np.argmin(costs)))
+    return np.array(hull)
+
+def footprint(triangles, spec, cell):
+    """Convex polygons for one collider, plus (true area, polygon area) for the report."""
+    cells, origin = rasterize(np.concatenate(triangles), cell)
+    if not len(cells):
+        return [], (0.0, 0.0)
+    hulls = decompose(cells, origin, cell, spec.get("maxPieces", 1), spec.get("minFill", 0.9))
+    polys = [simplify(h, spec.get("maxVertices", 8)) for h in hulls]
+    return polys, (len(cells) * cell * cell, sum(polygon_area(p) for p in polys))
+
+# --- Assembly ---
+def load_config(name):
+    with open(os.path.join(CONFIG_DIR, name)) as f:
+        return json.load(f)
+
+def collider_triangles(dozer, plow, dozer_config, plow_config, level):
+    """{collider: [(damp_id, ground triangles), ...]} with the plow parts placed as at this plow level."""
+    tracks = dozer_config.get("assembly", {}).get("tracks", {})
+    spread = {"path_l": -tracks.get("spread", 0.0), "path_r": tracks.get("spread", 0.0)}
+    width = plow_config.get("assembly", {}).get("plow", {}).get("segmentWidth", 1.0)
+    count = plow_segments(level)
+    start = -count * width / 2 + width / 2
+
+    placed = []
+    for damp_id, _, world, positions, tris in dozer:
+        # Track links ride the paths offset sideways by the assembly spread
+        matrix = translation(spread[damp_id]) @ world if damp_id in spread else world
+        placed.append((damp_id, None, ground_triangles(positions, tris, matrix)))
+    for damp_id, name, world, positions, tris in plow:
+        if damp_id == "plow_segment":
+            for i in range(count):
+                placed.append((damp_id, None, ground_triangles(positions, tris, translation(start + i * width, 0, PLOW_OFFSET) @ world)))
+        elif damp_id == "plow_wing" and level >= WINGS_FROM_LEVEL:
+            # The renderer keeps the node's rotation and scale, multiplies the scale and moves it to the plow edge
+            side = -1 if name.endswith("_L") else 1
+            local = world.copy()
+            local[:3, 3] = 0.0
+            matrix = translation(side * count * width / 2, 0, PLOW_OFFSET) @ scaling(wing_scale(level)) @ local
+            placed.append((damp_id, name, ground_triangles(positions, tris, matrix)))
+
+    colliders = {}
+    for config in (dozer_config, plow_config):
+        for label, spec in config.get("colliders", {}).items():
+            groups = {}
+            for damp_id, group, triangles in placed:
+                if damp_id in spec.get("parts", [label]):
+                    # Separate nodes of one collider (the two wings) stay separate pieces
+                    groups.setdefault(group, []).append(triangles)
+            if groups:
+                colliders[label] = (spec, list(groups.values()))
+    return colliders
+
+def build_footprints(output, levels, cell):
+    dozer_config = load_config("bulldozer_mapping.json")
+    plow_config = load_config("plow_mapping.json")
+    dozer = load_parts(os.path.join(MODELS_DIR, dozer_config["assetId"]))
+    plow = load_parts(os.path.join(MODELS_DIR, plow_config["assetId"]))
+
+    result = {"format": FORMAT_VERSION, "scale": RENDER_SCALE, "cell": cell, "levels": {}}
+    for level in range(1, levels + 1):
+        start = time.perf_counter()
+        entry, report = {}, []
+        for label, (spec, groups) in collider_triangles(dozer, plow, dozer_config, plow_config, level).items():
+            polys, areas = [], [0.0, 0.0]
+            for triangles in groups:
+                p, (true_area, poly_area) = footprint(triangles, spec, cell)
+                polys += p
+                areas[0] += true_area
+                areas[1] += poly_area
+            entry[label] = [[[round(float(x), 4), round(float(y), 4)] for x, y in p] for p in polys]
+            vertices = sum(len(p) for p in polys)
+            report.append(f"{label} {len(polys)}x/{vertices}v {areas[1] / max(areas[0], 1e-12) * 100:.0f}%")
+        result["levels"][str(level)] = entry
+        print(f"   [FOOTPRINT] plow level {level}: {', '.join(report)} (hull / model area) in {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(result, f, indent=2)
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description="Project tagged components to convex collision footprints per plow level.")
+    parser.add_argument("--output", default=OUTPUT_PATH, help="Output JSON")
+    parser.add_argument("--levels", type=int, default=20, help="Plow levels 1..N")
+    parser.add_argument("--cell", type=float, default=0.02, help="Raster cell size in model units")
+    args = parser.parse_args()
+
+    try:
+        build_footprints(args.output, args.levels, args.cell)
+    except FileNotFoundError as e:
+        raise SystemExit(f"❌ {e.filename} missing; build the models first")
+    print(f"✅ Footprints written to {os.path.relpath(args.output, ROOT_DIR)}")
+
+if __name__ == "__main__":
+    main()
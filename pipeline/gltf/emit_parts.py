@@ -0,0 +1,208 @@
+# /// script
+# dependencies = [
+#   "numpy",
+# ]
+# ///
+"""
+Blender-free GLB emitter for the procedural parts.
+
+Builds the plow (segment, wings, tooth) or the track paths from the same
+vertex/face lists the Blender generators use (pipeline/blender/geometry.py),
+with the same node names, materials and `extras.damp_id` contract:
+
+    uv run pipeline/gltf/emit_parts.py plow
+    uv run pipeline/gltf/emit_parts.py plow --output /tmp/plow.glb --compare assets/models/plow.glb
+    uv run pipeline/gltf/emit_parts.py track_paths --compare assets/models/bulldozer_components.glb
+
+`--compare` checks every emitted node against the same-named node of a Blender
+export: damp_id, the track paths' arc_lut, material damp_id, triangle count,
+bounds, surface area, vertex positions and normals. LOD nodes come from the same mapping "lod" section.
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.append(os.path.join(ROOT_DIR, "pipeline", "blender"))
+
+from geometry import (arc_samples, plow_segment_geometry, plow_tooth_geometry, plow_wing_geometry, track_path_extras,
+                      track_path_geometry)
+from glb import GltfBuilder, node_matrix, read_accessor, read_float_accessor, read_glb
+from lod import load_lod, lod_count, lod_name, lod_param
+from mesh import flat_primitive, make_consistent, normalize, smooth_primitive, to_y_up
+
+MODELS_DIR = os.path.join(ROOT_DIR, "assets", "models")
+PLOW_CONFIG = os.path.join(ROOT_DIR, "assets", "configs", "plow_mapping.json")
+BULLDOZER_CONFIG = os.path.join(ROOT_DIR, "assets", "configs", "bulldozer_mapping.json")
+
+def add_part(builder, name, verts, faces, damp_id, material=None, smooth=False, lod=None, extras=None):
+    if smooth:
+        positions, normals, indices = smooth_primitive(verts, faces)
+    else:
+        positions, normals, indices = flat_primitive(verts, faces)
+    extras = {"damp_id": damp_id, **(extras or {})}
+    if lod is not None:
+        extras["lod"] = lod
+    return builder.add_mesh_node(name, to_y_up(positions), to_y_up(normals), indices, material=material, extras=extras)
+
+# --- Parts ---
+def build_plow(output_path, segment_width=1.0, wing_sections=5, wing_length=1.0, wing_curve=0.5):
+    """Same parameters and output contract as pipeline/blender/plow.py build()."""
+    builder = GltfBuilder()
+    # Blender's defaults for a material without nodes
+    plow_mat = builder.add_material("plow_mat", damp_id="plow", roughness=0.4)
+
+    add_part(builder, "Plow_Segment", *plow_segment_geometry(segment_width), "plow_segment", plow_mat, lod=0)
+
+    # Same LOD chain as plow.py: skip levels that would not drop any sections
+    lod = load_lod(PLOW_CONFIG)
+    previous_sections = None
+    for level in range(lod_count(lod)):
+        sections = wing_sections if level == 0 else min(wing_sections, lod_param(lod, "plow_wing", "sections", level, wing_sections))
+        if sections == previous_sections:
+            continue
+        previous_sections = sections
+        for name, side in (("Plow_Wing_L", -1), ("Plow_Wing_R", 1)):
+            verts, faces = plow_wing_geometry(side, sections, wing_length, wing_curve)
+            add_part(builder, lod_name(name, level), verts, make_consistent(verts, faces), "plow_wing", plow_mat, smooth=True, lod=level)
+
+    add_part(builder, "Plow_Tooth", *plow_tooth_geometry(), "plow_tooth", plow_mat, lod=0)
+    return builder.write(output_path)
+
+def build_track_paths(output_path, radius=1.0, length=4.0):
+    builder = GltfBuilder()
+    lut = track_path_extras(radius, length, arc_samples(BULLDOZER_CONFIG))
+    for name, damp_id in (("Asset_TrackPath_L", "path_l"), ("Asset_TrackPath_R", "path_r")):
+        add_part(builder, name, *track_path_geometry(radius, length), damp_id, extras={"arc_lut": lut})
+    return builder.write(output_path)
+
+PARTS = {
+    "plow": (build_plow, "plow.glb"),
+    "track_paths": (build_track_paths, "track_paths.glb"),
+}
+
+# --- Comparison ---
+def load_nodes(path):
+    """{node name: (extras, material damp_id, positions, normals, triangles)} for every mesh node."""
+    gltf, binary = read_glb(path)
+    nodes = {}
+    for node in gltf.get("nodes", []):
+        if "mesh" not in node:
+            continue
+        positions, normals, tris = [], [], []
+        material_ids = set()
+        base = 0
+        for prim in gltf["meshes"][node["mesh"]]["primitives"]:
+            # In node space, so optimized (quantized, node-scaled) files compare like raw exports
+            matrix = node_matrix(node)
+            pos = read_float_accessor(gltf, binary, prim["attributes"]["POSITION"]) @ matrix[:3, :3].T + matrix[:3, 3]
+            nrm = read_float_accessor(gltf, binary, prim["attributes"]["NORMAL"]) @ matrix[:3, :3].T
+            nrm = normalize(nrm)
+            idx = read_accessor(gltf, binary, prim["indices"]).astype(np.int64) if "indices" in prim else np.arange(len(pos))
+            positions.append(pos)
+            normals.append(nrm)
+            tris.append(idx.reshape(-1, 3) + base)
+            base += len(pos)
+            if "material" in prim:
+                material_ids.add(gltf["materials"][prim["material"]].get("extras", {}).get("damp_id"))
+        nodes[node.get("name", "")] = (
+            node.get("extras", {}),
+            sorted(material_ids, key=str),
+            np.concatenate(positions),
+            np.concatenate(normals),
+            np.concatenate(tris),
+        )
+    return nodes
+
+def surface_area(positions, tris):
+    p = positions[tris]
+    return 0.5 * np.linalg.norm(np.cross(p[:, 1] - p[:, 0], p[:, 2] - p[:, 0]), axis=1).sum()
+
+def nearest(points, reference):
+    """Distance from each point to the closest reference point, and that point's index."""
+    best = np.full(len(points), np.inf)
+    index = np.zeros(len(points), dtype=np.int64)
+    for start in range(0, len(reference), 1024):
+        d = np.linalg.norm(points[:, None, :] - reference[None, start:start + 1024, :], axis=2)
+        i = d.argmin(axis=1)
+        closer = d[np.arange(len(points)), i] < best
+        best[closer] = d[np.arange(len(points)), i][closer]
+        index[closer] = i[closer] + start
+    return best, index
+
+def max_normal_error(ours, theirs, tolerance):
+    """Largest angle (degrees) between one of our vertex normals and the closest reference normal at that position."""
+    worst = 0.0
+    for p, n in zip(*ours):
+        at = np.linalg.norm(theirs[0] - p, axis=1) <= tolerance
+        if not at.any():
+            return 180.0
+        best = np.max(theirs[1][at] @ n)
+        worst = max(worst, float(np.degrees(np.arccos(np.clip(best, -1.0, 1.0)))))
+    return worst
+
+def compare(ours_path, reference_path, tolerance=1e-4, normal_degrees=1.0):
+    ours = load_nodes(ours_path)
+    reference = load_nodes(reference_path)
+    failures = 0
+    for name, (extras, materials, pos, nrm, tris) in ours.items():
+        problems = []
+        if name not in reference:
+            print(f"   [COMPARE] FAIL {name}: missing from {os.path.basename(reference_path)}")
+            failures += 1
+            continue
+        ref_extras, ref_materials, ref_pos, ref_nrm, ref_tris = reference[name]
+        for key in ("damp_id", "lod"):
+            if extras.get(key) != ref_extras.get(key):
+                problems.append(f"{key} {extras.get(key)!r} != {ref_extras.get(key)!r}")
+        if extras.get("arc_lut") != ref_extras.get("arc_lut"):
+            problems.append("arc_lut differs")
+        if materials != ref_materials:
+            problems.append(f"material damp_id {materials} != {ref_materials}")
+        if len(tris) != len(ref_tris):
+            problems.append(f"{len(tris)} triangles != {len(ref_tris)}")
+        if not (np.allclose(pos.min(0), ref_pos.min(0), atol=tolerance) and np.allclose(pos.max(0), ref_pos.max(0), atol=tolerance)):
+            problems.append("bounds differ")
+        area, ref_area = surface_area(pos, tris), surface_area(ref_pos, ref_tris)
+        if abs(area - ref_area) > max(tolerance, 1e-3 * ref_area):
+            problems.append(f"surface area {area:.5f} != {ref_area:.5f}")
+        if nearest(pos, ref_pos)[0].max() > tolerance or nearest(ref_pos, pos)[0].max() > tolerance:
+            problems.append("vertex positions differ")
+        else:
+            error = max_normal_error((pos, nrm), (ref_pos, ref_nrm), tolerance)
+            if error > normal_degrees:
+                problems.append(f"normals off by up to {error:.2f} deg")
+        status = "OK  " if not problems else "FAIL"
+        detail = f"{len(tris)} tris, area {area:.4f}" if not problems else "; ".join(problems)
+        print(f"   [COMPARE] {status} {name} ({extras.get('damp_id')}): {detail}")
+        failures += bool(problems)
+    return failures
+
+def main():
+    parser = argparse.ArgumentParser(description="Emit procedural parts as GLB without Blender.")
+    parser.add_argument("part", choices=sorted(PARTS))
+    parser.add_argument("--output", help="Output GLB (default: assets/models/<part>.glb)")
+    parser.add_argument("--compare", metavar="GLB", help="Blender export to check the emitted nodes against")
+    args = parser.parse_args()
+
+    build, filename = PARTS[args.part]
+    output = args.output or os.path.join(MODELS_DIR, filename)
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+
+    start = time.perf_counter()
+    size = build(output)
+    print(f"   [EMIT] {args.part} -> {os.path.relpath(output, ROOT_DIR)} ({size} bytes in {(time.perf_counter() - start) * 1000:.1f} ms)")
+
+    if args.compare:
+        failures = compare(output, args.compare)
+        if failures:
+            print(f"❌ {failures} node(s) differ from {args.compare}")
+            return 1
+        print(f"✅ Matches {args.compare}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,213 @@
+"""
+Minimal glTF 2.0 binary (GLB) container I/O.
+
+`GltfBuilder` accumulates meshes/materials/nodes into one binary buffer and
+writes a GLB; `read_glb` / `read_accessor` parse one back without copying the
+binary chunk.
+"""
+import json
+import struct
+
+import numpy as np
+
+GLB_MAGIC = 0x46546C67   # "glTF"
+CHUNK_JSON = 0x4E4F534A  # "JSON"
+CHUNK_BIN = 0x004E4942   # "BIN\0"
+
+ARRAY_BUFFER = 34962
+ELEMENT_ARRAY_BUFFER = 34963
+
+COMPONENT_DTYPES = {
+    5120: np.int8,
+    5121: np.uint8,
+    5122: np.int16,
+    5123: np.uint16,
+    5125: np.uint32,
+    5126: np.float32,
+}
+DTYPE_COMPONENTS = {np.dtype(v): k for k, v in COMPONENT_DTYPES.items()}
+TYPE_SIZES = {"SCALAR": 1, "VEC2": 2, "VEC3": 3, "VEC4": 4, "MAT2": 4, "MAT3": 9, "MAT4": 16}
+
+def pad4(data, fill=b"\x00"):
+    return data + fill * (-len(data) % 4)
+
+# --- Writing ---
+class GltfBuilder:
+    def __init__(self, generator="DAMP glTF emitter"):
+        self.gltf = {
+            "asset": {"generator": generator, "version": "2.0"},
+            "scene": 0,
+            "scenes": [{"name": "Scene", "nodes": []}],
+            "nodes": [],
+            "meshes": [],
+            "materials": [],
+            "accessors": [],
+            "bufferViews": [],
+            "buffers": [],
+        }
+        self.chunks = []
+        self.length = 0
+
+    def add_view(self, data, target=None):
+        data = pad4(data)
+        view = {"buffer": 0, "byteOffset": self.length, "byteLength": len(data)}
+        if target is not None:
+            view["target"] = target
+        self.chunks.append(data)
+        self.length += len(data)
+        self.gltf["bufferViews"].append(view)
+        return len(self.gltf["bufferViews"]) - 1
+
+    def add_accessor(self, array, accessor_type, target=None, bounds=False):
+        array = np.ascontiguousarray(array)
+        accessor = {
+            "bufferView": self.add_view(array.tobytes(), target),
+            "componentType": DTYPE_COMPONENTS[array.dtype],
+            "count": len(array),
+            "type": accessor_type,
+        }
+        if bounds:
+            # POSITION accessors must carry min/max
+            accessor["min"] = array.min(axis=0).tolist()
+            accessor["max"] = array.max(axis=0).tolist()
+        self.gltf["accessors"].append(accessor)
+        return len(self.gltf["accessors"]) - 1
+
+    def add_material(self, name, damp_id=None, base_color=(0.8, 0.8, 0.8, 1.0), metallic=0.0, roughness=0.5):
+        material = {
+            "doubleSided": True,
+            "name": name,
+            "pbrMetallicRoughness": {
+                "baseColorFactor": list(base_color),
+                "metallicFactor": metallic,
+                "roughnessFactor": roughness,
+            },
+        }
+        if damp_id is not None:
+            material["extras"] = {"damp_id": damp_id}
+        self.gltf["materials"].append(material)
+        return len(self.gltf["materials"]) - 1
+
+    def add_mesh_node(self, name, positions, normals, indices, material=None, extras=None):
+        """Adds a single-primitive mesh and a root node for it. Returns the node index."""
+        index_dtype = np.uint16 if len(positions) <= 0xFFFF else np.uint32
+        primitive = {
+            "attributes": {
+                "POSITION": self.add_accessor(positions.astype(np.float32), "VEC3", ARRAY_BUFFER, bounds=True),
+                "NORMAL": self.add_accessor(normals.astype(np.float32), "VEC3", ARRAY_BUFFER),
+            },
+            "indices": self.add_accessor(indices.astype(index_dtype).ravel(), "SCALAR", ELEMENT_ARRAY_BUFFER),
+        }
+        if material is not None:
+            primitive["material"] = material
+        self.gltf["meshes"].append({"name": f"{name}_Mesh", "primitives": [primitive]})
+
+        node = {"mesh": len(self.gltf["meshes"]) - 1, "name": name}
+        if extras:
+            node["extras"] = dict(extras)
+        self.gltf["nodes"].append(node)
+        node_index = len(self.gltf["nodes"]) - 1
+        self.gltf["scenes"][0]["nodes"].append(node_index)
+        return node_index
+
+    def to_bytes(self):
+        binary = b"".join(self.chunks)
+        gltf = {k: v for k, v in self.gltf.items() if v != []}
+        gltf["buffers"] = [{"byteLength": len(binary)}]
+        return pack_glb(gltf, binary)
+
+    def write(self, path):
+        data = self.to_bytes()
+        with open(path, "wb") as f:
+            f.write(data)
+        return len(data)
+
+def pack_glb(gltf, binary):
+    json_chunk = pad4(json.dumps(gltf, separators=(",", ":")).encode(), b" ")
+    binary = pad4(binary)
+    total = 12 + 8 + len(json_chunk) + (8 + len(binary) if binary else 0)
+    out = [struct.pack("<III", GLB_MAGIC, 2, total), struct.pack("<II", len(json_chunk), CHUNK_JSON), json_chunk]
+    if binary:
+        out += [struct.pack("<II", len(binary), CHUNK_BIN), binary]
+    return b"".join(out)
+
+# --- Reading ---
+def parse_glb(data):
+    """Returns (gltf_json, binary_chunk) for GLB bytes; the binary chunk is a memoryview.
+    Raises ValueError on a malformed container."""
+    view = memoryview(data)
+    if len(view) < 20:
+        raise ValueError("file too short for a GLB header")
+    magic, version, length = struct.unpack_from("<III", view, 0)
+    if magic != GLB_MAGIC:
+        raise ValueError("not a GLB file")
+    if version != 2:
+        raise ValueError(f"unsupported GLB version {version}")
+    if length != len(view):
+        raise ValueError(f"header length {length} != file size {len(view)}")
+    gltf = None
+    binary = None
+    offset = 12
+    while offset < length:
+        if offset + 8 > length:
+            raise ValueError("truncated chunk header")
+        chunk_length, chunk_type = struct.unpack_from("<II", view, offset)
+        if offset + 8 + chunk_length > length:
+            raise ValueError("chunk runs past the end of the file")
+        chunk = view[offset + 8:offset + 8 + chunk_length]
+        if chunk_type == CHUNK_JSON and gltf is None:
+            gltf = json.loads(bytes(chunk))
+        elif chunk_type == CHUNK_BIN and binary is None:
+            binary = chunk
+        offset += 8 + chunk_length
+    if gltf is None:
+        raise ValueError("GLB has no JSON chunk")
+    return gltf, binary if binary is not None else memoryview(b"")
+
+def read_glb(path):
+    with open(path, "rb") as f:
+        return parse_glb(f.read())
+
+def read_accessor(gltf, binary, index):
+    """Accessor data as a (count, components) array, or (count,) for SCALAR."""
+    accessor = gltf["accessors"][index]
+    dtype = np.dtype(COMPONENT_DTYPES[accessor["componentType"]])
+    components = TYPE_SIZES[accessor["type"]]
+    count = accessor["count"]
+    if "bufferView" not in accessor:
+        return np.zeros((count, components) if components > 1 else count, dtype)
+    view = gltf["bufferViews"][accessor["bufferView"]]
+    start = view.get("byteOffset", 0) + accessor.get("byteOffset", 0)
+    item = dtype.itemsize * components
+    stride = view.get("byteStride", item)
+    if count == 0:
+        return np.zeros((0, components) if components > 1 else 0, dtype)
+    raw = np.frombuffer(binary, np.uint8, count=(count - 1) * stride + item, offset=start)
+    data = np.lib.stride_tricks.as_strided(raw, shape=(count, item), strides=(stride, 1))
+    data = np.ascontiguousarray(data).view(dtype).reshape(count, components)
+    return data[:, 0] if components == 1 else data
+
+def read_float_accessor(gltf, binary, index):
+    """Like read_accessor, with normalized integer components mapped back to floats."""
+    data = read_accessor(gltf, binary, index)
+    if not gltf["accessors"][index].get("normalized"):
+        return data.astype(np.float64)
+    info = np.iinfo(data.dtype)
+    if info.min == 0:
+        return data / info.max
+    return np.maximum(data / info.max, -1.0)
+
+def node_matrix(node):
+    """The node's local 4x4 transform (row-major, column vectors)."""
+    if "matrix" in node:
+        return np.array(node["matrix"], dtype=np.float64).reshape(4, 4).T
+    x, y, z, w = node.get("rotation", [0.0, 0.0, 0.0, 1.0])
+    rotation = np.array([
+        [1 - 2 * (y * y + z * z), 2 * (x * y - z * w), 2 * (x * z + y * w)],
+        [2 * (x * y + z * w), 1 - 2 * (x * x + z * z), 2 * (y * z - x * w)],
+        [2 * (x * z - y * w), 2 * (y * z + x * w), 1 - 2 * (x * x + y * y)],
+    ])
+    m = np.eye(4)
+    m[:3, :3] = rotation * np.array(node.get("scale", [1.0, 1.0, 1.0]))
+    m[:3, 3] = node.get("translation", [0.0, 0.0, 0.0])
+    return m
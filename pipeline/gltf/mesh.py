@@ -0,0 +1,165 @@
+"""
+Polygon mesh -> glTF triangle primitive, mirroring what Blender's exporter does.
+
+- `triangulate` ear-clips each polygon in its own plane (handles the concave
+  plow profile caps and the 48-gon track path).
+- `flat_primitive` gives every polygon its own normal and splits vertices where
+  the normal changes; `smooth_primitive` shares angle-weighted vertex normals
+  (Blender's `shade_smooth`).
+- `make_consistent` is `normals_make_consistent(inside=False)`: propagate one
+  winding across shared edges, then point the whole shell outward.
+- `to_y_up` is the exporter's +Y Up conversion: (x, y, z) -> (x, z, -y).
+"""
+from collections import deque
+
+import numpy as np
+
+# --- Polygons ---
+def polygon_normal(points):
+    """Newell normal (unnormalised); robust for non-planar and concave polygons."""
+    nxt = np.roll(points, -1, axis=0)
+    return np.array([
+        np.sum((points[:, 1] - nxt[:, 1]) * (points[:, 2] + nxt[:, 2])),
+        np.sum((points[:, 2] - nxt[:, 2]) * (points[:, 0] + nxt[:, 0])),
+        np.sum((points[:, 0] - nxt[:, 0]) * (points[:, 1] + nxt[:, 1])),
+    ])
+
+def normalize(v):
+    length = np.linalg.norm(v, axis=-1, keepdims=True)
+    return v / np.where(length == 0, 1, length)
+
+def _project(points, normal):
+    # 2D coordinates in the polygon's plane, oriented so the polygon is CCW
+    axis = np.argmax(np.abs(normal))
+    u, v = [(1, 2), (2, 0), (0, 1)][axis]
+    pts = points[:, [u, v]]
+    return pts if normal[axis] >= 0 else pts * [1, -1]
+
+def _cross(o, a, b):
+    return (a[0] - o[0]) * (b[1] - o[1]) - (a[1] - o[1]) * (b[0] - o[0])
+
+def ear_clip(points2d):
+    """Triangulates a simple CCW polygon; returns local index triples."""
+    remaining = list(range(len(points2d)))
+    tris = []
+    guard = 0
+    while len(remaining) > 3 and guard < len(remaining):
+        n = len(remaining)
+        for k in range(n):
+            i, j, l = remaining[k - 1], remaining[k], remaining[(k + 1) % n]
+            a, b, c = points2d[i], points2d[j], points2d[l]
+            if _cross(a, b, c) <= 1e-12:
+                continue
+            inside = False
+            for m in remaining:
+                if m in (i, j, l):
+                    continue
+                p = points2d[m]
+                if _cross(a, b, p) >= 0 and _cross(b, c, p) >= 0 and _cross(c, a, p) >= 0:
+                    inside = True
+                    break
+            if not inside:
+                tris.append((i, j, l))
+                remaining.pop(k)
+                guard = 0
+                break
+        else:
+            # Degenerate remainder (collinear points): fan it rather than loop forever
+            guard = len(remaining)
+    for k in range(1, len(remaining) - 1):
+        tris.append((remaining[0], remaining[k], remaining[k + 1]))
+    return tris
+
+def triangulate(verts, faces):
+    """Returns (triangles (n, 3) of vertex indices, polygon index per triangle)."""
+    verts = np.asarray(verts, dtype=np.float64)
+    tris = []
+    owner = []
+    for f, face in enumerate(faces):
+        face = list(face)
+        if len(face) == 3:
+            local = [(0, 1, 2)]
+        else:
+            pts = verts[face]
+            local = ear_clip(_project(pts, polygon_normal(pts)))
+        for a, b, c in local:
+            tris.append((face[a], face[b], face[c]))
+            owner.append(f)
+    return np.array(tris, dtype=np.int64).reshape(-1, 3), np.array(owner, dtype=np.int64)
+
+# --- Winding ---
+def make_consistent(verts, faces):
+    """Reorients faces so adjacent faces agree and closed shells face outward."""
+    faces = [list(f) for f in faces]
+    edges = {}
+    for f, face in enumerate(faces):
+        for k in range(len(face)):
+            a, b = face[k], face[(k + 1) % len(face)]
+            edges.setdefault((min(a, b), max(a, b)), []).append(f)
+
+    def directed(face):
+        return {(face[k], face[(k + 1) % len(face)]) for k in range(len(face))}
+
+    verts = np.asarray(verts, dtype=np.float64)
+    visited = [False] * len(faces)
+    for seed in range(len(faces)):
+        if visited[seed]:
+            continue
+        visited[seed] = True
+        shell = [seed]
+        queue = deque([seed])
+        while queue:
+            f = queue.popleft()
+            mine = directed(faces[f])
+            for a, b in mine:
+                for g in edges[(min(a, b), max(a, b))]:
+                    if visited[g]:
+                        continue
+                    # Neighbours must traverse a shared edge in the opposite direction
+                    if (a, b) in directed(faces[g]):
+                        faces[g].reverse()
+                    visited[g] = True
+                    shell.append(g)
+                    queue.append(g)
+        # Signed volume of the shell (divergence theorem); negative means inward-facing
+        volume = 0.0
+        for f in shell:
+            p = verts[faces[f]]
+            volume += np.dot(p[0], polygon_normal(p))
+        if volume < 0:
+            for f in shell:
+                faces[f].reverse()
+    return faces
+
+# --- Primitives ---
+def flat_primitive(verts, faces):
+    """Per-polygon normals; corners sharing a position and normal are merged."""
+    verts = np.asarray(verts, dtype=np.float64)
+    tris, owner = triangulate(verts, faces)
+    face_normals = normalize(np.array([polygon_normal(verts[list(f)]) for f in faces]))
+    corner_vert = tris.ravel()
+    corner_normal = face_normals[np.repeat(owner, 3)]
+    keys = np.column_stack((corner_vert, np.round(corner_normal, 6)))
+    unique, inverse = np.unique(keys, axis=0, return_inverse=True)
+    positions = verts[unique[:, 0].astype(np.int64)]
+    normals = unique[:, 1:]
+    return positions, normals, inverse.reshape(-1, 3)
+
+def smooth_primitive(verts, faces):
+    """Shared vertex normals: corner-angle weighted average of the polygon normals."""
+    verts = np.asarray(verts, dtype=np.float64)
+    tris, _ = triangulate(verts, faces)
+    normals = np.zeros_like(verts)
+    for face in faces:
+        face = list(face)
+        pts = verts[face]
+        n = normalize(polygon_normal(pts))
+        prev = normalize(np.roll(pts, 1, axis=0) - pts)
+        nxt = normalize(np.roll(pts, -1, axis=0) - pts)
+        angles = np.arccos(np.clip(np.sum(prev * nxt, axis=1), -1.0, 1.0))
+        np.add.at(normals, face, angles[:, None] * n)
+    return verts, normalize(normals), tris
+
+def to_y_up(v):
+    v = np.asarray(v)
+    return np.column_stack((v[:, 0], v[:, 2], -v[:, 1]))
@@ -0,0 +1,533 @@
+# /// script
+# dependencies = [
+#   "numpy",
+# ]
+# ///
+"""
+Post-export GLB optimizer, rewriting each file in place:
+
+0. Shares repeated meshes: a node whose mesh equals an earlier one up to a
+   translation and/or a mirror across one axis (baked wheel copies, the left
+   and right plow wings) is pointed at that mesh, with the offset and the
+   mirror moved into its node transform. Node names and extras stay per node.
+1. Drops duplicate vertices (identical attribute tuples) and degenerate triangles.
+2. Reorders triangles for the post-transform vertex cache (Forsyth's linear-speed
+   algorithm), then vertices in first-use order for fetch locality.
+3. Quantizes attributes (KHR_mesh_quantization): positions to int16 on a
+   power-of-two grid folded into the node scale, normals to normalized int8,
+   UVs in [0, 1] to normalized uint16.
+
+Node names, extras, materials and images are carried over untouched. Prints
+bytes and estimated ACMR (average cache misses per triangle, 16-entry FIFO)
+before and after for every mesh.
+
+    uv run pipeline/gltf/optimize.py                      # every GLB in assets/models
+    uv run pipeline/gltf/optimize.py assets/models/plow.glb --dry-run
+"""
+import argparse
+import glob
+import math
+import os
+import sys
+
+import numpy as np
+
+from glb import (
+    ARRAY_BUFFER,
+    COMPONENT_DTYPES,
+    DTYPE_COMPONENTS,
+    ELEMENT_ARRAY_BUFFER,
+    TYPE_SIZES,
+    pack_glb,
+    pad4,
+    node_matrix,
+    parse_glb,
+    read_accessor,
+)
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.append(os.path.join(ROOT_DIR, "pipeline", "scripts"))
+from tracing import counter, span
+
+MODELS_DIR = os.path.join(ROOT_DIR, "assets", "models")
+
+QUANTIZATION = "KHR_mesh_quantization"
+TRIANGLES = 4
+FIFO_SIZE = 16
+LRU_SIZE = 32
+# Attribute values closer than this count as equal when matching meshes
+MATCH_TOLERANCE = 1e-5
+
+# --- Vertex Cache ---
+def acmr(indices, cache_size=FIFO_SIZE):
+    """Average cache misses per triangle for a FIFO post-transform cache (1.0 is ideal-ish, 3.0 is worst)."""
+    if len(indices) == 0:
+        return 0.0
+    cache = []
+    misses = 0
+    for v in indices.tolist():
+        if v in cache:
+            continue
+        misses += 1
+        cache.append(v)
+        if len(cache) > cache_size:
+            cache.pop(0)
+    return misses / (len(indices) // 3)
+
+def _vertex_score(position, valence):
+    if valence == 0:
+        return -1.0
+    score = 0.0
+    if position >= 0:
+        # The last triangle's three vertices get a fixed score so it isn't reused immediately
+        score = 0.75 if position < 3 else (1.0 - (position - 3) / (LRU_SIZE - 3)) ** 1.5
+    return score + 2.0 * valence ** -0.5
+
+def optimize_vertex_cache(tris, vertex_count):
+    """Forsyth's linear-speed vertex cache optimisation. Returns the reordered (n, 3) triangles."""
+    n = len(tris)
+    if n == 0:
+        return tris
+    adjacency = [[] for _ in range(vertex_count)]
+    for t, tri in enumerate(tris.tolist()):
+        for v in tri:
+            adjacency[v].append(t)
+    valence = [len(a) for a in adjacency]
+    position = [-1] * vertex_count
+    vscore = [_vertex_score(-1, valence[v]) for v in range(vertex_count)]
+    tri_list = tris.tolist()
+    tscore = [sum(vscore[v] for v in tri) for tri in tri_list]
+    emitted = [False] * n
+
+    order = []
+    cache = []
+    best = max(range(n), key=tscore.__getitem__)
+    scan = 0
+    while best >= 0:
+        emitted[best] = True
+        order.append(best)
+        tri = tri_list[best]
+        for v in tri:
+            adjacency[v].remove(best)
+            valence[v] -= 1
+        # Move the triangle's vertices to the front of the LRU cache
+        cache = tri + [v for v in cache if v not in tri]
+        evicted = cache[LRU_SIZE:]
+        cache = cache[:LRU_SIZE]
+        for v in evicted:
+            position[v] = -1
+        touched = set()
+        for i, v in enumerate(cache):
+            position[v] = i
+            vscore[v] = _vertex_score(i, valence[v])
+            touched.update(adjacency[v])
+        for v in evicted:
+            vscore[v] = _vertex_score(-1, valence[v])
+            touched.update(adjacency[v])
+
+        best, best_score = -1, -1.0
+        for t in touched:
+            tscore[t] = sum(vscore[v] for v in tri_list[t])
+            if tscore[t] > best_score:
+                best, best_score = t, tscore[t]
+        if best < 0:
+            # Nothing adjacent to the cache: continue with the next unemitted triangle
+            while scan < n and emitted[scan]:
+                scan += 1
+            best = scan if scan < n else -1
+    return tris[order]
+
+# --- Primitive ---
+def read_attribute(gltf, binary, index):
+    accessor = gltf["accessors"][index]
+    data = read_accessor(gltf, binary, index)
+    if data.ndim == 1:
+        data = data[:, None]
+    return data, accessor
+
+def weld(attributes, tris):
+    """Merges vertices whose attributes are all identical; drops triangles that collapse."""
+    rows = np.concatenate([np.ascontiguousarray(a).view(np.uint8).reshape(len(a), -1) for a in attributes.values()], axis=1)
+    keys = np.ascontiguousarray(rows).view(np.dtype((np.void, rows.shape[1]))).ravel()
+    _, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+    # Keep first-occurrence order so an already-good layout isn't shuffled
+    rank = np.argsort(np.argsort(first))
+    remap = rank[inverse.ravel()]
+    keep = np.sort(first)
+    tris = remap[tris]
+    tris = tris[(tris[:, 0] != tris[:, 1]) & (tris[:, 1] != tris[:, 2]) & (tris[:, 0] != tris[:, 2])]
+    return {name: a[keep] for name, a in attributes.items()}, tris
+
+def reorder_vertices(attributes, tris):
+    """Renumbers vertices in first-use order of the index buffer; unreferenced vertices are dropped."""
+    flat = tris.ravel()
+    _, first = np.unique(flat, return_index=True)
+    used = flat[np.sort(first)]
+    remap = np.full(len(next(iter(attributes.values()))), -1, dtype=np.int64)
+    remap[used] = np.arange(len(used))
+    return {name: a[used] for name, a in attributes.items()}, remap[tris]
+
+# --- Mesh Sharing ---
+def mesh_key(gltf, binary, mesh, axis=None):
+    """(key, origin): vertex-order independent bytes for the mesh with positions relative to their minimum
+    corner, after mirroring across `axis` if given. None when the mesh can't be mirrored."""
+    prims = []
+    for prim in gltf["meshes"][mesh]["primitives"]:
+        if axis is not None and "TANGENT" in prim["attributes"]:
+            return None, None
+        attributes = {name: read_attribute(gltf, binary, index)[0].astype(np.float64) for name, index in sorted(prim["attributes"].items())}
+        count = len(attributes["POSITION"])
+        tris = read_accessor(gltf, binary, prim["indices"]).astype(np.int64).reshape(-1, 3) if "indices" in prim else np.arange(count).reshape(-1, 3)
+        prims.append((prim, attributes, tris))
+    sign = np.ones(3)
+    if axis is not None:
+        sign[axis] = -1.0
+    origin = np.min([(a["POSITION"] * sign).min(axis=0) for _, a, _ in prims], axis=0)
+
+    key = []
+    for prim, attributes, tris in prims:
+        columns = []
+        for name, values in attributes.items():
+            if name == "POSITION":
+                values = values * sign - origin
+            elif name == "NORMAL":
+                values = values * sign
+            columns.append(values)
+        rows = np.round(np.concatenate(columns, axis=1) / MATCH_TOLERANCE).astype(np.int64)
+        if axis is not None:
+            tris = tris[:, ::-1]  # A mirror flips the winding
+        # Start every triangle at its smallest vertex (keeps winding), then sort the triangles
+        _, rank = np.unique(rows, axis=0, return_inverse=True)
+        start = rank.ravel()[tris].argmin(axis=1)
+        tris = tris[np.arange(len(tris))[:, None], (start[:, None] + np.arange(3)) % 3]
+        records = rows[tris].reshape(len(tris), -1)
+        records = records[np.lexsort(records.T[::-1])]
+        key.append(repr((prim.get("material"), list(attributes), records.shape)).encode() + records.tobytes())
+    return b"|".join(key), origin
+
+def move_into_node(node, offset, axis):
+    """node' = node * T(offset) * mirror(axis), so mirror(v) + offset lands where v did before."""
+    if "matrix" in node:
+        m = node_matrix(node)
+        m[:3, 3] = m[:3, :3] @ offset + m[:3, 3]
+        if axis is not None:
+            m[:3, axis] *= -1.0
+        node["matrix"] = m.T.ravel().tolist()
+        return
+    # The scale is diagonal, so the mirror folds into it and TRS form is kept
+    node["translation"] = (node_matrix(node)[:3, :3] @ offset + node.get("translation", [0.0, 0.0, 0.0])).tolist()
+    if axis is not None:
+        scale = list(node.get("scale", [1.0, 1.0, 1.0]))
+        scale[axis] = -scale[axis]
+        node["scale"] = scale
+
+def share_meshes(gltf, binary, meshes):
+    """Points nodes at an earlier mesh they repeat (translated, or mirrored across one axis) and drops the copies.
+
+    A mesh drawn by a node with children is left alone, so no subtree moves. Returns a report row per shared node.
+    """
+    nodes = gltf.get("nodes", [])
+    blocked = {n["mesh"] for n in nodes if "mesh" in n and (n.get("children") or "skin" in n)}
+    seen = {}
+    matches = {}
+    for node in nodes:
+        mesh = node.get("mesh")
+        if mesh not in meshes or mesh in matches or any(m == mesh for m, _ in seen.values()):
+            continue
+        key, origin = mesh_key(gltf, binary, mesh)
+        if mesh in blocked:
+            seen.setdefault(key, (mesh, origin))
+        elif key in seen:
+            matches[mesh] = (seen[key][0], origin - seen[key][1], None)
+        else:
+            for axis in range(3):
+                mirrored, mirrored_origin = mesh_key(gltf, binary, mesh, axis)
+                if mirrored in seen:
+                    sign = np.ones(3)
+                    sign[axis] = -1.0
+                    # mirror(v) = v_target - origin_target + mirrored_origin
+                    matches[mesh] = (seen[mirrored][0], (mirrored_origin - seen[mirrored][1]) * sign, axis)
+                    break
+            else:
+                seen[key] = (mesh, origin)
+
+    rows = []
+    for node in nodes:
+        if node.get("mesh") not in matches:
+            continue
+        target, offset, axis = matches[node["mesh"]]
+        move_into_node(node, offset, axis)
+        node["mesh"] = target
+        rows.append({
+            "node": node.get("name", ""),
+            "shares": gltf["meshes"][target].get("name", f"mesh_{target}"),
+            "transform": f"mirrored {'xyz'[axis]}" if axis is not None else "translated" if offset.any() else "identical",
+        })
+    if matches:
+        kept = [m for m in range(len(gltf["meshes"])) if m not in matches]
+        renumber = {old: new for new, old in enumerate(kept)}
+        gltf["meshes"] = [gltf["meshes"][m] for m in kept]
+        for node in nodes:
+            if "mesh" in node:
+                node["mesh"] = renumber[node["mesh"]]
+    return rows
+
+# --- Quantization ---
+def position_step(gltf, binary, meshes):
+    """Power-of-two grid step that keeps every quantized position mesh within int16."""
+    extent = 0.0
+    for mesh in meshes:
+        for prim in gltf["meshes"][mesh]["primitives"]:
+            accessor = gltf["accessors"][prim["attributes"]["POSITION"]]
+            if "min" in accessor and "max" in accessor:
+                extent = max(extent, *(abs(v) for v in accessor["min"] + accessor["max"]))
+            else:
+                extent = max(extent, float(np.abs(read_accessor(gltf, binary, prim["attributes"]["POSITION"])).max()))
+    return 2.0 ** math.ceil(math.log2(max(extent, 1e-6) / 32767))
+
+def quantize(name, data, step):
+    """Returns (array, normalized) for the attribute, or None to keep it as float."""
+    if data.dtype != np.float32:
+        return None
+    if name == "POSITION" and step is not None:
+        return np.round(data / step).astype(np.int16), False
+    if name == "NORMAL":
+        return np.round(np.clip(data, -1.0, 1.0) * 127).astype(np.int8), True
+    if name.startswith("TEXCOORD_") and data.size and data.min() >= 0.0 and data.max() <= 1.0:
+        return np.round(data * 65535).astype(np.uint16), True
+    return None
+
+def scale_node(node, s):
+    if "matrix" in node:
+        m = node["matrix"]
+        node["matrix"] = [v * s if i < 12 else v for i, v in enumerate(m)]
+    else:
+        node["scale"] = [v * s for v in node.get("scale", [1.0, 1.0, 1.0])]
+
+def unscale_child(node, s):
+    # child' = diag(1/s) * child, so the dequantization scale doesn't leak into children
+    if "matrix" in node:
+        m = node["matrix"]
+        node["matrix"] = [v / s if i % 4 < 3 else v for i, v in enumerate(m)]
+    else:
+        node["translation"] = [v / s for v in node.get("translation", [0.0, 0.0, 0.0])]
+        node["scale"] = [v / s for v in node.get("scale", [1.0, 1.0, 1.0])]
+
+# --- Rewrite ---
+class BufferWriter:
+    def __init__(self):
+        self.views = []
+        self.chunks = []
+        self.length = 0
+
+    def add(self, data, target=None, stride=None):
+        data = pad4(data)
+        view = {"buffer": 0, "byteOffset": self.length, "byteLength": len(data)}
+        if stride is not None:
+            view["byteStride"] = stride
+        if target is not None:
+            view["target"] = target
+        self.views.append(view)
+        self.chunks.append(data)
+        self.length += len(data)
+        return len(self.views) - 1
+
+    def add_attribute(self, data, accessor_type, normalized=False, bounds=False):
+        count, components = data.shape
+        item = data.dtype.itemsize * components
+        stride = item + (-item % 4)  # vertex attribute elements must be 4-byte aligned
+        packed = np.zeros((count, stride), dtype=np.uint8)
+        packed[:, :item] = np.ascontiguousarray(data).view(np.uint8).reshape(count, item)
+        accessor = {
+            "bufferView": self.add(packed.tobytes(), ARRAY_BUFFER, stride if stride != item else None),
+            "componentType": DTYPE_COMPONENTS[data.dtype],
+            "count": count,
+            "type": accessor_type,
+        }
+        if normalized:
+            accessor["normalized"] = True
+        if bounds:
+            accessor["min"] = data.min(axis=0).tolist()
+            accessor["max"] = data.max(axis=0).tolist()
+        return accessor
+
+def optimizable(gltf, mesh, skinned):
+    for prim in gltf["meshes"][mesh]["primitives"]:
+        if prim.get("mode", TRIANGLES) != TRIANGLES or prim.get("targets") or "POSITION" not in prim["attributes"]:
+            return False
+        for index in list(prim["attributes"].values()) + ([prim["indices"]] if "indices" in prim else []):
+            if "sparse" in gltf["accessors"][index] or "bufferView" not in gltf["accessors"][index]:
+                return False
+    return mesh not in skinned
+
+def accessor_bytes(gltf, index):
+    accessor = gltf["accessors"][index]
+    view = gltf["bufferViews"][accessor["bufferView"]]
+    item = np.dtype(COMPONENT_DTYPES[accessor["componentType"]]).itemsize * TYPE_SIZES[accessor["type"]]
+    return accessor["count"] * view.get("byteStride", item)
+
+def optimize_glb(data):
+    """Returns (new GLB bytes, per-mesh report rows), or (None, reason) if the file is left alone."""
+    gltf, binary = parse_glb(data)
+    if QUANTIZATION in gltf.get("extensionsUsed", []):
+        return None, "already optimized"
+    if len(gltf.get("buffers", [])) != 1 or "uri" in gltf["buffers"][0]:
+        return None, "expects a single embedded buffer"
+
+    skinned = {n["mesh"] for n in gltf.get("nodes", []) if "mesh" in n and "skin" in n}
+    meshes = [m for m in range(len(gltf.get("meshes", []))) if optimizable(gltf, m, skinned)]
+    shared = share_meshes(gltf, binary, meshes)
+    if shared:
+        # Mesh indices were renumbered
+        skinned = {n["mesh"] for n in gltf.get("nodes", []) if "mesh" in n and "skin" in n}
+        meshes = [m for m in range(len(gltf.get("meshes", []))) if optimizable(gltf, m, skinned)]
+    step = position_step(gltf, binary, meshes) if meshes else None
+
+    writer = BufferWriter()
+    accessors = []
+    remap_accessor = {}
+
+    def keep_accessor(index):
+        # Accessors outside optimized meshes (skins, animations, untouched meshes) are copied verbatim
+        if index not in remap_accessor:
+            accessor = dict(gltf["accessors"][index])
+            if "bufferView" in accessor:
+                accessor["bufferView"] = keep_view(accessor["bufferView"])
+            remap_accessor[index] = len(accessors)
+            accessors.append(accessor)
+        return remap_accessor[index]
+
+    kept_views = {}
+    def keep_view(index):
+        if index not in kept_views:
+            view = gltf["bufferViews"][index]
+            start = view.get("byteOffset", 0)
+            chunk = bytes(binary[start:start + view["byteLength"]])
+            kept_views[index] = writer.add(chunk, view.get("target"), view.get("byteStride"))
+        return kept_views[index]
+
+    report = list(shared)
+    for m, mesh in enumerate(gltf.get("meshes", [])):
+        for prim in mesh["primitives"]:
+            if m not in meshes:
+                prim["attributes"] = {k: keep_accessor(v) for k, v in prim["attributes"].items()}
+                if "indices" in prim:
+                    prim["indices"] = keep_accessor(prim["indices"])
+                for target in prim.get("targets", []):
+                    for k, v in target.items():
+                        target[k] = keep_accessor(v)
+                continue
+
+            attributes = {}
+            before = 0
+            for name, index in prim["attributes"].items():
+                attributes[name], _ = read_attribute(gltf, binary, index)
+                before += accessor_bytes(gltf, index)
+            count = len(attributes["POSITION"])
+            if "indices" in prim:
+                tris = read_accessor(gltf, binary, prim["indices"]).astype(np.int64).reshape(-1, 3)
+                before += accessor_bytes(gltf, prim["indices"])
+            else:
+                tris = np.arange(count, dtype=np.int64).reshape(-1, 3)
+            acmr_before = acmr(tris.ravel())
+
+            attributes, tris = weld(attributes, tris)
+            tris = optimize_vertex_cache(tris, len(attributes["POSITION"]))
+            attributes, tris = reorder_vertices(attributes, tris)
+
+            after = 0
+            new_attributes = {}
+            for name, values in attributes.items():
+                old = gltf["accessors"][prim["attributes"][name]]
+                quantized = quantize(name, values, step)
+                if quantized is None:
+                    array, normalized = values, old.get("normalized", False)
+                else:
+                    array, normalized = quantized
+                accessor = writer.add_attribute(array, old["type"], normalized, bounds=(name == "POSITION"))
+                after += writer.views[accessor["bufferView"]]["byteLength"]
+                new_attributes[name] = len(accessors)
+                accessors.append(accessor)
+            prim["attributes"] = new_attributes
+
+            index_dtype = np.uint16 if len(attributes["POSITION"]) <= 0xFFFF else np.uint32
+            indices = tris.astype(index_dtype).ravel()
+            view = writer.add(indices.tobytes(), ELEMENT_ARRAY_BUFFER)
+            after += writer.views[view]["byteLength"]
+            prim["indices"] = len(accessors)
+            accessors.append({"bufferView": view, "componentType": DTYPE_COMPONENTS[indices.dtype], "count": len(indices), "type": "SCALAR"})
+
+            report.append({
+                "mesh": mesh.get("name", f"mesh_{m}"),
+                "vertices": [count, len(attributes["POSITION"])],
+                "bytes": [before, after],
+                "acmr": [round(acmr_before, 3), round(acmr(indices), 3)],
+            })
+
+    for skin in gltf.get("skins", []):
+        if "inverseBindMatrices" in skin:
+            skin["inverseBindMatrices"] = keep_accessor(skin["inverseBindMatrices"])
+    for animation in gltf.get("animations", []):
+        for sampler in animation["samplers"]:
+            sampler["input"] = keep_accessor(sampler["input"])
+            sampler["output"] = keep_accessor(sampler["output"])
+    for image in gltf.get("images", []):
+        if "bufferView" in image:
+            image["bufferView"] = keep_view(image["bufferView"])
+
+    # Fold the position grid step into every node that draws a quantized mesh
+    if step is not None:
+        nodes = gltf.get("nodes", [])
+        for node in nodes:
+            if node.get("mesh") in meshes:
+                scale_node(node, step)
+                for child in node.get("children", []):
+                    unscale_child(nodes[child], step)
+        for ext in ("extensionsUsed", "extensionsRequired"):
+            gltf[ext] = sorted(set(gltf.get(ext, [])) | {QUANTIZATION})
+
+    gltf["accessors"] = accessors
+    gltf["bufferViews"] = writer.views
+    new_binary = b"".join(writer.chunks)
+    gltf["buffers"] = [{"byteLength": len(new_binary)}]
+    return pack_glb(gltf, new_binary), report
+
+def optimize_file(path, dry_run=False):
+    with open(path, "rb") as f:
+        data = f.read()
+    name = os.path.relpath(path, ROOT_DIR)
+    with span("optimize_glb", cat="gltf", file=name):
+        out, report = optimize_glb(data)
+    if out is None:
+        print(f"   [OPTIMIZE] SKIP {name} ({report})")
+        return True
+    counter(os.path.basename(path), cat="gltf", before=len(data), after=len(out))
+    for row in report:
+        if "shares" in row:
+            print(f"   [OPTIMIZE]   {row['node']:<24} shares {row['shares']} ({row['transform']})")
+            continue
+        (v0, v1), (b0, b1), (a0, a1) = row["vertices"], row["bytes"], row["acmr"]
+        print(f"   [OPTIMIZE]   {row['mesh']:<24} verts {v0:>5} -> {v1:<5} bytes {b0:>7} -> {b1:<7} ACMR {a0:.2f} -> {a1:.2f}")
+    saved = 100.0 * (1 - len(out) / len(data)) if data else 0.0
+    print(f"   [OPTIMIZE] {name}: {len(data)} -> {len(out)} bytes ({saved:.1f}% smaller){' (dry run)' if dry_run else ''}")
+    if not dry_run:
+        with open(path, "wb") as f:
+            f.write(out)
+    return True
+
+def main():
+    parser = argparse.ArgumentParser(description="Share repeated meshes, weld, cache-optimize and quantize GLBs in place.")
+    parser.add_argument("paths", nargs="*", help="GLB files (default: assets/models/*.glb)")
+    parser.add_argument("--dry-run", action="store_true", help="Report savings without rewriting files")
+    args = parser.parse_args()
+
+    paths = args.paths or sorted(glob.glob(os.path.join(MODELS_DIR, "*.glb")))
+    if not paths:
+        print("   [OPTIMIZE] No GLBs found")
+        return 0
+    for path in paths:
+        optimize_file(path, dry_run=args.dry_run)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
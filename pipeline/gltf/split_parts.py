@@ -0,0 +1,257 @@
+# /// script
+# dependencies = [
+#   "numpy",
+# ]
+# ///
+"""
+Splits an optimized GLB into one GLB per component group, for streaming.
+
+The mapping config's "streaming" section groups damp_ids into parts and gives
+each a load priority (lower loads first):
+
+    "streaming": {"chassis": {"parts": ["chassis", "wheel"], "priority": 0}, ...}
+
+Every node goes to the part of its damp_id (LOD nodes included, they share it);
+nodes without one, or with an unlisted one, follow their parent, and such
+roots go to the first part. A node whose parent lands in another part (the
+cabin under the body) becomes a root of its own part with the parent's
+transform baked in, so it lands where it was. Meshes, materials, textures and
+images are copied into each part that uses them; materials keep their
+damp_id, so every part resolves its look from the same mapping config at
+load time. Skins and animations are not carried over.
+
+Writes `assets/models/parts/<name>.<part>.glb` and a priority manifest
+`assets/models/parts/<name>.parts.json`:
+
+    {"format": 1, "source": "bulldozer_components.glb",
+     "parts": [{"name": "chassis", "file": "bulldozer_components.chassis.glb", "priority": 0,
+                "damp_ids": ["chassis", "wheel"], "nodes": 9, "bytes": 14212}, ...]}
+
+    uv run pipeline/gltf/split_parts.py assets/models/bulldozer_components.glb --config assets/configs/bulldozer_mapping.json
+"""
+import argparse
+import json
+import os
+import sys
+
+from glb import node_matrix, pack_glb, read_glb
+from optimize import BufferWriter
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+PARTS_DIR = os.path.join(ROOT_DIR, "assets", "models", "parts")
+FORMAT_VERSION = 1
+
+def parts_paths(model_path, out_dir=PARTS_DIR):
+    """(manifest path, directory) the parts of `model_path` are written to."""
+    stem = os.path.splitext(os.path.basename(model_path))[0]
+    return os.path.join(out_dir, f"{stem}.parts.json"), out_dir
+
+def load_streaming(config_path):
+    with open(config_path) as f:
+        streaming = json.load(f).get("streaming", {})
+    # Priority first, then config order
+    return sorted(streaming.items(), key=lambda item: item[1].get("priority", 0))
+
+# --- Assignment ---
+def assign_parts(gltf, groups):
+    """Part name per node index."""
+    nodes = gltf.get("nodes", [])
+    part_of_id = {damp_id: name for name, spec in groups for damp_id in spec["parts"]}
+    assigned = {}
+
+    def visit(index, inherited):
+        damp_id = nodes[index].get("extras", {}).get("damp_id")
+        part = part_of_id.get(damp_id, inherited)
+        assigned[index] = part
+        for child in nodes[index].get("children", []):
+            visit(child, part)
+
+    for root in scene_roots(gltf):
+        visit(root, groups[0][0])
+    return assigned
+
+def scene_roots(gltf):
+    nodes = gltf.get("nodes", [])
+    scenes = gltf.get("scenes")
+    if not scenes:
+        children = {c for n in nodes for c in n.get("children", [])}
+        return [i for i in range(len(nodes)) if i not in children]
+    return scenes[gltf.get("scene", 0)]["nodes"]
+
+def world_matrices(gltf):
+    nodes = gltf.get("nodes", [])
+    parents = {c: i for i, n in enumerate(nodes) for c in n.get("children", [])}
+    world = {}
+
+    def matrix(index):
+        if index not in world:
+            local = node_matrix(nodes[index])
+            world[index] = matrix(parents[index]) @ local if index in parents else local
+        return world[index]
+
+    return parents, matrix
+
+# --- Extraction ---
+def extract_part(gltf, binary, part, assigned, parents, world):
+    """GLB bytes holding only the nodes assigned to `part`, and their node count."""
+    src_nodes = gltf.get("nodes", [])
+    members = [i for i in range(len(src_nodes)) if assigned.get(i) == part]
+    node_remap = {old: new for new, old in enumerate(members)}
+
+    writer = BufferWriter()
+    out = {"asset": dict(gltf["asset"]), "scene": 0, "scenes": [{"name": part, "nodes": []}], "nodes": []}
+    remaps = {key: {} for key in ("meshes", "materials", "textures", "images", "samplers", "accessors", "bufferViews")}
+
+    def keep(key, index, convert):
+        if index not in remaps[key]:
+            item = convert(dict(gltf[key][index]))
+            remaps[key][index] = len(out.setdefault(key, []))
+            out[key].append(item)
+        return remaps[key][index]
+
+    def view(index):
+        def convert(v):
+            start = v.get("byteOffset", 0)
+            new = writer.add(bytes(binary[start:start + v["byteLength"]]), v.get("target"), v.get("byteStride"))
+            return writer.views[new]
+        return keep("bufferViews", index, convert)
+
+    def accessor(index):
+        def convert(a):
+            if "bufferView" in a:
+                a["bufferView"] = view(a["bufferView"])
+            if "sparse" in a:
+                sparse = a["sparse"] = json.loads(json.dumps(a["sparse"]))
+                sparse["indices"]["bufferView"] = view(sparse["indices"]["bufferView"])
+                sparse["values"]["bufferView"] = view(sparse["values"]["bufferView"])
+            return a
+        return keep("accessors", index, convert)
+
+    def image(index):
+        def convert(img):
+            if "bufferView" in img:
+                img["bufferView"] = view(img["bufferView"])
+            return img
+        return keep("images", index, convert)
+
+    def texture(index):
+        def convert(t):
+            if "source" in t:
+                t["source"] = image(t["source"])
+            if "sampler" in t:
+                t["sampler"] = keep("samplers", t["sampler"], dict)
+            for ext in t.get("extensions", {}).values():
+                if "source" in ext:
+                    ext["source"] = image(ext["source"])
+            return t
+        return keep("textures", index, convert)
+
+    def material(index):
+        def convert(m):
+            # Texture references sit at any depth ({"index": n} objects under *Texture keys)
+            m = json.loads(json.dumps(m))
+            def walk(obj):
+                for key, value in obj.items():
+                    if isinstance(value, dict):
+                        if key.endswith("Texture") and "index" in value:
+                            value["index"] = texture(value["index"])
+                        walk(value)
+            walk(m)
+            return m
+        return keep("materials", index, convert)
+
+    def mesh(index):
+        def convert(m):
+            m = json.loads(json.dumps(m))
+            for prim in m["primitives"]:
+                prim["attributes"] = {k: accessor(v) for k, v in prim["attributes"].items()}
+                if "indices" in prim:
+                    prim["indices"] = accessor(prim["indices"])
+                if "material" in prim:
+                    prim["material"] = material(prim["material"])
+                prim["targets"] = [{k: accessor(v) for k, v in t.items()} for t in prim.get("targets", [])]
+                if not prim["targets"]:
+                    del prim["targets"]
+            return m
+        return keep("meshes", index, convert)
+
+    for old in members:
+        node = {k: v for k, v in src_nodes[old].items() if k not in ("skin", "children")}
+        children = [node_remap[c] for c in src_nodes[old].get("children", []) if c in node_remap]
+        if children:
+            node["children"] = children
+        if "mesh" in node:
+            node["mesh"] = mesh(node["mesh"])
+        parent = parents.get(old)
+        if parent is None or parent not in node_remap:
+            out["scenes"][0]["nodes"].append(node_remap[old])
+            if parent is not None:
+                # Detached from a parent in another part: keep its placement
+                for key in ("translation", "rotation", "scale"):
+                    node.pop(key, None)
+                node["matrix"] = world(old).T.ravel().tolist()
+        out["nodes"].append(node)
+
+    for key in ("extensionsUsed", "extensionsRequired"):
+        if key in gltf:
+            out[key] = list(gltf[key])
+    new_binary = b"".join(writer.chunks)
+    if new_binary:
+        out["bufferViews"] = writer.views
+        out["buffers"] = [{"byteLength": len(new_binary)}]
+    return pack_glb(out, new_binary), len(members)
+
+def split_file(path, config_path, out_dir=PARTS_DIR):
+    """Writes the part GLBs and the manifest of `path`. Returns the manifest, or None without a streaming section."""
+    groups = load_streaming(config_path)
+    if not groups:
+        print(f"   [SPLIT] SKIP {os.path.basename(path)} (no \"streaming\" section in {os.path.basename(config_path)})")
+        return None
+    gltf, binary = read_glb(path)
+    assigned = assign_parts(gltf, groups)
+    parents, world = world_matrices(gltf)
+    manifest_path, parts_dir = parts_paths(path, out_dir)
+    os.makedirs(parts_dir, exist_ok=True)
+    stem = os.path.splitext(os.path.basename(path))[0]
+
+    parts = []
+    for name, spec in groups:
+        if name not in assigned.values():
+            print(f"   [SPLIT]   {name:<10} no nodes, skipped")
+            continue
+        data, count = extract_part(gltf, binary, name, assigned, parents, world)
+        file = f"{stem}.{name}.glb"
+        with open(os.path.join(parts_dir, file), "wb") as f:
+            f.write(data)
+        parts.append({
+            "name": name,
+            "file": file,
+            "priority": spec.get("priority", 0),
+            "damp_ids": list(spec["parts"]),
+            "nodes": count,
+            "bytes": len(data),
+        })
+        print(f"   [SPLIT]   {name:<10} priority {parts[-1]['priority']}  {count:>3} nodes  {len(data):>7} bytes")
+
+    manifest = {"format": FORMAT_VERSION, "source": os.path.basename(path), "parts": parts}
+    with open(manifest_path, "w") as f:
+        json.dump(manifest, f, indent=2)
+        f.write("\n")
+    first = min(p["priority"] for p in parts)
+    first_bytes = sum(p["bytes"] for p in parts if p["priority"] == first)
+    print(f"   [SPLIT] {os.path.basename(path)}: {len(parts)} parts, first priority {first_bytes} of "
+          f"{sum(p['bytes'] for p in parts)} bytes -> {os.path.relpath(manifest_path, ROOT_DIR)}")
+    return manifest
+
+def main():
+    parser = argparse.ArgumentParser(description="Split a GLB into per-component GLBs with a load-priority manifest.")
+    parser.add_argument("path", help="GLB to split (e.g. assets/models/plow.glb)")
+    parser.add_argument("--config", required=True, help="Mapping config with a \"streaming\" section")
+    parser.add_argument("--out", default=PARTS_DIR, help="Output directory for the parts and manifest")
+    args = parser.parse_args()
+
+    split_file(args.path, args.config, args.out)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,213 @@
+# /// script
+# dependencies = [
+#   "numpy",
+# ]
+# ///
+"""
+Precomputed gem layouts.
+
+Places each zone's gems with Poisson-disk sampling (Bridson, one background
+grid cell per point, every candidate ring tested against its 5x5 cell
+neighbourhood in one NumPy step), so no two gems overlap at spawn and
+Matter.js has no penetrations to resolve on the first frames. Radii, colours
+and values use the same per-zone ranges as spawnZoneGems in
+src/entities/gem.js.
+
+Several seeded variants are written per zone as column-major binaries
+(typed-array friendly, little endian):
+
+    x float32[n] | y float32[n] | radius float32[n] | color uint8[n] | value uint8[n]
+
+with assets/layouts/gems.json indexing them (seed, count, column offsets,
+zone bounds and colours). loadGemLayouts() in gem.js picks a variant per zone
+at random and falls back to runtime sampling when the index is missing.
+
+    uv run pipeline/layouts/gem_layouts.py
+    uv run pipeline/layouts/gem_layouts.py --variants 8 --count 400 --seed 7
+"""
+import argparse
+import json
+import math
+import os
+import time
+
+import numpy as np
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+LAYOUTS_DIR = os.path.join(ROOT_DIR, "assets", "layouts")
+INDEX_NAME = "gems.json"
+FORMAT_VERSION = 1
+
+# Mirrors initGems() in src/entities/gem.js: (x0, x1, y0, y1), value range, colours
+ZONES = {
+    1: {"bounds": [-500, 500, -500, 500], "values": [8, 12], "colors": ["#00FFFF", "#FF00FF"]},
+    2: {"bounds": [-500, 500, -1700, -700], "values": [25, 40], "colors": ["#FFFF00"]},
+    3: {"bounds": [-500, 500, -2900, -1900], "values": [100, 200], "colors": ["#00FF00"]},
+}
+RADIUS_RANGE = (8.0, 12.0)
+COLUMNS = [("x", "float32"), ("y", "float32"), ("radius", "float32"), ("color", "uint8"), ("value", "uint8")]
+
+# --- Sampling ---
+def poisson_disk(bounds, spacing, rng, k=30):
+    """Bridson sampling inside bounds with minimum centre distance `spacing`. Returns (n, 2) float64."""
+    x0, x1, y0, y1 = bounds
+    cell = spacing / math.sqrt(2)
+    cols, rows = int(math.ceil((x1 - x0) / cell)), int(math.ceil((y1 - y0) / cell))
+    # Two padding cells on every side so the 5x5 neighbourhood never needs bounds checks
+    grid = np.full((rows + 4, cols + 4), -1, dtype=np.int64)
+    points = np.empty((rows * cols + 1, 2))
+    offsets = np.arange(-2, 3)
+
+    def cell_of(p):
+        return (((p[..., 1] - y0) / cell).astype(np.int64) + 2, ((p[..., 0] - x0) / cell).astype(np.int64) + 2)
+
+    points[0] = (x0 + rng.random() * (x1 - x0), y0 + rng.random() * (y1 - y0))
+    gy, gx = cell_of(points[0])
+    grid[gy, gx] = 0
+    count, active = 1, [0]
+    while active:
+        slot = int(rng.integers(len(active)))
+        origin = points[active[slot]]
+        # k candidates in the annulus [spacing, 2 * spacing) around the origin
+        angle = rng.random(k) * 2 * math.pi
+        radius = spacing * (1.0 + rng.random(k))
+        candidates = origin + np.stack([np.cos(angle), np.sin(angle)], axis=1) * radius[:, None]
+        inside = (candidates[:, 0] >= x0) & (candidates[:, 0] < x1) & (candidates[:, 1] >= y0) & (candidates[:, 1] < y1)
+        candidates = candidates[inside]
+        if len(candidates):
+            cy, cx = cell_of(candidates)
+            neighbours = grid[cy[:, None, None] + offsets[None, :, None], cx[:, None, None] + offsets[None, None, :]]
+            taken = neighbours >= 0
+            delta = points[np.where(taken, neighbours, 0)] - candidates[:, None, None, :]
+            too_close = taken & (np.einsum("kijd,kijd->kij", delta, delta) < spacing * spacing)
+            free = np.flatnonzero(~too_close.any(axis=(1, 2)))
+        else:
+            free = []
+        if len(free):
+            point = candidates[free[0]]
+            points[count] = point
+            gy, gx = cell_of(point)
+            grid[gy, gx] = count
+            active.append(count)
+            count += 1
+        else:
+            active[slot] = active[-1]
+            active.pop()
+    return points[:count]
+
+def zone_layout(zone, count, seed, gap):
+    """`count` non-overlapping gems for a zone; spacing starts from the zone's density and tightens until they fit."""
+    rng = np.random.default_rng(seed)
+    x0, x1, y0, y1 = zone["bounds"]
+    floor = 2 * RADIUS_RANGE[1] + gap
+    spacing = max(floor, math.sqrt((x1 - x0) * (y1 - y0) / count))
+    while True:
+        points = poisson_disk(zone["bounds"], spacing, rng)
+        if len(points) >= count:
+            break
+        if spacing == floor:
+            raise ValueError(f"{count} gems do not fit in {zone['bounds']} at spacing {floor:.1f}")
+        spacing = max(floor, spacing * 0.9)
+    # Random subset in random order: any prefix is still non-overlapping (used for ?gems=N below the default)
+    points = points[rng.permutation(len(points))[:count]]
+    val_min, val_max = zone["values"]
+    return {
+        "x": points[:, 0].astype(np.float32),
+        "y": points[:, 1].astype(np.float32),
+        "radius": (RADIUS_RANGE[0] + rng.random(count) * (RADIUS_RANGE[1] - RADIUS_RANGE[0])).astype(np.float32),
+        "color": rng.integers(len(zone["colors"]), size=count).astype(np.uint8),
+        # Same as Math.floor(valMin + Math.random() * (valMax - valMin))
+        "value": np.floor(val_min + rng.random(count) * (val_max - val_min)).astype(np.uint8),
+    }, spacing
+
+def random_layout(zone, count, seed):
+    """What spawnZoneGems does at runtime (uniform positions), for comparison."""
+    rng = np.random.default_rng(seed)
+    x0, x1, y0, y1 = zone["bounds"]
+    return {
+        "x": x0 + rng.random(count) * (x1 - x0),
+        "y": y0 + rng.random(count) * (y1 - y0),
+        "radius": RADIUS_RANGE[0] + rng.random(count) * (RADIUS_RANGE[1] - RADIUS_RANGE[0]),
+    }
+
+def overlaps(layout, chunk=1024):
+    """(overlapping pairs, smallest clearance between gem edges), pairwise in row chunks."""
+    pos = np.stack([layout["x"], layout["y"]], axis=1).astype(np.float64)
+    radius = layout["radius"].astype(np.float64)
+    pairs, clearance = 0, math.inf
+    for start in range(0, len(pos), chunk):
+        block = slice(start, start + chunk)
+        dist = np.linalg.norm(pos[block, None, :] - pos[None, :, :], axis=2) - (radius[block, None] + radius[None, :])
+        # Upper triangle only (j > i)
+        upper = np.arange(len(pos))[None, :] > np.arange(start, start + dist.shape[0])[:, None]
+        gaps = dist[upper]
+        if gaps.size:
+            pairs += int((gaps < 0).sum())
+            clearance = min(clearance, float(gaps.min()))
+    return pairs, clearance
+
+# --- Output ---
+def encode(layout):
+    """Column-major bytes and per-column byte offsets (float32 columns first, so they stay 4-byte aligned)."""
+    offsets, chunks, offset = {}, [], 0
+    for name, dtype in COLUMNS:
+        data = np.ascontiguousarray(layout[name], dtype=np.dtype(dtype).newbyteorder("<"))
+        offsets[name] = offset
+        chunks.append(data.tobytes())
+        offset += data.nbytes
+    return b"".join(chunks), offsets
+
+def build_layouts(out_dir, count, variants, base_seed, gap):
+    os.makedirs(out_dir, exist_ok=True)
+    index = {
+        "format": FORMAT_VERSION,
+        "columns": [{"name": name, "type": dtype} for name, dtype in COLUMNS],
+        "zones": {},
+    }
+    written = set()
+    for zone_id, zone in ZONES.items():
+        entry = {**zone, "radius": list(RADIUS_RANGE), "variants": []}
+        for v in range(variants):
+            seed = base_seed * 1000 + zone_id * 100 + v
+            start = time.perf_counter()
+            layout, spacing = zone_layout(zone, count, seed, gap)
+            elapsed = (time.perf_counter() - start) * 1000
+            pairs, clearance = overlaps(layout)
+            if pairs:
+                raise RuntimeError(f"zone {zone_id} seed {seed}: {pairs} overlapping gems")
+            baseline_pairs, _ = overlaps(random_layout(zone, count, seed))
+            data, offsets = encode(layout)
+            name = f"gems_zone{zone_id}_{seed}.bin"
+            with open(os.path.join(out_dir, name), "wb") as f:
+                f.write(data)
+            written.add(name)
+            entry["variants"].append({"seed": seed, "file": name, "count": count, "offsets": offsets, "spacing": round(spacing, 3)})
+            print(f"   [LAYOUT] zone {zone_id} seed {seed}: {count} gems, spacing {spacing:.1f}, min clearance "
+                  f"{clearance:.1f} in {elapsed:.1f} ms (uniform random: {baseline_pairs} overlapping pairs)")
+        index["zones"][str(zone_id)] = entry
+
+    # Drop variants of an earlier run that the index no longer references
+    for name in os.listdir(out_dir):
+        if name.startswith("gems_zone") and name.endswith(".bin") and name not in written:
+            os.remove(os.path.join(out_dir, name))
+    with open(os.path.join(out_dir, INDEX_NAME), "w") as f:
+        json.dump(index, f, indent=2)
+    return index
+
+def main():
+    parser = argparse.ArgumentParser(description="Precompute non-overlapping gem layouts per zone.")
+    parser.add_argument("--out", default=LAYOUTS_DIR, help="Output directory")
+    parser.add_argument("--count", type=int, default=400, help="Gems per zone (GEMS_PER_ZONE)")
+    parser.add_argument("--variants", type=int, default=4, help="Seeded layouts per zone")
+    parser.add_argument("--seed", type=int, default=1, help="Base seed")
+    parser.add_argument("--gap", type=float, default=4.0, help="Minimum clearance between gem edges")
+    args = parser.parse_args()
+
+    try:
+        build_layouts(args.out, args.count, args.variants, args.seed, args.gap)
+    except ValueError as e:
+        raise SystemExit(f"❌ {e}")
+    print(f"✅ Gem layouts written to {os.path.relpath(os.path.join(args.out, INDEX_NAME), ROOT_DIR)}")
+
+if __name__ == "__main__":
+    main()
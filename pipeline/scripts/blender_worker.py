@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Client for the persistent Blender worker (pipeline/blender/worker.py).
+
+One Blender process is started once and then builds any number of assets, so
+only the first job pays for interpreter and addon startup.
+
+    python3 pipeline/scripts/blender_worker.py plow bulldozer   # build via one worker
+    python3 pipeline/scripts/blender_worker.py --bench          # cold vs warm latency
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+BLENDER_DIR = os.path.join(ROOT_DIR, "pipeline", "blender")
+WORKER_SCRIPT = os.path.join(BLENDER_DIR, "worker.py")
+BLENDER = os.environ.get("BLENDER", "blender")
+
+# Must match pipeline/blender/worker.py
+PROTOCOL_PREFIX = "@@DAMP_WORKER@@ "
+
+class WorkerError(RuntimeError):
+    pass
+
+class BlenderWorker:
+    def __init__(self, blender=BLENDER, verbose=True):
+        self.blender = blender
+        self.verbose = verbose
+        self.proc = None
+        self.info = None
+        self._next_id = 0
+
+    def start(self):
+        self.proc = subprocess.Popen(
+            [self.blender, "--background", "--python", WORKER_SCRIPT],
+            cwd=ROOT_DIR,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            text=True,
+            bufsize=1,
+        )
+        self.info = self._read_reply()
+        if self.info.get("event") != "ready":
+            raise WorkerError(f"Unexpected worker greeting: {self.info}")
+        return self
+
+    def _read_reply(self):
+        for line in self.proc.stdout:
+            if line.startswith(PROTOCOL_PREFIX):
+                return json.loads(line[len(PROTOCOL_PREFIX):])
+            if self.verbose:
+                sys.stdout.write(line)
+        raise WorkerError(f"Blender worker exited (code {self.proc.wait()})")
+
+    def build(self, generator, output, params=None):
+        """Runs one job and returns the worker's reply ({"ok", "seconds", "error"?})."""
+        if self.proc is None or self.proc.poll() is not None:
+            raise WorkerError("Blender worker is not running")
+        self._next_id += 1
+        job = {"id": self._next_id, "generator": generator, "output": os.path.abspath(output), "params": params or {}}
+        self.proc.stdin.write(json.dumps(job) + "\n")
+        self.proc.stdin.flush()
+        return self._read_reply()
+
+    def close(self):
+        if self.proc is None:
+            return
+        if self.proc.poll() is None:
+            try:
+                self.proc.stdin.write(json.dumps({"cmd": "quit"}) + "\n")
+                self.proc.stdin.close()
+                self.proc.wait(timeout=10)
+            except (OSError, subprocess.TimeoutExpired):
+                self.proc.kill()
+                self.proc.wait()
+        self.proc = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.close()
+
+# --- Benchmark ---
+def blender_stages(names):
+    from build import STAGES
+    stages = [s for s in STAGES if s.generator]
+    return [s for s in stages if not names or s.generator in names]
+
+def bench(names, repeats):
+    stages = blender_stages(names)
+    cold = {s.generator: [] for s in stages}
+    warm = {s.generator: [] for s in stages}
+
+    print(f"   [BENCH] Cold: one 'blender --background --python' per asset, x{repeats}")
+    for _ in range(repeats):
+        for s in stages:
+            start = time.perf_counter()
+            subprocess.run(s.cmd, cwd=ROOT_DIR, stdout=subprocess.DEVNULL, check=True)
+            cold[s.generator].append(time.perf_counter() - start)
+
+    print(f"   [BENCH] Warm: one persistent worker, x{repeats}")
+    start = time.perf_counter()
+    with BlenderWorker(verbose=False) as worker:
+        startup = time.perf_counter() - start
+        for _ in range(repeats):
+            for s in stages:
+                start = time.perf_counter()
+                reply = worker.build(s.generator, s.outputs[0], s.params)
+                if not reply["ok"]:
+                    raise WorkerError(reply["error"])
+                warm[s.generator].append(time.perf_counter() - start)
+
+    print(f"\n   Worker startup (paid once): {startup:.2f}s\n")
+    print(f"{'Asset':<12} | {'Cold (s)':>9} | {'Warm (s)':>9} | {'Speedup':>7}")
+    print("-" * 47)
+    for s in stages:
+        c = min(cold[s.generator])
+        w = min(warm[s.generator])
+        print(f"{s.generator:<12} | {c:>9.3f} | {w:>9.3f} | {c / w:>6.1f}x")
+
+def main():
+    parser = argparse.ArgumentParser(description="Build assets through a persistent Blender worker.")
+    parser.add_argument("generators", nargs="*", help="Generators to run (default: all)")
+    parser.add_argument("--bench", action="store_true", help="Measure cold vs warm per-asset latency")
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    if args.bench:
+        bench(args.generators, args.repeats)
+        return 0
+
+    failed = 0
+    with BlenderWorker() as worker:
+        for s in blender_stages(args.generators):
+            reply = worker.build(s.generator, s.outputs[0], s.params)
+            status = "OK" if reply["ok"] else f"FAILED: {reply['error']}"
+            print(f"   [WORKER] {s.generator}: {status} ({reply['seconds']:.2f}s)")
+            failed += not reply["ok"]
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
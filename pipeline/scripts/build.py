@@ -0,0 +1,434 @@
+#!/usr/bin/env python3
+"""
+DAMP incremental build orchestrator.
+
+Each stage declares its inputs (generator script, the local helper modules it
+imports, mapping configs, tool versions) and outputs. A content hash of the
+inputs is stored in a manifest; stages whose hash is unchanged and whose outputs
+are intact are skipped, so a no-op rebuild never launches Blender.
+"""
+import argparse
+import ast
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+import tracing
+from blender_worker import BlenderWorker, WorkerError
+from tracing import counter, instant, span
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+PIPELINE_DIR = os.path.join(ROOT_DIR, "pipeline")
+ASSETS_DIR = os.path.join(ROOT_DIR, "assets")
+VIEWER_ASSETS = os.path.join(ROOT_DIR, "tools", "viewer", "assets")
+MANIFEST_PATH = os.path.join(ASSETS_DIR, ".build_manifest.json")
+
+BLENDER = os.environ.get("BLENDER", "blender")
+OPTIMIZE_SCRIPT = os.path.join(PIPELINE_DIR, "gltf", "optimize.py")
+SPLIT_SCRIPT = os.path.join(PIPELINE_DIR, "gltf", "split_parts.py")
+
+# --- Hashing ---
+def file_digest(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+def local_deps(script):
+    """The script plus every sibling module it imports (recursively)."""
+    seen = []
+    pending = [os.path.abspath(script)]
+    while pending:
+        path = pending.pop()
+        if path in seen:
+            continue
+        seen.append(path)
+        with open(path, "rb") as f:
+            tree = ast.parse(f.read(), filename=path)
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                names = [alias.name for alias in node.names]
+            elif isinstance(node, ast.ImportFrom) and node.module and node.level == 0:
+                names = [node.module]
+            else:
+                continue
+            for name in names:
+                candidate = os.path.join(os.path.dirname(path), name.split(".")[0] + ".py")
+                if os.path.exists(candidate):
+                    pending.append(candidate)
+    return sorted(seen)
+
+def tool_version(manifest, name, binary):
+    """Tool version, cached against the binary's path/mtime/size so it is only queried after an upgrade."""
+    resolved = shutil.which(binary)
+    if not resolved:
+        return "missing"
+    st = os.stat(resolved)
+    key = [os.path.realpath(resolved), st.st_mtime, st.st_size]
+    cached = manifest.setdefault("tools", {}).get(name)
+    if cached and cached["key"] == key:
+        return cached["version"]
+    out = subprocess.run([resolved, "--version"], capture_output=True, text=True).stdout
+    version = out.strip().splitlines()[0] if out.strip() else "unknown"
+    manifest["tools"][name] = {"key": key, "version": version}
+    return version
+
+# --- Stages ---
+class Stage:
+    def __init__(self, name, cmd, script, outputs, configs=(), tools=(), generator=None, params=None, post=()):
+        self.name = name
+        self.cmd = cmd
+        self.script = script
+        self.outputs = list(outputs)
+        self.configs = list(configs)
+        self.tools = list(tools)
+        # Registry name when the stage can run inside the persistent Blender worker
+        self.generator = generator
+        self.params = params or {}
+        # (cmd, script) pairs run on the outputs after the stage, before they are hashed and synced
+        self.post = list(post)
+
+    def inputs(self):
+        deps = local_deps(self.script)
+        for _, script in self.post:
+            deps += [d for d in local_deps(script) if d not in deps]
+        return deps + self.configs
+
+    def input_hash(self, manifest):
+        h = hashlib.sha256()
+        h.update(json.dumps([self.cmd, self.params, [cmd for cmd, _ in self.post]], sort_keys=True).encode())
+        for path in self.inputs():
+            h.update(os.path.relpath(path, ROOT_DIR).encode())
+            # An input produced by an earlier stage that has not run yet (dry run) hashes as missing
+            h.update((file_digest(path) if os.path.exists(path) else "missing").encode())
+        for name, binary in self.tools:
+            h.update(f"{name}={tool_version(manifest, name, binary)}".encode())
+        return h.hexdigest()
+
+def blender_stage(name, generator, output, config):
+    path = os.path.join(PIPELINE_DIR, "blender", f"{generator}.py")
+    output_path = os.path.join(ASSETS_DIR, "models", output)
+    config_path = os.path.join(ASSETS_DIR, "configs", config)
+    # Streamable per-component parts, split from the optimized model (the config's "streaming" section)
+    parts_manifest = os.path.join(ASSETS_DIR, "models", "parts", os.path.splitext(output)[0] + ".parts.json")
+    return Stage(
+        name,
+        [BLENDER, "--background", "--python", path],
+        path,
+        [output_path, parts_manifest],
+        configs=[config_path],
+        tools=[("blender", BLENDER)],
+        generator=generator,
+        post=[
+            (["uv", "run", OPTIMIZE_SCRIPT, output_path], OPTIMIZE_SCRIPT),
+            (["uv", "run", SPLIT_SCRIPT, output_path, "--config", config_path], SPLIT_SCRIPT),
+        ],
+    )
+
+def textures_stage():
+    path = os.path.join(PIPELINE_DIR, "textures", "generate_textures.py")
+    return Stage(
+        "textures",
+        ["uv", "run", path],
+        path,
+        [os.path.join(ASSETS_DIR, "textures", "tracks_texture.png")],
+    )
+
+def runtime_textures_stage():
+    path = os.path.join(PIPELINE_DIR, "textures", "runtime_textures.py")
+    return Stage(
+        "textures:runtime",
+        ["uv", "run", path],
+        path,
+        [os.path.join(ASSETS_DIR, "textures", "runtime_textures.json")],
+        configs=[os.path.join(PIPELINE_DIR, "textures", "fonts", "DejaVuSans-Bold.ttf")],
+    )
+
+def atlas_stage():
+    path = os.path.join(PIPELINE_DIR, "textures", "pack_atlas.py")
+    configs = [os.path.join(ASSETS_DIR, "configs", name) for name in ("bulldozer_mapping.json", "plow_mapping.json")]
+    return Stage(
+        "textures:atlas",
+        ["uv", "run", path],
+        path,
+        [os.path.join(ASSETS_DIR, "textures", "atlas.json")],
+        configs=configs + [os.path.join(ASSETS_DIR, "textures", "tracks_texture.png")],
+    )
+
+def compress_stage():
+    path = os.path.join(PIPELINE_DIR, "textures", "compress.py")
+    configs = [os.path.join(ASSETS_DIR, "configs", name) for name in ("bulldozer_mapping.json", "plow_mapping.json")]
+    textures = [os.path.join(ASSETS_DIR, "textures", name) for name in ("tracks_texture.png", "atlas.json")]
+    report = os.path.join(ASSETS_DIR, "textures", "ktx2_report.json")
+    return Stage(
+        "textures:ktx2",
+        ["uv", "run", path, "--report", report],
+        path,
+        [report],
+        configs=configs + textures,
+    )
+
+def layouts_stage():
+    path = os.path.join(PIPELINE_DIR, "layouts", "gem_layouts.py")
+    return Stage(
+        "layouts:gems",
+        ["uv", "run", path],
+        path,
+        [os.path.join(ASSETS_DIR, "layouts", "gems.json")],
+    )
+
+def colliders_stage():
+    path = os.path.join(PIPELINE_DIR, "colliders", "footprints.py")
+    configs = [os.path.join(ASSETS_DIR, "configs", name) for name in ("bulldozer_mapping.json", "plow_mapping.json")]
+    models = [os.path.join(ASSETS_DIR, "models", name) for name in ("bulldozer_components.glb", "plow.glb")]
+    return Stage(
+        "colliders:footprints",
+        ["uv", "run", path],
+        path,
+        [os.path.join(ASSETS_DIR, "colliders", "footprints.json")],
+        configs=configs + models,
+    )
+
+STAGES = [
+    blender_stage("geometry:bulldozer", "bulldozer", "bulldozer_components.glb", "bulldozer_mapping.json"),
+    blender_stage("geometry:plow", "plow", "plow.glb", "plow_mapping.json"),
+    textures_stage(),
+    runtime_textures_stage(),
+    # After the textures it packs; writes atlas.json next to the pages
+    atlas_stage(),
+    # Compresses whatever the flagged components load, so after the atlas
+    compress_stage(),
+    layouts_stage(),
+    # Projects the optimized models, so after the geometry stages
+    colliders_stage(),
+]
+
+# --- Manifest ---
+def load_manifest():
+    if os.path.exists(MANIFEST_PATH):
+        with open(MANIFEST_PATH) as f:
+            return json.load(f)
+    return {"stages": {}, "tools": {}}
+
+def save_manifest(manifest):
+    os.makedirs(os.path.dirname(MANIFEST_PATH), exist_ok=True)
+    with open(MANIFEST_PATH, "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+
+def outputs_intact(entry):
+    for rel, digest in entry.get("outputs", {}).items():
+        path = os.path.join(ROOT_DIR, rel)
+        if not os.path.exists(path) or file_digest(path) != digest:
+            return False
+    return bool(entry.get("outputs"))
+
+# --- Sync ---
+def sync_assets():
+    """Copies models/textures/configs to the viewer, skipping files whose content is unchanged."""
+    copied = skipped = 0
+    pairs = [
+        (os.path.join(ASSETS_DIR, "models"), VIEWER_ASSETS, (".glb",)),
+        (os.path.join(ASSETS_DIR, "textures"), os.path.join(VIEWER_ASSETS, "textures"), (".png", ".ktx2", "atlas.json")),
+        (os.path.join(ASSETS_DIR, "configs"), os.path.join(VIEWER_ASSETS, "configs"), (".json",)),
+    ]
+    for src_dir, dst_dir, exts in pairs:
+        if not os.path.isdir(src_dir):
+            continue
+        os.makedirs(dst_dir, exist_ok=True)
+        for name in sorted(os.listdir(src_dir)):
+            if not name.endswith(exts):
+                continue
+            src = os.path.join(src_dir, name)
+            dst = os.path.join(dst_dir, name)
+            if os.path.exists(dst) and os.path.getsize(dst) == os.path.getsize(src) and file_digest(dst) == file_digest(src):
+                skipped += 1
+                continue
+            shutil.copy2(src, dst)
+            copied += 1
+    print(f"   [SYNC] {copied} copied, {skipped} unchanged")
+    counter("sync", copied=copied, unchanged=skipped)
+
+# --- Execution ---
+class LazyWorker:
+    """Starts one shared Blender worker the first time a Blender stage misses the cache."""
+
+    def __init__(self):
+        self.worker = None
+
+    def get(self):
+        if self.worker is None:
+            # Blender startup plus the worker's generator imports
+            with span("blender worker start", cat="blender"):
+                self.worker = BlenderWorker().start()
+        return self.worker
+
+    def close(self):
+        if self.worker is not None:
+            self.worker.close()
+
+def execute(stage, workers):
+    if stage.generator and workers is not None:
+        reply = workers.get().build(stage.generator, stage.outputs[0], stage.params)
+        if not reply["ok"]:
+            print(reply.get("traceback", ""), file=sys.stderr)
+        return 0 if reply["ok"] else 1
+    return subprocess.run(stage.cmd, cwd=ROOT_DIR).returncode
+
+def run_stage(stage, manifest, force=False, dry_run=False, workers=None):
+    """Runs a stage unless cached. Returns (status, seconds_spent, seconds_saved)."""
+    digest = stage.input_hash(manifest)
+    entry = manifest["stages"].get(stage.name)
+    if not force and entry and entry.get("hash") == digest and outputs_intact(entry):
+        instant(f"{stage.name} (cached)", cat="stage")
+        return "hit", 0.0, entry.get("seconds", 0.0)
+    if dry_run:
+        return "miss", 0.0, 0.0
+
+    for out in stage.outputs:
+        os.makedirs(os.path.dirname(out), exist_ok=True)
+    start = time.perf_counter()
+    with span(stage.name, cat="stage") as trace:
+        with span(os.path.basename(stage.script), cat="process", worker=bool(stage.generator and workers is not None)):
+            returncode = execute(stage, workers)
+        for cmd, script in stage.post:
+            if returncode != 0:
+                break
+            with span(os.path.basename(script), cat="process"):
+                returncode = subprocess.run(cmd, cwd=ROOT_DIR).returncode
+        trace["exit"] = returncode
+    seconds = time.perf_counter() - start
+    if returncode != 0:
+        manifest["stages"].pop(stage.name, None)
+        raise SystemExit(f"❌ Stage '{stage.name}' failed (exit {returncode})")
+
+    missing = [out for out in stage.outputs if not os.path.exists(out)]
+    if missing:
+        raise SystemExit(f"❌ Stage '{stage.name}' did not produce {', '.join(missing)}")
+
+    counter(f"{stage.name} outputs", cat="stage", bytes=sum(os.path.getsize(out) for out in stage.outputs))
+    manifest["stages"][stage.name] = {
+        "hash": digest,
+        "seconds": round(seconds, 3),
+        "outputs": {os.path.relpath(out, ROOT_DIR): file_digest(out) for out in stage.outputs},
+    }
+    return "miss", seconds, 0.0
+
+# --- Reproducibility ---
+def asset_digests():
+    """Digest of every generated file under assets/ except build reports (they record timings)."""
+    digests = {}
+    for dirpath, _, names in os.walk(ASSETS_DIR):
+        for name in names:
+            path = os.path.join(dirpath, name)
+            if name.startswith(".") or name.endswith("_report.json"):
+                continue
+            digests[os.path.relpath(path, ROOT_DIR)] = file_digest(path)
+    return digests
+
+def check_reproducible(stages, manifest, workers):
+    """Builds each stage twice from scratch; returns {stage: [files that differ]} for the ones that are not byte-identical."""
+    differing = {}
+    for stage in stages:
+        snapshots = []
+        for _ in range(2):
+            run_stage(stage, manifest, force=True, workers=workers)
+            snapshots.append(asset_digests())
+        first, second = snapshots
+        changed = sorted(p for p in first.keys() | second.keys() if first.get(p) != second.get(p))
+        print(f"   [REPRO] {'OK  ' if not changed else 'DIFF'} {stage.name}" + (f": {', '.join(changed)}" if changed else ""))
+        if changed:
+            differing[stage.name] = changed
+    return differing
+
+def select_stages(names):
+    if not names:
+        return STAGES, True
+    selected = [s for s in STAGES if any(s.name == n or s.name.startswith(n + ":") for n in names)]
+    return selected, "sync" in names
+
+def main():
+    parser = argparse.ArgumentParser(description="Incremental DAMP asset build.")
+    parser.add_argument("stages", nargs="*", help="Stages or groups to build (e.g. geometry, geometry:plow, textures, sync). Default: all")
+    parser.add_argument("--force", action="store_true", help="Ignore the cache and rebuild the selected stages")
+    parser.add_argument("--dry-run", action="store_true", help="Only report which stages would rebuild")
+    parser.add_argument("--no-worker", action="store_true", help="Launch Blender once per stage instead of sharing a worker")
+    parser.add_argument("--check-reproducible", action="store_true", help="Build the selected stages twice and fail if any output differs")
+    parser.add_argument("--trace", metavar="FILE", help="Write a Chrome trace of the build (every stage's processes, Blender included)")
+    args = parser.parse_args()
+
+    stages, do_sync = select_stages(args.stages)
+    if not stages and not do_sync:
+        parser.error(f"no stage matches {args.stages}; known: {', '.join(s.name for s in STAGES)}, sync")
+
+    if not args.trace:
+        return build(args, stages, do_sync)
+    trace_dir = tempfile.mkdtemp(prefix="damp-trace-")
+    tracing.start(trace_dir, "build")
+    try:
+        with span("build", cat="build", stages=[s.name for s in stages]):
+            return build(args, stages, do_sync)
+    finally:
+        # Written on failure too: the trace shows where the build stopped
+        tracing.flush()
+        events = tracing.merge(trace_dir, args.trace)
+        shutil.rmtree(trace_dir, ignore_errors=True)
+        tracing.summarize(events)
+        print(f"   [TRACE] {len(events)} events -> {os.path.relpath(os.path.abspath(args.trace), ROOT_DIR)}")
+
+def build(args, stages, do_sync):
+    manifest = load_manifest()
+    wall_start = time.perf_counter()
+    hits = misses = 0
+    saved = 0.0
+    workers = None if args.no_worker else LazyWorker()
+
+    if args.check_reproducible:
+        try:
+            differing = check_reproducible(stages, manifest, workers)
+        except (WorkerError, OSError) as e:
+            raise SystemExit(f"❌ Blender worker failed: {e}")
+        finally:
+            if workers is not None:
+                workers.close()
+            save_manifest(manifest)
+        if differing:
+            print(f"❌ {len(differing)} stage(s) are not reproducible")
+            return 1
+        print(f"✅ {len(stages)} stage(s) rebuild byte-identical")
+        return 0
+
+    try:
+        for stage in stages:
+            status, spent, stage_saved = run_stage(stage, manifest, force=args.force, dry_run=args.dry_run, workers=workers)
+            if status == "hit":
+                hits += 1
+                saved += stage_saved
+                print(f"   [CACHE] HIT  {stage.name} (saved ~{stage_saved:.1f}s)")
+            else:
+                misses += 1
+                detail = "would rebuild" if args.dry_run else f"rebuilt in {spent:.1f}s"
+                print(f"   [CACHE] MISS {stage.name} ({detail})")
+    except (WorkerError, OSError) as e:
+        raise SystemExit(f"❌ Blender worker failed: {e}")
+    finally:
+        if workers is not None:
+            workers.close()
+        if not args.dry_run:
+            save_manifest(manifest)
+
+    if do_sync and not args.dry_run:
+        with span("sync", cat="stage"):
+            sync_assets()
+
+    elapsed = time.perf_counter() - wall_start
+    print(f"   [CACHE] {hits} hit(s), {misses} miss(es), ~{saved:.1f}s saved, finished in {elapsed:.2f}s")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Builds a library of asset variants from a variant spec.
+
+A spec (e.g. assets/configs/variants/plow.json) lists named values per axis;
+the cartesian product of the axes is the variant matrix. Each variant merges the
+params of its axis values and is built by a pool of persistent Blender workers
+(one per CPU by default). A failing variant is recorded in the index and never
+aborts the others; a crashed worker is replaced. A variant is rebuilt when its
+params, the generator's sources, the generator's mapping config (spec "config",
+default `<generator>_mapping.json`) or the Blender version change.
+
+    python3 pipeline/scripts/build_variants.py assets/configs/variants/plow.json
+"""
+import argparse
+import hashlib
+import itertools
+import json
+import os
+import queue
+import sys
+import threading
+import time
+
+from blender_worker import BlenderWorker, WorkerError
+from build import ASSETS_DIR, BLENDER, PIPELINE_DIR, ROOT_DIR, file_digest, local_deps, tool_version
+
+# --- Spec ---
+def expand(spec):
+    """Yields (variant_id, axis_choices, params) for every combination of axis values."""
+    axes = list(spec["axes"].items())
+    for combo in itertools.product(*(values for _, values in axes)):
+        params = {}
+        for value in combo:
+            params.update(value.get("params", {}))
+        variant_id = "_".join(value["id"] for value in combo)
+        choices = {axis: value["id"] for (axis, _), value in zip(axes, combo)}
+        yield variant_id, choices, params
+
+def generator_hash(generator, config_path, blender_version):
+    """The generator's sources, the mapping config it reads (LOD settings and the like) and the Blender version."""
+    h = hashlib.sha256()
+    for path in local_deps(os.path.join(PIPELINE_DIR, "blender", f"{generator}.py")) + [config_path]:
+        h.update(os.path.relpath(path, ROOT_DIR).encode())
+        h.update((file_digest(path) if os.path.exists(path) else "missing").encode())
+    h.update(f"blender={blender_version}".encode())
+    return h.hexdigest()
+
+def variant_hash(source_hash, params):
+    return hashlib.sha256((source_hash + json.dumps(params, sort_keys=True)).encode()).hexdigest()
+
+# --- Worker Pool ---
+def worker_loop(jobs, results, verbose):
+    worker = None
+    while True:
+        try:
+            job = jobs.get_nowait()
+        except queue.Empty:
+            break
+        start = time.perf_counter()
+        try:
+            if worker is None:
+                worker = BlenderWorker(verbose=verbose).start()
+            reply = worker.build(job["generator"], job["path"], job["params"])
+            error = None if reply["ok"] else reply["error"]
+        except (WorkerError, OSError) as e:
+            # The Blender process died (or never started): drop it, start fresh for the next job
+            error = f"Worker crashed: {e}"
+            if worker is not None:
+                worker.close()
+            worker = None
+        results.append({**job, "ok": error is None, "error": error, "seconds": round(time.perf_counter() - start, 3)})
+        status = "OK  " if error is None else "FAIL"
+        print(f"   [VARIANT] {status} {job['id']} ({time.perf_counter() - start:.2f}s){'' if error is None else ' - ' + error}")
+    if worker is not None:
+        worker.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Build a variant library from a spec.")
+    parser.add_argument("spec", nargs="?", default=os.path.join(ASSETS_DIR, "configs", "variants", "plow.json"))
+    parser.add_argument("--jobs", "-j", type=int, default=os.cpu_count() or 1, help="Blender worker processes (default: CPU count)")
+    parser.add_argument("--force", action="store_true", help="Rebuild variants even if their inputs are unchanged")
+    parser.add_argument("--verbose", action="store_true", help="Show Blender output")
+    args = parser.parse_args()
+
+    with open(args.spec) as f:
+        spec = json.load(f)
+    generator = spec["generator"]
+    out_dir = os.path.join(ASSETS_DIR, "models", spec.get("outputDir", "variants"))
+    os.makedirs(out_dir, exist_ok=True)
+    index_path = os.path.join(out_dir, "index.json")
+
+    previous, tools = {}, {"tools": {}}
+    if os.path.exists(index_path):
+        with open(index_path) as f:
+            old_index = json.load(f)
+        previous = {v["id"]: v for v in old_index.get("variants", [])}
+        # Cached like build.py's manifest, so Blender is only asked for its version after an upgrade
+        tools["tools"] = old_index.get("tools", {})
+
+    # The generator reads its mapping config from assets/configs (e.g. plow.py: plow_mapping.json)
+    config_path = os.path.join(ASSETS_DIR, "configs", spec.get("config", f"{generator}_mapping.json"))
+    source_hash = generator_hash(generator, config_path, tool_version(tools, "blender", BLENDER))
+    jobs = queue.Queue()
+    entries = []
+    cached = 0
+    variants = list(expand(spec))
+    order = {variant_id: i for i, (variant_id, _, _) in enumerate(variants)}
+    for variant_id, choices, params in variants:
+        filename = f"{generator}_{variant_id}.glb"
+        path = os.path.join(out_dir, filename)
+        digest = variant_hash(source_hash, params)
+        entry = {"id": variant_id, "file": filename, "axes": choices, "params": params, "hash": digest}
+        old = previous.get(variant_id)
+        if not args.force and old and old.get("ok") and old.get("hash") == digest and os.path.exists(path):
+            entries.append({**entry, "ok": True, "error": None, "seconds": old.get("seconds", 0.0)})
+            cached += 1
+            continue
+        jobs.put({**entry, "generator": generator, "path": path})
+
+    todo = jobs.qsize()
+    n_workers = max(1, min(args.jobs, todo))
+    print(f"   [VARIANT] {todo + cached} variant(s): {cached} cached, {todo} to build on {n_workers if todo else 0} worker(s)")
+
+    results = []
+    wall_start = time.perf_counter()
+    threads = [threading.Thread(target=worker_loop, args=(jobs, results, args.verbose)) for _ in range(n_workers if todo else 0)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    wall = time.perf_counter() - wall_start
+
+    for r in results:
+        entries.append({k: r[k] for k in ("id", "file", "axes", "params", "hash", "ok", "error", "seconds")})
+    entries.sort(key=lambda e: order[e["id"]])
+
+    index = {
+        "generator": generator,
+        "spec": os.path.relpath(os.path.abspath(args.spec), ROOT_DIR),
+        "axes": {axis: [v["id"] for v in values] for axis, values in spec["axes"].items()},
+        "variants": entries,
+        "tools": tools["tools"],
+    }
+    with open(index_path, "w") as f:
+        json.dump(index, f, indent=2)
+
+    failed = [e for e in entries if not e["ok"]]
+    if results:
+        busy = sum(r["seconds"] for r in results)
+        print(f"   [VARIANT] Built {len(results)} in {wall:.2f}s wall ({len(results) / wall:.2f} variants/s), "
+              f"{busy:.2f}s of worker time -> {busy / wall:.1f}x parallel speedup on {n_workers} worker(s)")
+    print(f"   [VARIANT] Index: {os.path.relpath(index_path, ROOT_DIR)} ({len(failed)} failed)")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
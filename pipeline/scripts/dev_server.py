@@ -0,0 +1,412 @@
+# /// script
+# dependencies = [
+#   "brotli",
+# ]
+# ///
+"""
+DAMP dev asset server.
+
+Serves the repo root for the game and the viewer (replacing `http-server -c-1`)
+on a single asyncio event loop:
+
+- gzip and brotli variants of compressible files (JS, JSON, GLB, KTX2...),
+  compressed once per file version and kept in memory; `<file>.br`/`.gz`
+  written next to a file are used as is when newer than it,
+- strong ETags per representation with `Cache-Control: no-cache`, so a reload
+  revalidates everything and unchanged files come back as 304s,
+- single byte ranges (`Range`/`If-Range`) on the identity encoding, for GLBs,
+- a watcher that polls every input of the build.py stages (the Blender
+  generators and their helpers, pipeline/textures/*.py, assets/configs/*.json),
+  reruns only the stages that depend on what changed (and the stages that
+  consume their outputs), syncs the viewer and pushes a `rebuilt` event to
+  /__live, which src/core/live_reload.js turns into a page reload.
+
+Blender stages keep one persistent worker across rebuilds.
+
+    uv run pipeline/scripts/dev_server.py
+    uv run pipeline/scripts/dev_server.py --port 8080 --open /tools/viewer/index.html
+    uv run pipeline/scripts/dev_server.py --no-watch
+"""
+import argparse
+import asyncio
+import email.utils
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import sys
+import time
+import urllib.parse
+import webbrowser
+
+import build
+
+try:
+    import brotli
+except ImportError:  # gzip only
+    brotli = None
+
+ROOT_DIR = build.ROOT_DIR
+LIVE_PATH = "/__live"
+MIN_COMPRESS_SIZE = 1024
+COMPRESSIBLE_TYPES = ("text/", "application/json", "application/javascript", "image/svg+xml",
+                      "model/gltf", "application/octet-stream", "image/ktx2", "application/wasm")
+TYPES = {".js": "text/javascript", ".mjs": "text/javascript", ".glb": "model/gltf-binary", ".gltf": "model/gltf+json",
+         ".ktx2": "image/ktx2", ".bin": "application/octet-stream", ".wasm": "application/wasm", ".md": "text/markdown"}
+REASONS = {200: "OK", 206: "Partial Content", 304: "Not Modified", 400: "Bad Request", 403: "Forbidden",
+           404: "Not Found", 405: "Method Not Allowed", 416: "Range Not Satisfiable"}
+
+# --- Representations ---
+def content_type(path):
+    ext = os.path.splitext(path)[1].lower()
+    kind = TYPES.get(ext) or mimetypes.guess_type(path)[0] or "application/octet-stream"
+    return f"{kind}; charset=utf-8" if kind.startswith("text/") or kind.endswith("json") else kind
+
+def strong_etag(data, suffix=""):
+    return f'"{hashlib.sha256(data).hexdigest()[:20]}{suffix}"'
+
+class FileCache:
+    """Identity and encoded bodies per file, keyed on (mtime, size) so an edited file is re-read once."""
+
+    def __init__(self):
+        self.entries = {}
+
+    def get(self, path):
+        st = os.stat(path)
+        key = (st.st_mtime_ns, st.st_size)
+        entry = self.entries.get(path)
+        if entry is None or entry["key"] != key:
+            with open(path, "rb") as f:
+                data = f.read()
+            entry = {
+                "key": key,
+                "type": content_type(path),
+                "modified": email.utils.formatdate(st.st_mtime, usegmt=True),
+                "identity": (data, strong_etag(data)),
+            }
+            self.entries[path] = entry
+        return entry
+
+    def encoded(self, path, entry, encoding):
+        """(body, etag) for `encoding`, or None when the file is not worth compressing."""
+        if encoding in entry:
+            return entry[encoding]
+        data = entry["identity"][0]
+        body = None
+        if len(data) >= MIN_COMPRESS_SIZE and entry["type"].startswith(COMPRESSIBLE_TYPES):
+            sibling = path + (".br" if encoding == "br" else ".gz")
+            if os.path.exists(sibling) and os.stat(sibling).st_mtime_ns >= entry["key"][0]:
+                with open(sibling, "rb") as f:
+                    body = f.read()
+            elif encoding == "br":
+                body = brotli.compress(data, quality=9)
+            else:
+                body = gzip.compress(data, compresslevel=9, mtime=0)
+            if len(body) >= len(data):
+                body = None
+        entry[encoding] = None if body is None else (body, strong_etag(body, "-" + encoding))
+        return entry[encoding]
+
+    def warm(self, paths):
+        """Compresses `paths` ahead of the first request (run off the event loop)."""
+        for path in paths:
+            try:
+                entry = self.get(path)
+                for encoding in self.encodings():
+                    self.encoded(path, entry, encoding)
+            except OSError:
+                continue
+
+    @staticmethod
+    def encodings():
+        return ("br", "gzip") if brotli else ("gzip",)
+
+def accepted_encodings(header):
+    """Encodings from Accept-Encoding with a non-zero q, best first (br before gzip on ties)."""
+    accepted = {}
+    for token in header.split(","):
+        name, _, params = token.strip().partition(";")
+        q = 1.0
+        if params.strip().startswith("q="):
+            try:
+                q = float(params.strip()[2:])
+            except ValueError:
+                q = 0.0
+        accepted[name.strip().lower()] = q
+    order = [e for e in FileCache.encodings() if accepted.get(e, accepted.get("*", 0.0)) > 0]
+    return sorted(order, key=lambda e: -accepted.get(e, accepted.get("*", 0.0)))
+
+def parse_range(header, size):
+    """(start, end) inclusive for a single `bytes=` range, None to ignore it, or "unsatisfiable"."""
+    unit, _, spec = header.partition("=")
+    if unit.strip() != "bytes" or "," in spec:
+        return None  # Multiple ranges: answer with the whole file
+    first, _, last = spec.strip().partition("-")
+    try:
+        if first == "":
+            length = int(last)
+            if length == 0:
+                return "unsatisfiable"
+            return max(size - length, 0), size - 1
+        start = int(first)
+        end = int(last) if last else size - 1
+    except ValueError:
+        return None
+    if start >= size or end < start:
+        return "unsatisfiable"
+    return start, min(end, size - 1)
+
+# --- Server ---
+class DevServer:
+    def __init__(self, root, watch=True, interval=0.5):
+        self.root = os.path.realpath(root)
+        self.cache = FileCache()
+        self.clients = set()
+        self.watch = watch
+        self.interval = interval
+
+    def resolve(self, target):
+        """Filesystem path for a request target, or None when it escapes the root."""
+        path = urllib.parse.unquote(urllib.parse.urlsplit(target).path)
+        full = os.path.realpath(os.path.join(self.root, path.lstrip("/")))
+        if os.path.commonpath([full, self.root]) != self.root:
+            return None
+        if os.path.isdir(full):
+            full = os.path.join(full, "index.html")
+        return full
+
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                parts = request_line.decode("latin-1").split()
+                if len(parts) != 3:
+                    await self.respond(writer, 400, {}, b"")
+                    break
+                method, target, version = parts
+                if method in ("GET", "HEAD") and urllib.parse.urlsplit(target).path == LIVE_PATH:
+                    await self.live(writer)
+                    break
+                await self.serve(writer, method, target, headers)
+                keep_alive = headers.get("connection", "").lower() != "close" and version == "HTTP/1.1"
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def respond(self, writer, status, headers, body, head=False):
+        lines = [f"HTTP/1.1 {status} {REASONS[status]}"]
+        headers = {"Content-Length": str(len(body)), **headers}
+        lines += [f"{name}: {value}" for name, value in headers.items()]
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+        if not head and status != 304:
+            writer.write(body)
+        await writer.drain()
+
+    async def serve(self, writer, method, target, headers):
+        if method not in ("GET", "HEAD"):
+            await self.respond(writer, 405, {"Allow": "GET, HEAD"}, b"")
+            return
+        path = self.resolve(target)
+        if path is None:
+            await self.respond(writer, 403, {}, b"")
+            return
+        if not os.path.isfile(path):
+            await self.respond(writer, 404, {"Content-Type": "text/plain; charset=utf-8"}, b"Not found\n")
+            return
+        entry = self.cache.get(path)
+        head = method == "HEAD"
+        common = {"Content-Type": entry["type"], "Last-Modified": entry["modified"],
+                  "Cache-Control": "no-cache", "Accept-Ranges": "bytes", "Vary": "Accept-Encoding"}
+
+        # Ranges are served from the identity body; If-Range falls back to the whole file once it changed
+        data, etag = entry["identity"]
+        range_header = headers.get("range")
+        if range_header and headers.get("if-range", etag) == etag:
+            byte_range = parse_range(range_header, len(data))
+            if byte_range == "unsatisfiable":
+                await self.respond(writer, 416, {**common, "Content-Range": f"bytes */{len(data)}"}, b"")
+                return
+            if byte_range is not None:
+                start, end = byte_range
+                await self.respond(writer, 206, {**common, "ETag": etag, "Content-Range": f"bytes {start}-{end}/{len(data)}"},
+                                   data[start:end + 1], head)
+                return
+
+        encoding = None
+        for candidate in accepted_encodings(headers.get("accept-encoding", "")):
+            encoded = self.cache.encoded(path, entry, candidate)
+            if encoded is not None:
+                (data, etag), encoding = encoded, candidate
+                break
+        if encoding:
+            common["Content-Encoding"] = encoding
+        common["ETag"] = etag
+        if_none_match = headers.get("if-none-match")
+        if if_none_match and (if_none_match.strip() == "*" or etag in [t.strip() for t in if_none_match.split(",")]):
+            await self.respond(writer, 304, {k: v for k, v in common.items() if k != "Content-Type"}, data)
+            return
+        await self.respond(writer, 200, common, data, head)
+
+    async def live(self, writer):
+        """Server-sent events: `rebuilt` and `failed` after each watch-triggered build."""
+        writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\nCache-Control: no-cache\r\n"
+                     b"Connection: keep-alive\r\n\r\n: connected\n\n")
+        await writer.drain()
+        queue = asyncio.Queue()
+        self.clients.add(queue)
+        try:
+            while True:
+                try:
+                    event, data = await asyncio.wait_for(queue.get(), timeout=15)
+                    writer.write(f"event: {event}\ndata: {json.dumps(data)}\n\n".encode())
+                except asyncio.TimeoutError:
+                    writer.write(b": ping\n\n")  # Notices closed tabs
+                await writer.drain()
+        finally:
+            self.clients.discard(queue)
+
+    def broadcast(self, event, data):
+        for queue in self.clients:
+            queue.put_nowait((event, data))
+
+    # --- Watch and rebuild ---
+    @staticmethod
+    def watched_paths():
+        """Every stage input that is a source (not another stage's output), mapped to the stages reading it."""
+        produced = {out for stage in build.STAGES for out in stage.outputs}
+        paths = {}
+        for stage in build.STAGES:
+            for path in stage.inputs():
+                if path not in produced:
+                    paths.setdefault(path, []).append(stage)
+        return paths
+
+    @staticmethod
+    def snapshot(paths):
+        mtimes = {}
+        for path in paths:
+            try:
+                mtimes[path] = os.stat(path).st_mtime_ns
+            except OSError:
+                mtimes[path] = None
+        return mtimes
+
+    @staticmethod
+    def affected_stages(changed, watched):
+        """Stages reading a changed file, plus every later stage that reads one of their outputs."""
+        names = {stage.name for path in changed for stage in watched.get(path, [])}
+        outputs = set()
+        selected = []
+        for stage in build.STAGES:  # Declared in dependency order
+            if stage.name in names or outputs.intersection(stage.inputs()):
+                selected.append(stage)
+                outputs.update(stage.outputs)
+        return selected
+
+    @staticmethod
+    def rebuild(stages, workers):
+        """Runs the stages through build.py's cache (blocking; called off the event loop)."""
+        manifest = build.load_manifest()
+        rebuilt = []
+        try:
+            for stage in stages:
+                status, spent, _ = build.run_stage(stage, manifest, workers=workers)
+                print(f"   [WATCH] {'HIT ' if status == 'hit' else 'MISS'} {stage.name}"
+                      + ("" if status == "hit" else f" (rebuilt in {spent:.1f}s)"))
+                if status != "hit":
+                    rebuilt.append(stage)
+        finally:
+            build.save_manifest(manifest)
+        if rebuilt:
+            build.sync_assets()
+        return rebuilt
+
+    async def watch_loop(self):
+        watched = self.watched_paths()
+        mtimes = self.snapshot(watched)
+        workers = build.LazyWorker()
+        print(f"   [WATCH] Watching {len(watched)} pipeline sources")
+        try:
+            while True:
+                await asyncio.sleep(self.interval)
+                current = self.snapshot(watched)
+                changed = [p for p in watched if current[p] != mtimes[p]]
+                if not changed:
+                    continue
+                # Debounce editors that save in several writes
+                await asyncio.sleep(self.interval)
+                current = self.snapshot(watched)
+                changed = [p for p in watched if current[p] != mtimes[p]]
+                stages = self.affected_stages(changed, watched)
+                names = [s.name for s in stages]
+                for path in changed:
+                    print(f"   [WATCH] Changed {os.path.relpath(path, ROOT_DIR)} -> {', '.join(names)}")
+                start = time.perf_counter()
+                try:
+                    rebuilt = await asyncio.to_thread(self.rebuild, stages, workers)
+                except (SystemExit, build.WorkerError, OSError) as e:
+                    print(f"   [WATCH] ❌ {e}")
+                    self.broadcast("failed", {"stages": names, "error": str(e)})
+                    rebuilt = None
+                # Stage outputs are inputs of later stages (the textures the atlas packs), already rebuilt: do not react to them
+                watched = self.watched_paths()
+                mtimes = self.snapshot(watched)
+                if rebuilt:
+                    files = sorted({os.path.relpath(out, ROOT_DIR) for stage in rebuilt for out in stage.outputs})
+                    await asyncio.to_thread(self.cache.warm, [os.path.join(ROOT_DIR, f) for f in files])
+                    print(f"   [WATCH] Rebuilt {', '.join(s.name for s in rebuilt)} in {time.perf_counter() - start:.1f}s, "
+                          f"reloading {len(self.clients)} client(s)")
+                    self.broadcast("rebuilt", {"stages": [s.name for s in rebuilt], "files": files})
+        finally:
+            workers.close()
+
+    def asset_files(self):
+        for folder in (build.ASSETS_DIR, build.VIEWER_ASSETS):
+            for dirpath, _, names in os.walk(folder):
+                for name in names:
+                    if not name.endswith((".br", ".gz")):
+                        yield os.path.join(dirpath, name)
+
+    async def run(self, host, port, open_path=None):
+        server = await asyncio.start_server(self.handle, host, port)
+        url = f"http://{host}:{server.sockets[0].getsockname()[1]}"
+        print(f"   [SERVE] {self.root} on {url} (encodings: {', '.join(FileCache.encodings())})")
+        if open_path:
+            webbrowser.open(url + open_path)
+        tasks = [asyncio.create_task(asyncio.to_thread(self.cache.warm, list(self.asset_files())))]
+        if self.watch:
+            tasks.append(asyncio.create_task(self.watch_loop()))
+        async with server:
+            await server.serve_forever()
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the game and viewer with compression, ETags, ranges and asset live reload.")
+    parser.add_argument("--host", default="127.0.0.1", help="Bind address")
+    parser.add_argument("--port", type=int, default=3000, help="Port (0 picks a free one)")
+    parser.add_argument("--open", dest="open_path", help="Page to open in the browser, e.g. /index.html")
+    parser.add_argument("--no-watch", action="store_true", help="Only serve; do not rebuild on changes")
+    parser.add_argument("--interval", type=float, default=0.5, help="Watch poll interval in seconds")
+    args = parser.parse_args()
+
+    server = DevServer(ROOT_DIR, watch=not args.no_watch, interval=args.interval)
+    try:
+        asyncio.run(server.run(args.host, args.port, args.open_path))
+    except KeyboardInterrupt:
+        print("   [SERVE] Stopped")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,10 +5,18 @@ const ASSETS_DIR = path.resolve(__dirname, '../../tools/viewer/assets');
 const TEXTURES_DIR = path.join(ASSETS_DIR, 'textures');
 const CONFIGS_DIR = path.join(ASSETS_DIR, 'configs');
 
+// Pages written by pipeline/textures/pack_atlas.py
+const isAtlasPage = f => f.startsWith('atlas_');
+// Textures graphics.js loads directly, written by pipeline/textures/runtime_textures.py
+const isRuntime = f => f.startsWith('runtime_');
+
 function generateCatalog() {
+    const pngs = fs.existsSync(TEXTURES_DIR) ? fs.readdirSync(TEXTURES_DIR).filter(f => f.endsWith('.png')) : [];
     const catalog = {
         models: fs.existsSync(ASSETS_DIR) ? fs.readdirSync(ASSETS_DIR).filter(f => f.endsWith('.glb')) : [],
-        textures: fs.existsSync(TEXTURES_DIR) ? fs.readdirSync(TEXTURES_DIR).filter(f => f.endsWith('.png')) : [],
+        textures: pngs.filter(f => !isAtlasPage(f) && !isRuntime(f)),
+        atlases: pngs.filter(isAtlasPage),
+        runtime: pngs.filter(isRuntime),
         configs: fs.existsSync(CONFIGS_DIR) ? fs.readdirSync(CONFIGS_DIR).filter(f => f.endsWith('.json')) : []
     };
 
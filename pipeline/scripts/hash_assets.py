@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Content-hashed asset export.
+
+Copies every built asset under assets/ to `<out>/<dir>/<name>.<hash>.<ext>`
+(the hash is the first HASH_LENGTH hex digits of the file's SHA-256), so a
+file's URL only changes when its bytes do and it can be cached as immutable.
+`<out>/asset-manifest.json` maps each logical path the runtime asks for to the
+hashed one:
+
+    {"format": 1, "version": "0.9.0", "assets": {"assets/models/plow.glb": "assets/models/plow.3f2a91c0de.glb", ...}}
+
+The manifest keeps its fixed name (fetch it without long-lived caching).
+Assets keep referring to each other by logical name (mapping configs ->
+textures, gems.json -> binaries); assetUrl() in src/utils/graphics-utils.js
+resolves those through the manifest at load time, so a texture change does not
+rename the configs that use it. Build reports are left out.
+
+    python3 pipeline/scripts/hash_assets.py --out dist/assets
+"""
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import sys
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+ASSETS_DIR = os.path.join(ROOT_DIR, "assets")
+MANIFEST_NAME = "asset-manifest.json"
+HASH_LENGTH = 10
+FORMAT_VERSION = 1
+
+def file_hash(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+def hashed_name(name, digest):
+    """`plow.glb` -> `plow.<hash>.glb`; `tracks_texture.s3tc.ktx2` -> `tracks_texture.s3tc.<hash>.ktx2`."""
+    stem, dot, ext = name.rpartition(".")
+    if not dot:
+        return f"{name}.{digest[:HASH_LENGTH]}"
+    return f"{stem}.{digest[:HASH_LENGTH]}.{ext}"
+
+def is_asset(name):
+    return not name.startswith(".") and not name.endswith("_report.json") and name != MANIFEST_NAME
+
+def read_version():
+    path = os.path.join(ROOT_DIR, "VERSION")
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return f.read().strip()
+
+def export_assets(src_dir, out_dir):
+    """Copies the assets under hashed names and writes the manifest. Returns the manifest."""
+    assets = {}
+    copied = total = 0
+    for dirpath, dirnames, names in os.walk(src_dir):
+        dirnames.sort()
+        for name in sorted(names):
+            if not is_asset(name):
+                continue
+            src = os.path.join(dirpath, name)
+            rel_dir = os.path.relpath(dirpath, src_dir)
+            target = os.path.normpath(os.path.join(rel_dir, hashed_name(name, file_hash(src))))
+            dst = os.path.join(out_dir, target)
+            os.makedirs(os.path.dirname(dst), exist_ok=True)
+            # Same name means same bytes: an existing copy from an earlier export can stay
+            if not os.path.exists(dst):
+                shutil.copyfile(src, dst)
+                copied += 1
+            total += 1
+            logical = os.path.normpath(os.path.join("assets", rel_dir, name)).replace(os.sep, "/")
+            assets[logical] = os.path.join("assets", target).replace(os.sep, "/")
+
+    manifest = {"format": FORMAT_VERSION, "version": read_version(), "assets": assets}
+    with open(os.path.join(out_dir, MANIFEST_NAME), "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+        f.write("\n")
+    print(f"   [HASH] {total} assets ({copied} new) -> {os.path.relpath(os.path.join(out_dir, MANIFEST_NAME), ROOT_DIR)}")
+    return manifest
+
+def main():
+    parser = argparse.ArgumentParser(description="Export the built assets under content-hashed names with a manifest.")
+    parser.add_argument("--src", default=ASSETS_DIR, help="Built assets directory")
+    parser.add_argument("--out", required=True, help="Output directory (e.g. dist/assets)")
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.src):
+        raise SystemExit(f"❌ {args.src} not found; build the assets first")
+    if os.path.abspath(args.out) == os.path.abspath(args.src):
+        raise SystemExit("❌ --out must differ from --src")
+    os.makedirs(args.out, exist_ok=True)
+    export_assets(args.src, args.out)
+    print("✅ Hashed assets exported")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
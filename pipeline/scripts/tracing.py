@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Pipeline tracing: spans, counters and optional cProfile captures, written as
+Chrome trace events (open the merged file in https://ui.perfetto.dev or
+chrome://tracing).
+
+Off unless DAMP_TRACE_DIR is set. Then every process that imports this module
+(build.py, Blender, the `uv run` texture generators, verification tools)
+writes its events to `<DAMP_TRACE_DIR>/<label>.<pid>.json`, and merge()
+combines the directory into one trace. `build.py --trace <file>` sets the
+variable for everything it launches:
+
+    from tracing import counter, span
+
+    with span("uv.smart_project", object=obj.name):
+        bpy.ops.uv.smart_project(angle_limit=66.0)
+    counter("glb", bytes=1234)
+
+A span whose name is listed in DAMP_TRACE_PROFILE (comma-separated, `*` for
+all) also runs under cProfile: the stats go to `<name>.<pid>.prof` (collected
+next to the merged trace) and the slowest functions into the span's args.
+
+Standard library only, so Blender's bundled Python can import it. Timestamps
+are wall-clock microseconds, so events from separate processes line up and the
+gap before a Blender script's first span is Blender's startup.
+
+    DAMP_TRACE_DIR=/tmp/trace task assets:textures
+    python3 pipeline/scripts/tracing.py /tmp/trace --output trace.json
+"""
+import argparse
+import atexit
+import cProfile
+import contextlib
+import glob
+import io
+import json
+import os
+import pstats
+import re
+import shutil
+import sys
+import threading
+import time
+
+TRACE_ENV = "DAMP_TRACE_DIR"
+PROFILE_ENV = "DAMP_TRACE_PROFILE"
+PROFILE_TOP = 10
+
+_events = []
+_label = None
+
+def enabled():
+    return bool(os.environ.get(TRACE_ENV))
+
+def start(trace_dir, label=None):
+    """Turns tracing on for this process and every process it launches afterwards."""
+    os.makedirs(trace_dir, exist_ok=True)
+    os.environ[TRACE_ENV] = trace_dir
+    if label:
+        set_process_name(label)
+
+def set_process_name(label):
+    """Names this process's row in the trace (default: the script name)."""
+    global _label
+    _label = label
+
+def _now_us():
+    return time.time_ns() / 1000.0
+
+def _event(ph, name, cat, **fields):
+    event = {"name": name, "cat": cat, "ph": ph, "pid": os.getpid(), "tid": threading.get_native_id(), **fields}
+    _events.append(event)
+    return event
+
+def _profiled(name):
+    names = os.environ.get(PROFILE_ENV, "")
+    return names == "*" or name in [n.strip() for n in names.split(",")]
+
+def _profile_summary(profiler, name):
+    """Writes the .prof file and returns the slowest functions by cumulative time."""
+    safe = re.sub(r"[^A-Za-z0-9_.-]+", "_", name)
+    os.makedirs(os.environ[TRACE_ENV], exist_ok=True)
+    path = os.path.join(os.environ[TRACE_ENV], f"{safe}.{os.getpid()}.prof")
+    profiler.dump_stats(path)
+    stats = pstats.Stats(profiler, stream=io.StringIO())
+    rows = sorted(stats.stats.items(), key=lambda item: item[1][3], reverse=True)[:PROFILE_TOP]
+    top = [f"{fn} ({os.path.basename(file)}:{line}) {ct * 1000:.1f} ms" for (file, line, fn), (_, _, _, ct, _) in rows]
+    return {"profile": os.path.basename(path), "slowest": top}
+
+@contextlib.contextmanager
+def span(name, cat="pipeline", profile=False, **args):
+    """Times the block as one complete event. Yields its args dict, so results can be attached before it closes.
+    Also works as a decorator."""
+    if not enabled():
+        yield args
+        return
+    profiler = cProfile.Profile() if profile or _profiled(name) else None
+    ts = _now_us()
+    t0 = time.perf_counter()
+    if profiler:
+        profiler.enable()
+    try:
+        yield args
+    finally:
+        if profiler:
+            profiler.disable()
+            args.update(_profile_summary(profiler, name))
+        dur = (time.perf_counter() - t0) * 1e6
+        _event("X", name, cat, ts=ts, dur=dur, args=args)
+
+def counter(name, cat="pipeline", **values):
+    """One sample of a counter track (each keyword is a series)."""
+    if enabled():
+        _event("C", name, cat, ts=_now_us(), args=values)
+
+def instant(name, cat="pipeline", **args):
+    if enabled():
+        _event("i", name, cat, ts=_now_us(), s="p", args=args)
+
+def flush():
+    """Writes this process's events so far (rewriting its file); also runs at exit."""
+    trace_dir = os.environ.get(TRACE_ENV)
+    if not trace_dir or not _events:
+        return None
+    label = _label or os.path.splitext(os.path.basename(sys.argv[0] or "python"))[0] or "python"
+    pid = os.getpid()
+    meta = [{"name": "process_name", "ph": "M", "pid": pid, "args": {"name": f"{label} ({pid})"}}]
+    path = os.path.join(trace_dir, f"{re.sub(r'[^A-Za-z0-9_.-]+', '_', label)}.{pid}.json")
+    os.makedirs(trace_dir, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump({"traceEvents": meta + _events}, f)
+    return path
+
+atexit.register(flush)
+
+# --- Merging ---
+def merge(trace_dir, output):
+    """Combines every process's events under `trace_dir` into one trace file, with any cProfile
+    captures copied to `<output stem>_profiles/`. Returns the events."""
+    events = []
+    for path in sorted(glob.glob(os.path.join(trace_dir, "*.json"))):
+        try:
+            with open(path) as f:
+                events += json.load(f)["traceEvents"]
+        except (OSError, ValueError, KeyError) as e:
+            # A process killed mid-write leaves a partial file; keep the rest of the trace
+            print(f"   [TRACE] Skipping {os.path.basename(path)}: {e}")
+    events.sort(key=lambda e: (e.get("ts", 0), -e.get("dur", 0)))
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+    profiles = sorted(glob.glob(os.path.join(trace_dir, "*.prof")))
+    if profiles:
+        profile_dir = os.path.splitext(output)[0] + "_profiles"
+        os.makedirs(profile_dir, exist_ok=True)
+        for path in profiles:
+            shutil.copy2(path, profile_dir)
+    return events
+
+def summarize(events, top=10):
+    """Prints the spans with the most total time."""
+    totals = {}
+    for e in events:
+        if e.get("ph") == "X":
+            total, count = totals.get(e["name"], (0.0, 0))
+            totals[e["name"]] = (total + e["dur"], count + 1)
+    for name, (total, count) in sorted(totals.items(), key=lambda item: item[1][0], reverse=True)[:top]:
+        print(f"   [TRACE] {total / 1000:>9.1f} ms  {count:>4}x  {name}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Merge per-process trace files into one Chrome trace JSON.")
+    parser.add_argument("trace_dir", help="Directory DAMP_TRACE_DIR pointed at")
+    parser.add_argument("--output", required=True, help="Merged trace JSON")
+    args = parser.parse_args()
+
+    events = merge(args.trace_dir, args.output)
+    summarize(events)
+    print(f"✅ {len(events)} events -> {args.output}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""
+DAMP contract and budget verifier for every GLB in the viewer catalog.
+
+For each model listed in tools/viewer/assets/catalog.json (checked in parallel):
+- the GLB container and every bufferView/accessor range is structurally valid,
+  and index buffers stay within their vertex count;
+- every mesh node carries a `damp_id` that is a `components` key (or a declared
+  `helpers` id) of the mapping config whose `assetId` is the file, and so does
+  every material `damp_id`;
+- the mapping's `budgets` hold: LOD0 triangles/vertices, BIN buffer bytes and
+  the largest texture dimension (embedded images and mapped textureIds, or
+  their atlas pages).
+
+GLBs are read with pipeline/gltf/glb.py: only the JSON chunk is decoded, the
+BIN chunk is read through memoryview slices.
+Exits non-zero on any error. `--json` writes a machine-readable report.
+
+    python3 pipeline/scripts/verify_glb.py
+    python3 pipeline/scripts/verify_glb.py --json verification/reports/glb_budgets.json
+    python3 pipeline/scripts/verify_glb.py --json - | jq .ok   # report on stderr
+"""
+import argparse
+import concurrent.futures
+import datetime
+import json
+import os
+import struct
+import subprocess
+import sys
+
+import numpy as np
+
+import tracing
+from tracing import span
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+VIEWER_ASSETS = os.path.join(ROOT_DIR, "tools", "viewer", "assets")
+sys.path.append(os.path.join(ROOT_DIR, "pipeline", "gltf"))
+sys.path.append(os.path.join(ROOT_DIR, "pipeline", "textures"))
+from glb import COMPONENT_DTYPES, TYPE_SIZES, read_glb
+from pack_atlas import atlas_entry, load_layout
+
+TRIANGLES = 4
+INDEX_FORMATS = {5121: "B", 5123: "H", 5125: "I"}
+BUDGET_METRICS = {"triangles": "triangles", "vertices": "vertices", "bufferBytes": "bufferBytes", "textureSize": "maxTextureSize"}
+
+# --- Images ---
+def image_size(data):
+    """(width, height) from PNG or JPEG header bytes, or None."""
+    if bytes(data[:8]) == b"\x89PNG\r\n\x1a\n" and len(data) >= 24:
+        return struct.unpack_from(">II", data, 16)
+    if bytes(data[:2]) == b"\xff\xd8":
+        i = 2
+        while i + 9 < len(data):
+            if data[i] != 0xFF:
+                i += 1
+                continue
+            marker = data[i + 1]
+            if marker in (0xC0, 0xC1, 0xC2):
+                height, width = struct.unpack_from(">HH", data, i + 5)
+                return width, height
+            i += 2 + struct.unpack_from(">H", data, i + 2)[0]
+    return None
+
+# --- Checks ---
+def check_structure(gltf, binary, errors):
+    buffers = gltf.get("buffers", [])
+    if buffers and buffers[0].get("byteLength", 0) > len(binary):
+        errors.append(f"buffer 0 declares {buffers[0]['byteLength']} bytes, BIN chunk has {len(binary)}")
+    for i, view in enumerate(gltf.get("bufferViews", [])):
+        end = view.get("byteOffset", 0) + view["byteLength"]
+        if view.get("buffer", 0) == 0 and end > len(binary):
+            errors.append(f"bufferView {i} ends at {end}, past the BIN chunk ({len(binary)})")
+    for i, accessor in enumerate(gltf.get("accessors", [])):
+        if "bufferView" not in accessor:
+            continue
+        view = gltf["bufferViews"][accessor["bufferView"]]
+        item = np.dtype(COMPONENT_DTYPES[accessor["componentType"]]).itemsize * TYPE_SIZES[accessor["type"]]
+        stride = view.get("byteStride", item)
+        end = accessor.get("byteOffset", 0) + (accessor["count"] - 1) * stride + item if accessor["count"] else 0
+        if end > view["byteLength"]:
+            errors.append(f"accessor {i} ends at {end}, past bufferView {accessor['bufferView']} ({view['byteLength']})")
+
+def index_view(gltf, binary, index):
+    accessor = gltf["accessors"][index]
+    view = gltf["bufferViews"][accessor["bufferView"]]
+    fmt = INDEX_FORMATS[accessor["componentType"]]
+    size = struct.calcsize(fmt)
+    start = view.get("byteOffset", 0) + accessor.get("byteOffset", 0)
+    return binary[start:start + accessor["count"] * size].cast(fmt)
+
+def lod_level(gltf, node_index, parents):
+    while node_index is not None:
+        lod = gltf["nodes"][node_index].get("extras", {}).get("lod")
+        if lod:
+            return lod
+        node_index = parents.get(node_index)
+    return 0
+
+def verify_asset(glb_path, config_path, textures_dir):
+    name = os.path.basename(glb_path)
+    errors, warnings = [], []
+    metrics = {"fileBytes": 0, "bufferBytes": 0, "nodes": 0, "meshes": 0, "triangles": 0, "vertices": 0,
+               "trianglesAllLods": 0, "verticesAllLods": 0, "maxTextureSize": 0}
+    result = {"file": name, "config": os.path.basename(config_path) if config_path else None,
+              "errors": errors, "warnings": warnings, "metrics": metrics, "budgets": {}}
+
+    try:
+        gltf, binary = read_glb(glb_path)
+    except (OSError, ValueError) as e:
+        errors.append(str(e))
+        result["ok"] = False
+        return result
+    metrics["fileBytes"] = os.path.getsize(glb_path)
+    metrics["bufferBytes"] = len(binary)
+    check_structure(gltf, binary, errors)
+    structure_ok = not errors
+
+    config = {}
+    if config_path is None:
+        errors.append("no mapping config with this assetId")
+    else:
+        with open(config_path) as f:
+            config = json.load(f)
+    components = set(config.get("components", {}))
+    helpers = set(config.get("helpers", []))
+
+    nodes = gltf.get("nodes", [])
+    parents = {c: p for p, node in enumerate(nodes) for c in node.get("children", [])}
+    metrics["nodes"] = len(nodes)
+    metrics["meshes"] = len(gltf.get("meshes", []))
+    used_ids = set()
+    for n, node in enumerate(nodes):
+        if "mesh" not in node:
+            continue
+        label = node.get("name", f"node {n}")
+        damp_id = node.get("extras", {}).get("damp_id")
+        if not damp_id:
+            errors.append(f"mesh node '{label}' has no damp_id")
+        elif config and damp_id not in components and damp_id not in helpers:
+            errors.append(f"node '{label}' damp_id '{damp_id}' is not a component in {result['config']}")
+        used_ids.add(damp_id)
+
+        lod0 = lod_level(gltf, n, parents) == 0
+        for prim in gltf["meshes"][node["mesh"]]["primitives"]:
+            vertices = gltf["accessors"][prim["attributes"]["POSITION"]]["count"] if "POSITION" in prim["attributes"] else 0
+            if "indices" in prim:
+                count = gltf["accessors"][prim["indices"]]["count"]
+                if structure_ok:
+                    indices = index_view(gltf, binary, prim["indices"])
+                    if len(indices) and max(indices) >= vertices:
+                        errors.append(f"node '{label}' indexes vertex {max(indices)} of {vertices}")
+            else:
+                count = vertices
+            triangles = count // 3 if prim.get("mode", TRIANGLES) == TRIANGLES else 0
+            metrics["trianglesAllLods"] += triangles
+            metrics["verticesAllLods"] += vertices
+            if lod0:
+                metrics["triangles"] += triangles
+                metrics["vertices"] += vertices
+
+            if "material" in prim:
+                material = gltf["materials"][prim["material"]]
+                mat_id = material.get("extras", {}).get("damp_id")
+                if not mat_id:
+                    warnings.append(f"material '{material.get('name')}' on '{label}' has no damp_id (falls back to the node)")
+                elif config and mat_id not in components:
+                    errors.append(f"material '{material.get('name')}' damp_id '{mat_id}' is not a component in {result['config']}")
+                used_ids.add(mat_id)
+
+    for key in sorted(components - used_ids):
+        warnings.append(f"component '{key}' is not used by any node or material")
+
+    # Textures: embedded images plus the textureIds the mapping points at
+    sizes = []
+    for i, image in enumerate(gltf.get("images", [])):
+        if "bufferView" in image:
+            v = gltf["bufferViews"][image["bufferView"]]
+            size = image_size(binary[v.get("byteOffset", 0):v.get("byteOffset", 0) + v["byteLength"]])
+            if size:
+                sizes.append(size)
+    layout = load_layout(textures_dir)
+    for settings in config.get("components", {}).values():
+        # The runtime loads the atlas page instead when the texture was packed
+        entry = atlas_entry(settings, layout)
+        texture = entry["textureId"] if entry else settings.get("textureId")
+        if not texture or texture == "None" or texture.startswith("http"):
+            continue
+        path = os.path.join(textures_dir, texture)
+        if not os.path.exists(path):
+            errors.append(f"textureId '{texture}' not found in {os.path.relpath(textures_dir, ROOT_DIR)}")
+            continue
+        with open(path, "rb") as f:
+            size = image_size(memoryview(f.read(64 * 1024)))
+        if size:
+            sizes.append(size)
+    metrics["maxTextureSize"] = max((max(s) for s in sizes), default=0)
+
+    budgets = config.get("budgets", {})
+    for key, metric in BUDGET_METRICS.items():
+        if key not in budgets:
+            continue
+        result["budgets"][key] = {"limit": budgets[key], "value": metrics[metric], "ok": metrics[metric] <= budgets[key]}
+        if metrics[metric] > budgets[key]:
+            errors.append(f"{key} {metrics[metric]} exceeds budget {budgets[key]}")
+    if config and not budgets:
+        warnings.append("mapping has no budgets")
+
+    result["ok"] = not errors
+    return result
+
+# --- Catalog ---
+def mapping_configs(configs_dir, names):
+    """{assetId: config path} for the catalog's configs."""
+    by_asset = {}
+    for name in names:
+        path = os.path.join(configs_dir, name)
+        try:
+            with open(path) as f:
+                asset_id = json.load(f).get("assetId")
+        except (OSError, json.JSONDecodeError):
+            continue
+        if asset_id:
+            by_asset[asset_id] = path
+    return by_asset
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], cwd=ROOT_DIR, capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        return None
+
+def verify_traced(glb_path, config_path, textures_dir):
+    """verify_asset() in a pool worker; workers exit without running atexit handlers, so its events are flushed here."""
+    with span("verify_asset", cat="verify", asset=os.path.basename(glb_path)):
+        result = verify_asset(glb_path, config_path, textures_dir)
+    tracing.flush()
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description="Verify the DAMP contract and budgets of every catalogued GLB.")
+    parser.add_argument("models", nargs="*", help="Only these catalog models (default: all)")
+    parser.add_argument("--catalog", default=os.path.join(VIEWER_ASSETS, "catalog.json"))
+    parser.add_argument("--jobs", "-j", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--json", metavar="PATH", help="Write the report as JSON ('-' for stdout)")
+    args = parser.parse_args()
+
+    assets_dir = os.path.dirname(os.path.abspath(args.catalog))
+    with open(args.catalog) as f:
+        catalog = json.load(f)
+    models = [m for m in catalog.get("models", []) if not args.models or m in args.models]
+    configs = mapping_configs(os.path.join(assets_dir, "configs"), catalog.get("configs", []))
+    textures_dir = os.path.join(assets_dir, "textures")
+
+    jobs = [(os.path.join(assets_dir, m), configs.get(m), textures_dir) for m in models]
+    with concurrent.futures.ProcessPoolExecutor(max_workers=max(1, min(args.jobs, len(jobs) or 1))) as pool:
+        results = list(pool.map(verify_traced, *zip(*jobs))) if jobs else []
+
+    # With the JSON on stdout, the human-readable report goes to stderr so stdout stays parseable
+    out = sys.stderr if args.json == "-" else sys.stdout
+    for r in results:
+        m = r["metrics"]
+        status = "✅" if r["ok"] else "❌"
+        print(f"{status} {r['file']} ({r['config'] or 'no config'}): {m['triangles']} tris, {m['vertices']} verts, "
+              f"{m['bufferBytes']} buffer bytes, max texture {m['maxTextureSize']}px", file=out)
+        for e in r["errors"]:
+            print(f"   [ERROR] {e}", file=out)
+        for w in r["warnings"]:
+            print(f"   [WARN] {w}", file=out)
+
+    report = {
+        "generatedAt": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "commit": git_commit(),
+        "catalog": os.path.relpath(os.path.abspath(args.catalog), ROOT_DIR),
+        "ok": all(r["ok"] for r in results),
+        "assets": results,
+    }
+    if args.json == "-":
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    elif args.json:
+        os.makedirs(os.path.dirname(os.path.abspath(args.json)), exist_ok=True)
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if not results:
+        print("⚠️ No models in the catalog", file=out)
+    return 0 if report["ok"] else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,81 @@
+# /// script
+# dependencies = [
+#   "numpy",
+#   "Pillow",
+# ]
+# ///
+"""
+Benchmarks the procedural texture engine.
+
+Reports megapixels/second for the track texture at 512, 2048 and 4096, and checks
+that the 512 output is byte-identical to the original per-pixel implementation.
+"""
+
+import argparse
+import io
+import sys
+import time
+
+from PIL import Image
+
+from generate_textures import tracks_layers
+from texture_engine import render_image
+
+SIZES = [512, 2048, 4096]
+
+def legacy_tracks_texture(width=512, height=512):
+    """The original triple-loop implementation, kept as the reference output."""
+    img = Image.new('RGBA', (width, height), (15, 15, 15, 255))
+    pixels = img.load()
+    bar_height = 64
+    for y in range(0, height, bar_height):
+        for x in range(width):
+            offset = abs(x - 256) // 8
+            for py in range(y + offset, y + offset + 20):
+                if 0 <= py < height:
+                    pixels[x, py] = (51, 51, 51, 255)
+    return img
+
+def png_bytes(img):
+    buf = io.BytesIO()
+    img.save(buf, format="PNG")
+    return buf.getvalue()
+
+def best_of(fn, repeats):
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the procedural texture engine.")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--legacy", action="store_true", help="Also time the original per-pixel loop at 512")
+    args = parser.parse_args()
+
+    reference = png_bytes(legacy_tracks_texture())
+    engine = png_bytes(render_image(512, 512, (15, 15, 15, 255), tracks_layers(512)))
+    identical = reference == engine
+    print(f"   [CHECK] 512 PNG byte-identical to legacy output: {'yes' if identical else 'NO'}")
+
+    print(f"\n{'Size':>6} | {'Render (ms)':>11} | {'MP/s':>8} | {'Render+PNG (ms)':>15}")
+    print("-" * 50)
+    if args.legacy:
+        t = best_of(legacy_tracks_texture, args.repeats)
+        print(f"{'512*':>6} | {t * 1000:>11.1f} | {0.262144 / t:>8.1f} | {'-':>15}")
+    for size in SIZES:
+        layers = tracks_layers(size)
+        render = lambda: render_image(size, size, (15, 15, 15, 255), layers)
+        t_render = best_of(render, args.repeats)
+        t_total = best_of(lambda: png_bytes(render()), args.repeats)
+        mp = size * size / 1e6
+        print(f"{size:>6} | {t_render * 1000:>11.1f} | {mp / t_render:>8.1f} | {t_total * 1000:>15.1f}")
+    if args.legacy:
+        print("\n* legacy per-pixel loop")
+
+    return 0 if identical else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
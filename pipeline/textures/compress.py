@@ -0,0 +1,461 @@
+# /// script
+# dependencies = [
+#   "numpy",
+#   "Pillow",
+# ]
+# ///
+"""
+GPU block compression for generated textures, written as KTX2.
+
+Textures that a mapping component opts into with `"textureFormat": "ktx2"` are
+encoded, with a full mip chain, into two KTX2 files next to the PNG:
+
+    <name>.s3tc.ktx2   BC1 (opaque) or BC3 (with alpha), for desktop GPUs
+    <name>.etc.ktx2    ETC1 / ETC2 RGB, for mobile GPUs (opaque textures only)
+
+MaterialManager picks whichever the device supports and falls back to the PNG.
+PNG stays the default: without supercompression the files are far larger on
+the wire than the PNG, so opt in only where the VRAM saving is worth it.
+A packed texture (see pack_atlas.py) is compressed as its atlas page. Endpoint
+fitting (principal axis + least-squares refinement for BC1, per-subblock base
+colour and modifier-table search for ETC1) is vectorized over all blocks.
+Data is stored bottom row first (KTXorientation "ru"), matching the flipY of
+PNG textures, so UVs and atlas transforms are unchanged. Every level is decoded
+again to report PSNR against the source.
+
+    uv run pipeline/textures/compress.py
+    uv run pipeline/textures/compress.py assets/textures/tracks_texture.png --report /tmp/ktx2.json
+"""
+import argparse
+import json
+import os
+import struct
+import sys
+import time
+
+import numpy as np
+from PIL import Image
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+TEXTURES_DIR = os.path.join(ROOT_DIR, "assets", "textures")
+CONFIGS_DIR = os.path.join(ROOT_DIR, "assets", "configs")
+sys.path.append(os.path.join(ROOT_DIR, "pipeline", "scripts"))
+from tracing import counter, span
+
+from pack_atlas import atlas_entry, load_layout
+
+CHUNK_BLOCKS = 8192
+
+# --- Mips ---
+def srgb_to_linear(c):
+    c = c / 255.0
+    return np.where(c <= 0.04045, c / 12.92, ((c + 0.055) / 1.055) ** 2.4)
+
+def linear_to_srgb(c):
+    c = np.where(c <= 0.0031308, c * 12.92, 1.055 * np.power(np.maximum(c, 0.0), 1 / 2.4) - 0.055)
+    return c * 255.0
+
+def downsample(rgba):
+    """2x2 box filter, in linear light for RGB."""
+    h, w = rgba.shape[:2]
+    if h % 2 or w % 2:
+        rgba = np.pad(rgba, ((0, h % 2), (0, w % 2), (0, 0)), mode="edge")
+    linear = np.concatenate([srgb_to_linear(rgba[..., :3].astype(np.float64)), rgba[..., 3:] / 255.0], axis=2)
+    linear = linear.reshape(linear.shape[0] // 2, 2, linear.shape[1] // 2, 2, 4).mean(axis=(1, 3))
+    out = np.concatenate([linear_to_srgb(linear[..., :3]), linear[..., 3:] * 255.0], axis=2)
+    return np.clip(np.rint(out), 0, 255).astype(np.uint8)
+
+def mip_chain(rgba):
+    levels = [rgba]
+    while max(levels[-1].shape[:2]) > 1:
+        levels.append(downsample(levels[-1]))
+    return levels
+
+# --- Blocks ---
+def to_blocks(img):
+    """(n, 16, channels) float32 4x4 blocks in row-major pixel order; edges are replicated to a multiple of 4."""
+    h, w = img.shape[:2]
+    img = np.pad(img, ((0, -h % 4), (0, -w % 4), (0, 0)), mode="edge")
+    by, bx = img.shape[0] // 4, img.shape[1] // 4
+    return img.reshape(by, 4, bx, 4, -1).transpose(0, 2, 1, 3, 4).reshape(by * bx, 16, -1).astype(np.float32)
+
+def from_blocks(blocks, h, w):
+    by, bx = -(-h // 4), -(-w // 4)
+    img = blocks.reshape(by, bx, 4, 4, -1).transpose(0, 2, 1, 3, 4).reshape(by * 4, bx * 4, -1)
+    return img[:h, :w]
+
+def chunked(fn, blocks):
+    """Encodes CHUNK_BLOCKS blocks at a time to bound the temporaries."""
+    return b"".join(fn(blocks[i:i + CHUNK_BLOCKS]) for i in range(0, len(blocks), CHUNK_BLOCKS))
+
+# --- BC1 ---
+def pack565(rgb):
+    rgb = np.clip(np.rint(rgb), 0, 255).astype(np.uint32)
+    return (((rgb[..., 0] * 31 + 127) // 255) << 11 | ((rgb[..., 1] * 63 + 127) // 255) << 5 | ((rgb[..., 2] * 31 + 127) // 255)).astype(np.uint16)
+
+def unpack565(c):
+    c = c.astype(np.uint32)
+    r, g, b = (c >> 11) & 31, (c >> 5) & 63, c & 31
+    return np.stack([(r << 3) | (r >> 2), (g << 2) | (g >> 4), (b << 3) | (b >> 2)], axis=-1).astype(np.float32)
+
+def bc1_palette(c0, c1, always_four=False):
+    """The 4 colours a decoder derives from two 565 endpoints, (n, 4, 3)."""
+    p0, p1 = unpack565(c0), unpack565(c1)
+    four = (c0 > c1) | always_four
+    third = np.where(four[:, None], (2 * p0 + p1) / 3, (p0 + p1) / 2)
+    fourth = np.where(four[:, None], (p0 + 2 * p1) / 3, 0.0)
+    return np.floor(np.stack([p0, p1, third, fourth], axis=1))
+
+def principal_endpoints(colors):
+    """Endpoints along each block's principal axis, inset by 1/16 of the range."""
+    mean = colors.mean(axis=1, keepdims=True)
+    centered = colors - mean
+    cov = np.einsum("nki,nkj->nij", centered, centered)
+    axis = np.ones((len(colors), 3), dtype=np.float32)
+    for _ in range(8):
+        axis = np.einsum("nij,nj->ni", cov, axis)
+        axis /= np.maximum(np.linalg.norm(axis, axis=1, keepdims=True), 1e-12)
+    t = np.einsum("nki,ni->nk", centered, axis)
+    lo, hi = t.min(axis=1), t.max(axis=1)
+    inset = (hi - lo) / 16
+    e0 = mean[:, 0] + axis * (hi - inset)[:, None]
+    e1 = mean[:, 0] + axis * (lo + inset)[:, None]
+    return e0, e1
+
+def assign(colors, palette):
+    d = ((colors[:, :, None, :] - palette[:, None, :, :]) ** 2).sum(axis=3)
+    indices = d.argmin(axis=2)
+    return indices, np.take_along_axis(d, indices[..., None], axis=2)[..., 0].sum(axis=1)
+
+def order_endpoints(c0, c1, always_four):
+    """Four-colour mode needs c0 > c1; blocks with c0 == c1 decode as a single colour either way."""
+    swap = c0 < c1
+    return np.where(swap, c1, c0), np.where(swap, c0, c1)
+
+def encode_bc1_colors(colors, always_four=False):
+    """(c0, c1, indices) for (n, 16, 3) colours."""
+    e0, e1 = principal_endpoints(colors)
+    c0, c1 = order_endpoints(pack565(e0), pack565(e1), always_four)
+    indices, error = assign(colors, bc1_palette(c0, c1, always_four))
+
+    # One least-squares refit of the endpoints to the chosen indices
+    weights = np.array([1.0, 0.0, 2 / 3, 1 / 3], dtype=np.float32)[indices]
+    a, b = weights, 1.0 - weights
+    aa, bb, ab = (a * a).sum(1), (b * b).sum(1), (a * b).sum(1)
+    ax, bx = np.einsum("nk,nki->ni", a, colors), np.einsum("nk,nki->ni", b, colors)
+    det = aa * bb - ab * ab
+    ok = np.abs(det) > 1e-6
+    safe = np.where(ok, det, 1.0)[:, None]
+    r0 = np.where(ok[:, None], (ax * bb[:, None] - bx * ab[:, None]) / safe, e0)
+    r1 = np.where(ok[:, None], (bx * aa[:, None] - ax * ab[:, None]) / safe, e1)
+    d0, d1 = order_endpoints(pack565(r0), pack565(r1), always_four)
+    refit_indices, refit_error = assign(colors, bc1_palette(d0, d1, always_four))
+    better = refit_error < error
+    c0, c1 = np.where(better, d0, c0), np.where(better, d1, c1)
+    indices = np.where(better[:, None], refit_indices, indices)
+    return c0, c1, indices
+
+def pack_bc1(c0, c1, indices):
+    bits = (indices.astype(np.uint32) << (2 * np.arange(16, dtype=np.uint32))).sum(axis=1, dtype=np.uint32)
+    out = np.zeros(len(c0), dtype=[("c0", "<u2"), ("c1", "<u2"), ("bits", "<u4")])
+    out["c0"], out["c1"], out["bits"] = c0, c1, bits
+    return out.tobytes()
+
+def decode_bc1_blocks(data, always_four=False):
+    raw = np.frombuffer(data, dtype=[("c0", "<u2"), ("c1", "<u2"), ("bits", "<u4")])
+    indices = (raw["bits"][:, None] >> (2 * np.arange(16, dtype=np.uint32))) & 3
+    palette = bc1_palette(raw["c0"], raw["c1"], always_four)
+    return np.take_along_axis(palette, indices[..., None].astype(np.int64), axis=1)
+
+# --- BC3 alpha ---
+def alpha_palette(a0, a1):
+    a0, a1 = a0.astype(np.float32)[:, None], a1.astype(np.float32)[:, None]
+    eight = a0 > a1
+    steps = np.arange(1, 7, dtype=np.float32)
+    interp8 = ((7 - steps) * a0 + steps * a1) / 7
+    steps6 = np.arange(1, 5, dtype=np.float32)
+    interp6 = np.concatenate([((5 - steps6) * a0 + steps6 * a1) / 5, np.zeros_like(a0), np.full_like(a0, 255)], axis=1)
+    return np.floor(np.concatenate([a0, a1, np.where(eight, interp8, interp6)], axis=1) + 0.5)
+
+def encode_alpha(alpha):
+    a0 = np.clip(np.rint(alpha.max(axis=1)), 0, 255).astype(np.uint8)
+    a1 = np.clip(np.rint(alpha.min(axis=1)), 0, 255).astype(np.uint8)
+    palette = alpha_palette(a0, a1)
+    indices = np.abs(alpha[:, :, None] - palette[:, None, :]).argmin(axis=2)
+    return a0, a1, indices
+
+def pack_bc3(a0, a1, alpha_indices, c0, c1, indices):
+    bits = (alpha_indices.astype(np.uint64) << (3 * np.arange(16, dtype=np.uint64))).sum(axis=1, dtype=np.uint64)
+    out = np.zeros(len(a0), dtype=[("a0", "u1"), ("a1", "u1"), ("abits", "u1", 6), ("color", "V8")])
+    out["a0"], out["a1"] = a0, a1
+    out["abits"] = bits.astype("<u8").view(np.uint8).reshape(-1, 8)[:, :6]
+    out["color"] = np.frombuffer(pack_bc1(c0, c1, indices), dtype="V8")
+    return out.tobytes()
+
+def decode_bc3_blocks(data):
+    raw = np.frombuffer(data, dtype=[("a0", "u1"), ("a1", "u1"), ("abits", "u1", 6), ("color", "V8")])
+    bits = np.zeros((len(raw), 8), dtype=np.uint8)
+    bits[:, :6] = raw["abits"]
+    bits = bits.view("<u8")[:, 0]
+    alpha_indices = ((bits[:, None] >> (3 * np.arange(16, dtype=np.uint64))) & 7).astype(np.int64)
+    alpha = np.take_along_axis(alpha_palette(raw["a0"], raw["a1"]), alpha_indices, axis=1)
+    rgb = decode_bc1_blocks(raw["color"].tobytes(), always_four=True)
+    return np.concatenate([rgb, alpha[..., None]], axis=2)
+
+# --- ETC1 ---
+ETC_MODIFIERS = np.array([
+    [2, 8, -2, -8], [5, 17, -5, -17], [9, 29, -9, -29], [13, 42, -13, -42],
+    [18, 60, -18, -60], [24, 80, -24, -80], [33, 106, -33, -106], [47, 183, -47, -183],
+], dtype=np.float32)
+# Row-major block pixel k = y*4 + x belongs to subblock 1 when x >= 2 (flip 0) or y >= 2 (flip 1)
+ETC_SUBBLOCK = np.array([[(k % 4) >= 2 for k in range(16)], [(k // 4) >= 2 for k in range(16)]])
+
+def expand(value, bits):
+    value = value.astype(np.int32)
+    return ((value << (8 - bits)) | (value >> (2 * bits - 8))).astype(np.float32)
+
+def etc_base_colors(colors, flip):
+    """Quantized base colour per subblock: differential (555 + 333 delta) when it fits, else individual 444."""
+    mask = ETC_SUBBLOCK[flip]
+    avg = np.stack([colors[:, ~mask].mean(axis=1), colors[:, mask].mean(axis=1)], axis=1)
+    q5 = np.clip(np.rint(avg * 31 / 255), 0, 31).astype(np.int32)
+    delta = q5[:, 1] - q5[:, 0]
+    diff = np.all((delta >= -4) & (delta <= 3), axis=1)
+    q4 = np.clip(np.rint(avg * 15 / 255), 0, 15).astype(np.int32)
+    base = np.where(diff[:, None, None], expand(q5, 5), expand(q4, 4))
+    return diff, q5, q4, base
+
+def etc_fit(colors, flip):
+    """Best table and per-pixel modifier for each subblock. Returns (diff, q5, q4, tables, indices, error)."""
+    mask = ETC_SUBBLOCK[flip]
+    diff, q5, q4, base = etc_base_colors(colors, flip)
+    pixel_base = np.where(mask[None, :, None], base[:, 1:2], base[:, 0:1])  # (n, 16, 3)
+    errors = np.empty((len(colors), 16, 8), dtype=np.float32)
+    choices = np.empty((len(colors), 16, 8), dtype=np.int64)
+    for t, modifiers in enumerate(ETC_MODIFIERS):
+        candidates = np.clip(pixel_base[:, :, None, :] + modifiers[None, None, :, None], 0, 255)
+        d = ((candidates - colors[:, :, None, :]) ** 2).sum(axis=3)
+        choices[:, :, t] = d.argmin(axis=2)
+        errors[:, :, t] = d.min(axis=2)
+    sub_errors = np.stack([errors[:, ~mask].sum(axis=1), errors[:, mask].sum(axis=1)], axis=1)  # (n, 2, 8)
+    tables = sub_errors.argmin(axis=2)
+    pixel_table = np.where(mask[None, :], tables[:, 1:2], tables[:, 0:1])
+    indices = np.take_along_axis(choices, pixel_table[..., None], axis=2)[..., 0]
+    return diff, q5, q4, tables, indices, np.take_along_axis(sub_errors, tables[..., None], axis=2).sum(axis=(1, 2))
+
+def encode_etc1(colors):
+    fits = [etc_fit(colors, flip) for flip in (0, 1)]
+    use_flip = fits[1][5] < fits[0][5]
+    diff, q5, q4, tables, indices, _ = (np.where(use_flip.reshape((-1,) + (1,) * (a.ndim - 1)), b, a) for a, b in zip(*fits))
+    return pack_etc1(diff, q5, q4, tables, indices, use_flip)
+
+def pack_etc1(diff, q5, q4, tables, indices, flip):
+    diff64 = diff.astype(np.uint64)
+    delta = (q5[:, 1] - q5[:, 0]) & 7
+    high = np.where(
+        diff[:, None],
+        (q5[:, 0].astype(np.uint64) << 3) | delta.astype(np.uint64),
+        (q4[:, 0].astype(np.uint64) << 4) | q4[:, 1].astype(np.uint64),
+    )  # (n, 3) one byte per channel
+    word = (high[:, 0] << 56) | (high[:, 1] << 48) | (high[:, 2] << 40)
+    word |= (tables[:, 0].astype(np.uint64) << 37) | (tables[:, 1].astype(np.uint64) << 34)
+    word |= (diff64 << 33) | (flip.astype(np.uint64) << 32)
+    # Pixel bits are column-major: pixel (x, y) -> bit x*4 + y; MSBs in the upper half-word
+    k = np.arange(16)
+    position = ((k % 4) * 4 + k // 4).astype(np.uint64)
+    msb = (indices.astype(np.uint64) >> 1) << (position + np.uint64(16))
+    lsb = (indices.astype(np.uint64) & np.uint64(1)) << position
+    word |= msb.sum(axis=1, dtype=np.uint64) | lsb.sum(axis=1, dtype=np.uint64)
+    return word.astype(">u8").tobytes()
+
+def decode_etc1_blocks(data):
+    word = np.frombuffer(data, dtype=">u8").astype(np.uint64)
+    flip = ((word >> np.uint64(32)) & np.uint64(1)).astype(bool)
+    diff = ((word >> np.uint64(33)) & np.uint64(1)).astype(bool)
+    tables = np.stack([(word >> np.uint64(37)) & np.uint64(7), (word >> np.uint64(34)) & np.uint64(7)], axis=1).astype(np.int64)
+    channels = np.stack([(word >> np.uint64(s)) & np.uint64(0xFF) for s in (56, 48, 40)], axis=1).astype(np.int32)
+    q5 = channels >> 3
+    delta = channels & 7
+    delta = np.where(delta >= 4, delta - 8, delta)
+    diff_base = np.stack([expand(q5, 5), expand(q5 + delta, 5)], axis=1)
+    ind_base = np.stack([expand(channels >> 4, 4), expand(channels & 15, 4)], axis=1)
+    base = np.where(diff[:, None, None], diff_base, ind_base)
+    k = np.arange(16)
+    position = ((k % 4) * 4 + k // 4).astype(np.uint64)
+    msb = (word[:, None] >> (position + np.uint64(16))) & np.uint64(1)
+    lsb = (word[:, None] >> position) & np.uint64(1)
+    indices = (msb * np.uint64(2) + lsb).astype(np.int64)
+    mask = np.where(flip[:, None], ETC_SUBBLOCK[1][None, :], ETC_SUBBLOCK[0][None, :])
+    pixel_base = np.where(mask[..., None], base[:, 1:2], base[:, 0:1])
+    pixel_table = np.where(mask, tables[:, 1:2], tables[:, 0:1])
+    modifier = ETC_MODIFIERS[pixel_table, indices]
+    return np.clip(pixel_base + modifier[..., None], 0, 255)
+
+# --- Formats ---
+# vkFormat, bytes per block, KHR_DF color model, DFD samples (bitOffset, bitLength, channelType)
+FORMATS = {
+    "bc1": (132, 8, 128, [(0, 64, 0)]),                 # VK_FORMAT_BC1_RGB_SRGB_BLOCK
+    "bc3": (138, 16, 130, [(0, 64, 15), (64, 64, 0)]),  # VK_FORMAT_BC3_SRGB_BLOCK
+    "etc1": (148, 8, 161, [(0, 64, 2)]),                # VK_FORMAT_ETC2_R8G8B8_SRGB_BLOCK (ETC1 is a subset)
+}
+
+def encode_level(rgba, fmt):
+    blocks = to_blocks(rgba)
+    if fmt == "bc1":
+        return chunked(lambda b: pack_bc1(*encode_bc1_colors(b[..., :3])), blocks)
+    if fmt == "bc3":
+        def bc3(b):
+            return pack_bc3(*encode_alpha(b[..., 3]), *encode_bc1_colors(b[..., :3], always_four=True))
+        return chunked(bc3, blocks)
+    return chunked(lambda b: encode_etc1(b[..., :3]), blocks)
+
+def decode_level(data, fmt, h, w):
+    if fmt == "bc1":
+        rgb = decode_bc1_blocks(data)
+    elif fmt == "bc3":
+        return from_blocks(decode_bc3_blocks(data), h, w)
+    else:
+        rgb = decode_etc1_blocks(data)
+    return from_blocks(np.concatenate([rgb, np.full(rgb.shape[:2] + (1,), 255.0)], axis=2), h, w)
+
+def psnr(a, b, channels):
+    mse = np.mean((a[..., :channels].astype(np.float64) - b[..., :channels].astype(np.float64)) ** 2)
+    return float("inf") if mse == 0 else 10 * np.log10(255.0 ** 2 / mse)
+
+# --- KTX2 ---
+KTX2_IDENTIFIER = b"\xabKTX 20\xbb\r\n\x1a\n"
+
+def data_format_descriptor(fmt):
+    _, block_bytes, model, samples = FORMATS[fmt]
+    block_size = 24 + 16 * len(samples)
+    out = struct.pack("<IHH", 0, 2, block_size)
+    out += struct.pack("<BBBB", model, 1, 2, 0)  # BT.709 primaries, sRGB transfer, straight alpha
+    out += struct.pack("<BBBB", 3, 3, 0, 0)      # 4x4x1 texel block
+    out += struct.pack("<8B", block_bytes, 0, 0, 0, 0, 0, 0, 0)
+    for bit_offset, bit_length, channel in samples:
+        out += struct.pack("<HBB4BII", bit_offset, bit_length - 1, channel, 0, 0, 0, 0, 0, 0xFFFFFFFF)
+    return struct.pack("<I", 4 + len(out)) + out
+
+def key_values(pairs):
+    out = b""
+    for key, value in pairs:
+        entry = key.encode() + b"\0" + value.encode() + b"\0"
+        out += struct.pack("<I", len(entry)) + entry + b"\0" * (-len(entry) % 4)
+    return out
+
+def ktx2_bytes(fmt, width, height, levels):
+    """levels[0] is the full-size level; level data is stored smallest first, as the spec requires."""
+    vk_format, block_bytes, _, _ = FORMATS[fmt]
+    header_size = 12 + 13 * 4 + 2 * 8 + 24 * len(levels)
+    dfd = data_format_descriptor(fmt)
+    kvd = key_values([("KTXorientation", "ru"), ("KTXwriter", "DAMP pipeline/textures/compress.py")])
+    dfd_offset = header_size
+    kvd_offset = dfd_offset + len(dfd)
+    offset = kvd_offset + len(kvd)
+    align = block_bytes  # lcm(block size, 4)
+
+    body = bytearray()
+    index = [None] * len(levels)
+    for level in reversed(range(len(levels))):
+        pad = -(offset + len(body)) % align
+        body += b"\0" * pad
+        index[level] = (offset + len(body), len(levels[level]), len(levels[level]))
+        body += levels[level]
+
+    out = KTX2_IDENTIFIER
+    out += struct.pack("<9I", vk_format, 1, width, height, 0, 0, 1, len(levels), 0)
+    out += struct.pack("<4I2Q", dfd_offset, len(dfd), kvd_offset, len(kvd), 0, 0)
+    for entry in index:
+        out += struct.pack("<3Q", *entry)
+    return out + dfd + kvd + bytes(body)
+
+def read_ktx2_levels(data):
+    """(vkFormat, width, height, [level bytes]) from a KTX2 file, for verification."""
+    if data[:12] != KTX2_IDENTIFIER:
+        raise ValueError("not a KTX2 file")
+    vk_format, _, width, height, _, _, _, level_count, _ = struct.unpack_from("<9I", data, 12)
+    levels = []
+    for level in range(max(level_count, 1)):
+        offset, length, _ = struct.unpack_from("<3Q", data, 80 + 24 * level)
+        levels.append(data[offset:offset + length])
+    return vk_format, width, height, levels
+
+# --- Compression ---
+def compress_texture(png_path, out_dir):
+    """Writes the KTX2 variants for one PNG. Returns its report entry."""
+    rgba = np.asarray(Image.open(png_path).convert("RGBA"))
+    has_alpha = bool((rgba[..., 3] < 255).any())
+    # Bottom row first, as WebGL uploads a flipY PNG
+    chain = mip_chain(np.ascontiguousarray(rgba[::-1]))
+    height, width = rgba.shape[:2]
+    stem = os.path.splitext(os.path.basename(png_path))[0]
+    entry = {"source": os.path.basename(png_path), "width": width, "height": height, "alpha": has_alpha,
+             "levels": len(chain), "rgba8Bytes": sum(level.nbytes for level in chain), "outputs": {}}
+
+    variants = [("s3tc", "bc3" if has_alpha else "bc1")]
+    if not has_alpha:
+        variants.append(("etc", "etc1"))
+    for family, fmt in variants:
+        start = time.perf_counter()
+        with span(f"encode {fmt}", cat="texture", texture=stem, levels=len(chain)):
+            levels = [encode_level(level, fmt) for level in chain]
+            data = ktx2_bytes(fmt, width, height, levels)
+        seconds = time.perf_counter() - start
+        counter(f"{stem}.{family}.ktx2", cat="texture", bytes=len(data))
+        path = os.path.join(out_dir, f"{stem}.{family}.ktx2")
+        with open(path, "wb") as f:
+            f.write(data)
+
+        # Decode what was written, not what was meant to be written
+        _, _, _, written = read_ktx2_levels(data)
+        channels = 4 if fmt == "bc3" else 3
+        level_psnr = [psnr(level, decode_level(blob, fmt, *level.shape[:2]), channels) for level, blob in zip(chain, written)]
+        entry["outputs"][family] = {
+            "file": os.path.basename(path), "format": fmt, "bytes": len(data), "seconds": round(seconds, 3),
+            "psnr": round(level_psnr[0], 2), "psnrMin": round(min(level_psnr), 2),
+        }
+    return entry
+
+def flagged_textures(configs_dir, textures_dir):
+    """PNG names whose components request `"textureFormat": "ktx2"`, resolved to the atlas page when packed."""
+    names = set()
+    layout = load_layout(textures_dir)
+    for config_name in sorted(os.listdir(configs_dir)):
+        if not config_name.endswith("_mapping.json"):
+            continue
+        with open(os.path.join(configs_dir, config_name)) as f:
+            config = json.load(f)
+        for settings in config.get("components", {}).values():
+            if settings.get("textureFormat") != "ktx2":
+                continue
+            entry = atlas_entry(settings, layout)
+            texture = entry["textureId"] if entry else settings.get("textureId")
+            if texture and texture != "None" and not texture.startswith("http"):
+                names.add(texture)
+    return [os.path.join(textures_dir, name) for name in sorted(names)]
+
+# --- Execution ---
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Block-compress textures to KTX2 (BC1/BC3 + ETC1) with mips.")
+    parser.add_argument("textures", nargs="*", help="PNGs to compress (default: every texture flagged in the mapping configs)")
+    parser.add_argument("--textures-dir", default=TEXTURES_DIR)
+    parser.add_argument("--configs", default=CONFIGS_DIR)
+    parser.add_argument("--report", help="Write the PSNR/size report as JSON")
+    args = parser.parse_args()
+
+    paths = args.textures or flagged_textures(args.configs, args.textures_dir)
+    report = {"textures": []}
+    for path in paths:
+        if not os.path.exists(path):
+            print(f"   [KTX2] {os.path.basename(path)} not found, skipped")
+            continue
+        entry = compress_texture(path, os.path.dirname(os.path.abspath(path)))
+        report["textures"].append(entry)
+        for family, out in entry["outputs"].items():
+            print(f"   [KTX2] {out['file']}: {out['format'].upper()}, {entry['levels']} mips, "
+                  f"{out['bytes']} bytes vs {entry['rgba8Bytes']} RGBA8 ({entry['rgba8Bytes'] / out['bytes']:.1f}x), "
+                  f"PSNR {out['psnr']:.2f} dB (min {out['psnrMin']:.2f}), {out['seconds'] * 1000:.0f} ms")
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump(report, f, indent=2)
+    print(f"✅ Compressed {len(report['textures'])} texture(s)")
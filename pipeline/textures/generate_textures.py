@@ -1,33 +1,42 @@
 # /// script
 # dependencies = [
+#   "numpy",
 #   "Pillow",
 # ]
 # ///
 
-import math
+import argparse
 import os
-import random
-from PIL import Image
-
-def generate_tracks_texture(filepath):
-    width, height = 512, 512
-    img = Image.new('RGBA', (width, height), (15, 15, 15, 255)) # Dark grey
-    pixels = img.load()
-
-    # Draw Chevrons/Treads
-    bar_height = 64
-    for y in range(0, height, bar_height):
-        for x in range(width):
-            offset = abs(x - 256) // 8
-            for py in range(y + offset, y + offset + 20):
-                if 0 <= py < height:
-                    pixels[x, py] = (51, 51, 51, 255)
-
-    img.save(filepath)
+import sys
+
+from texture_engine import Chevron, render_image
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts"))
+from tracing import span
+
+# Reference resolution the track pattern was designed at
+BASE_SIZE = 512
+
+def tracks_layers(size):
+    # Bar spacing/thickness scale with resolution; the chevron slope (1px per 8px) does not.
+    s = size / BASE_SIZE
+    return [
+        Chevron((51, 51, 51, 255), period=round(64 * s), thickness=round(20 * s), slope=8, center=size // 2),
+    ]
+
+def generate_tracks_texture(filepath, size=BASE_SIZE):
+    with span("render tracks_texture", cat="texture", size=size):
+        img = render_image(size, size, (15, 15, 15, 255), tracks_layers(size)) # Dark grey
+    with span("save png", cat="texture"):
+        img.save(filepath)
     print(f"   [TEXTURE] Generated {filepath}")
 
 # --- Execution ---
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate procedural textures.")
+    parser.add_argument("--size", type=int, default=BASE_SIZE, help="Track texture resolution (square)")
+    args = parser.parse_args()
+
     tex_dir = os.path.join(os.getcwd(), "assets", "textures")
     os.makedirs(tex_dir, exist_ok=True)
-    generate_tracks_texture(os.path.join(tex_dir, "tracks_texture.png"))
+    generate_tracks_texture(os.path.join(tex_dir, "tracks_texture.png"), size=args.size)
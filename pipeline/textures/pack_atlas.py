@@ -0,0 +1,218 @@
+# /// script
+# dependencies = [
+#   "numpy",
+#   "Pillow",
+# ]
+# ///
+"""
+Texture atlas packer.
+
+Bin-packs every texture referenced by a mapping config (`components.*.textureId`)
+into power-of-two atlas pages (assets/textures/atlas_<n>.png) and records where
+each texture landed in the sidecar assets/textures/atlas.json:
+
+    "textures": {
+        "tracks_texture.png": {"textureId": "atlas_0.png", "rect": [0, 0, 512, 512],
+                               "scale": [0.5, 0.5], "offset": [0.0, 0.5]}
+    }
+
+The mapping configs are only read. A component samples the page when its
+textureId is packed and its uvTransform stays inside the unit square (tiling
+cannot wrap inside an atlas rect); `scale`/`offset` then map the authored UVs
+into the page, and MaterialManager composes the two. atlas_entry() is that
+rule for the other pipeline tools. Rects are separated by gutters of
+edge-extended pixels so bilinear filtering and mips do not bleed; atlas
+borders clamp instead.
+
+    uv run pipeline/textures/pack_atlas.py
+    uv run pipeline/textures/pack_atlas.py --max-size 2048 --padding 8
+"""
+import argparse
+import json
+import math
+import os
+
+import numpy as np
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+TEXTURES_DIR = os.path.join(ROOT_DIR, "assets", "textures")
+CONFIGS_DIR = os.path.join(ROOT_DIR, "assets", "configs")
+ATLAS_PREFIX = "atlas_"
+LAYOUT_NAME = "atlas.json"
+
+# --- UV transforms ---
+def uv_matrix(uv):
+    """The 3x3 matrix three.js builds from a uvTransform (Texture.repeat/offset/rotation about center 0.5)."""
+    scale = uv.get("scale", 1.0)
+    sx, sy = (scale, scale) if not isinstance(scale, (list, tuple)) else scale
+    ox, oy = uv.get("offset", [0.0, 0.0])
+    rotation = uv.get("rotation", 0.0)
+    c, s = math.cos(rotation), math.sin(rotation)
+    cx = cy = 0.5
+    return np.array([
+        [sx * c, sx * s, -sx * (c * cx + s * cy) + cx + ox],
+        [-sy * s, sy * c, -sy * (-s * cx + c * cy) + cy + oy],
+        [0.0, 0.0, 1.0],
+    ])
+
+def stays_in_unit_square(uv, eps=1e-6):
+    corners = np.array([[0, 0, 1], [1, 0, 1], [0, 1, 1], [1, 1, 1]], dtype=np.float64).T
+    mapped = uv_matrix(uv) @ corners
+    return bool(np.all(mapped[:2] >= -eps) and np.all(mapped[:2] <= 1 + eps))
+
+def is_local(texture_id):
+    return bool(texture_id) and texture_id != "None" and not texture_id.startswith("http") and not texture_id.startswith(ATLAS_PREFIX)
+
+def load_layout(textures_dir):
+    """The sidecar written by build_atlas, or an empty layout before the first packing."""
+    path = os.path.join(textures_dir, LAYOUT_NAME)
+    if not os.path.exists(path):
+        return {"pages": [], "textures": {}}
+    with open(path) as f:
+        return json.load(f)
+
+def atlas_entry(settings, layout):
+    """Where a component's texture sits in the atlas, or None when it loads the standalone texture."""
+    entry = layout.get("textures", {}).get(settings.get("textureId"))
+    if entry and stays_in_unit_square(settings.get("uvTransform", {})):
+        return entry
+    return None
+
+# --- Packing ---
+def shelf_pack(sizes, page_size, padding):
+    """Places (w, h) rects on shelves, tallest first. Returns {index: (x, y)} and the indices that did not fit."""
+    order = sorted(range(len(sizes)), key=lambda i: (-sizes[i][1], -sizes[i][0], i))
+    placed, rejected = {}, []
+    x = y = shelf = 0
+    for i in order:
+        w, h = sizes[i]
+        # Gutters only between rects: the page border clamps instead
+        if x and x + padding * 2 + w > page_size:
+            x, y, shelf = 0, y + shelf + padding * 2, 0
+        left = x + (padding * 2 if x else 0)
+        top = y
+        if left + w > page_size or top + h > page_size:
+            rejected.append(i)
+            continue
+        placed[i] = (left, top)
+        x = left + w
+        shelf = max(shelf, h)
+    return placed, rejected
+
+def pack_pages(sizes, max_size, padding):
+    """Fills pages of at most max_size; each page shrinks to the smallest power of two that still fits."""
+    pages = []
+    remaining = [i for i, (w, h) in enumerate(sizes) if w <= max_size and h <= max_size]
+    while remaining:
+        subset = [sizes[i] for i in remaining]
+        placed, rejected = shelf_pack(subset, max_size, padding)
+        if not placed:
+            break
+        fitted = [remaining[i] for i in sorted(placed)]
+        size = max_size
+        while size > 1:
+            _, rest = shelf_pack([sizes[i] for i in fitted], size // 2, padding)
+            if rest:
+                break
+            size //= 2
+        final, _ = shelf_pack([sizes[i] for i in fitted], size, padding)
+        pages.append((size, {fitted[k]: pos for k, pos in final.items()}))
+        remaining = [remaining[i] for i in rejected]
+    return pages
+
+def blit_with_gutter(page, image, x, y, padding):
+    """Copies `image` into `page` at (x, y) and extends its edge pixels `padding` px outward."""
+    h, w = image.shape[:2]
+    size = page.shape[0]
+    page[y:y + h, x:x + w] = image
+    x0, x1 = max(0, x - padding), min(size, x + w + padding)
+    y0, y1 = max(0, y - padding), min(size, y + h + padding)
+    rows = np.clip(np.arange(y0, y1) - y, 0, h - 1)
+    cols = np.clip(np.arange(x0, x1) - x, 0, w - 1)
+    page[y0:y1, x0:x1] = image[rows[:, None], cols[None, :]]
+
+# --- Configs ---
+def load_configs(configs_dir):
+    configs = {}
+    for name in sorted(os.listdir(configs_dir)):
+        if name.endswith("_mapping.json"):
+            with open(os.path.join(configs_dir, name)) as f:
+                configs[name] = json.load(f)
+    return configs
+
+def build_atlas(textures_dir, configs_dir, max_size=2048, padding=8, dry_run=False):
+    # Only packing needs Pillow; verify_glb.py imports atlas_entry without it
+    from PIL import Image
+
+    configs = load_configs(configs_dir)
+
+    # --- Collect the textures that can live in an atlas ---
+    users = set()
+    for config_name, config in configs.items():
+        for damp_id, settings in config.get("components", {}).items():
+            texture = settings.get("textureId")
+            if not is_local(texture):
+                continue
+            if not stays_in_unit_square(settings.get("uvTransform", {})):
+                print(f"   [ATLAS] {config_name}:{damp_id} tiles '{texture}', keeping the standalone texture")
+                continue
+            users.add(texture)
+
+    names = [t for t in sorted(users) if os.path.exists(os.path.join(textures_dir, t))]
+    for missing in sorted(set(users) - set(names)):
+        print(f"   [ATLAS] '{missing}' not found in {os.path.relpath(textures_dir, ROOT_DIR)}, skipped")
+    images = [np.asarray(Image.open(os.path.join(textures_dir, n)).convert("RGBA")) for n in names]
+    sizes = [(img.shape[1], img.shape[0]) for img in images]
+    for name, (w, h) in zip(names, sizes):
+        if w > max_size or h > max_size:
+            print(f"   [ATLAS] '{name}' ({w}x{h}) is larger than the {max_size}px page, skipped")
+
+    # --- Pack and write pages ---
+    layout = {"maxSize": max_size, "padding": padding, "pages": [], "textures": {}}
+    for page_index, (size, placed) in enumerate(pack_pages(sizes, max_size, padding)):
+        page_name = f"{ATLAS_PREFIX}{page_index}.png"
+        page = np.zeros((size, size, 4), dtype=np.uint8)
+        for i, (x, y) in sorted(placed.items()):
+            blit_with_gutter(page, images[i], x, y, padding)
+            w, h = sizes[i]
+            # Texture UV v runs bottom-up (flipY), image rows top-down
+            entry = {
+                "textureId": page_name,
+                "rect": [x, y, w, h],
+                "scale": [w / size, h / size],
+                "offset": [x / size, 1.0 - (y + h) / size],
+            }
+            layout["textures"][names[i]] = entry
+        layout["pages"].append({"textureId": page_name, "size": size, "textures": [names[i] for i in sorted(placed)]})
+        used = sum(sizes[i][0] * sizes[i][1] for i in placed)
+        print(f"   [ATLAS] {page_name}: {size}x{size}, {len(placed)} texture(s), {used / (size * size):.0%} used")
+        if not dry_run:
+            Image.fromarray(page, "RGBA").save(os.path.join(textures_dir, page_name), optimize=True)
+
+    if dry_run:
+        return layout
+
+    # Drop pages left over from a previous, larger packing
+    current = {p["textureId"] for p in layout["pages"]}
+    for name in os.listdir(textures_dir):
+        if name.startswith(ATLAS_PREFIX) and name.endswith(".png") and name not in current:
+            os.remove(os.path.join(textures_dir, name))
+    with open(os.path.join(textures_dir, LAYOUT_NAME), "w") as f:
+        json.dump(layout, f, indent=2)
+    return layout
+
+# --- Execution ---
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pack mapped textures into power-of-two atlases.")
+    parser.add_argument("--textures", default=TEXTURES_DIR, help="Texture directory (atlas pages are written here)")
+    parser.add_argument("--configs", default=CONFIGS_DIR, help="Mapping config directory")
+    parser.add_argument("--max-size", type=int, default=2048, help="Largest atlas page (power of two)")
+    parser.add_argument("--padding", type=int, default=8, help="Gutter pixels around each rect (per side)")
+    parser.add_argument("--dry-run", action="store_true", help="Report the packing without writing anything")
+    args = parser.parse_args()
+
+    if args.max_size & (args.max_size - 1):
+        parser.error("--max-size must be a power of two")
+    os.makedirs(args.textures, exist_ok=True)
+    layout = build_atlas(args.textures, args.configs, args.max_size, args.padding, args.dry_run)
+    print(f"✅ Packed {len(layout['textures'])} texture(s) into {len(layout['pages'])} atlas page(s)")
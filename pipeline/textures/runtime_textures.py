@@ -0,0 +1,190 @@
+# /// script
+# dependencies = [
+#   "numpy",
+#   "Pillow",
+# ]
+# ///
+"""
+Prebaked runtime textures.
+
+src/core/graphics.js used to draw these on 2D canvases at startup: the ground
+dirt (createDirtTexture), the tyre marks (createTrackTexture) and one label per
+shop pad and cost (getPadTexture). This script draws the same images offline,
+seeded so the output only changes when the script does:
+
+- runtime_dirt.png:   512x512 base colour with 20000 shaded specks,
+- runtime_track.png:  64x64 translucent treads,
+- runtime_pad_*.png:  512x256 pad labels for every title/cost the shop can
+                      show up to --levels upgrades (Unlock Gate: all three).
+
+assets/textures/runtime_textures.json maps them to the keys graphics.js uses
+(`${title}-${cost}`); loadRuntimeTextures() fetches it and anything missing
+from it is still drawn on a canvas.
+
+    uv run pipeline/textures/runtime_textures.py
+    uv run pipeline/textures/runtime_textures.py --levels 30 --seed 2
+"""
+import argparse
+import json
+import math
+import os
+import re
+import sys
+import time
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.append(os.path.join(ROOT_DIR, "pipeline", "scripts"))
+from tracing import counter, span
+
+TEXTURES_DIR = os.path.join(ROOT_DIR, "assets", "textures")
+INDEX_NAME = "runtime_textures.json"
+PREFIX = "runtime_"
+FORMAT_VERSION = 1
+
+# Mirrors createShopPads() and handleShopInteraction() in src/entities/shop.js
+PADS = [
+    {"title": "Upgrade Engine", "base": 100},
+    {"title": "Upgrade Plow", "base": 100},
+    {"title": "Upgrade Collector", "base": 150},
+]
+GATE = {"title": "Unlock Gate", "costs": [500, 2500, None]}  # None: max level ("MAX")
+
+# Stands in for the canvas's "bold 40px Arial"; vendored so every machine bakes the same pixels
+FONT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fonts", "DejaVuSans-Bold.ttf")
+SUPERSAMPLE = 4
+
+# --- Compositing ---
+def source_over(canvas, color, alpha):
+    """Canvas 2D source-over of `color` (RGB 0-255) at per-pixel `alpha` onto a float RGBA canvas (straight alpha)."""
+    dst_a = canvas[..., 3:]
+    a = np.asarray(alpha, dtype=np.float64)[..., None]
+    out_a = a + dst_a * (1 - a)
+    rgb = np.asarray(color, dtype=np.float64) * a + canvas[..., :3] * dst_a * (1 - a)
+    canvas[..., :3] = np.divide(rgb, out_a, out=np.zeros_like(rgb), where=out_a > 0)
+    canvas[..., 3:] = out_a
+
+def to_image(canvas):
+    rgba = np.concatenate([canvas[..., :3], canvas[..., 3:] * 255], axis=-1)
+    return Image.fromarray(np.clip(np.rint(rgba), 0, 255).astype(np.uint8), "RGBA")
+
+def span_coverage(start, size, limit):
+    """First pixel and fractional coverage of each pixel the span [start, start + size) touches."""
+    first = max(int(math.floor(start)), 0)
+    last = min(int(math.ceil(start + size)), limit)
+    pixels = np.arange(first, last)
+    return first, np.clip(np.minimum(start + size, pixels + 1) - np.maximum(start, pixels), 0.0, 1.0)
+
+# --- Textures ---
+def dirt_texture(seed, size=512, specks=20000):
+    rng = np.random.default_rng(seed)
+    canvas = np.zeros((size, size, 4))
+    canvas[...] = (0xaa, 0x8c, 0x66, 1.0)
+    # Same draws as createDirtTexture: position, size in [1, 3), shade in [-20, 20)
+    xs, ys = rng.random(specks) * size, rng.random(specks) * size
+    sizes = rng.random(specks) * 2 + 1
+    shades = rng.random(specks) * 40 - 20
+    colors = np.rint(np.clip(np.array([170, 140, 102])[None, :] + shades[:, None], 0, 255))
+    rgb = canvas[..., :3]
+    for x, y, s, color in zip(xs, ys, sizes, colors):
+        # Fractional rectangles are anti-aliased by area, like fillRect; drawn in order, so later specks win
+        x0, cx = span_coverage(x, s, size)
+        y0, cy = span_coverage(y, s, size)
+        a = (cy[:, None] * cx[None, :])[..., None]
+        block = rgb[y0:y0 + len(cy), x0:x0 + len(cx)]
+        block[...] = block * (1 - a) + color * a
+    return to_image(canvas)
+
+def track_texture(size=64):
+    canvas = np.zeros((size, size, 4))
+    treads = np.zeros((size, size), dtype=bool)
+    for y in range(0, size, 8):
+        treads[y:y + 4, 4:20] = True   # Left tread
+        treads[y:y + 4, 44:60] = True  # Right tread
+    source_over(canvas, (0, 0, 0), treads * 0.2)
+    source_over(canvas, (25, 20, 15), np.full((size, size), 0.2))
+    return to_image(canvas)
+
+def pad_texture(title, cost, fonts):
+    """The getPadTexture panel, drawn SUPERSAMPLE times larger and box-filtered down for anti-aliasing."""
+    k = SUPERSAMPLE
+    img = Image.new("RGBA", (512 * k, 256 * k), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(img)
+    # roundRect(10, 10, 492, 236, 20) stroked 10 px wide: the stroke straddles the path
+    draw.rounded_rectangle((5 * k, 5 * k, 507 * k - 1, 251 * k - 1), radius=25 * k, fill=(0xf3, 0x9c, 0x12, 255))
+    draw.rounded_rectangle((15 * k, 15 * k, 497 * k - 1, 241 * k - 1), radius=15 * k, fill=(0, 0, 0, round(0.7 * 255)))
+    # textAlign center, alphabetic baseline
+    draw.text((256 * k, 80 * k), title, font=fonts["title"], fill=(255, 255, 255, 255), anchor="ms")
+    cost_text = "MAX" if cost is None else f"${cost}"
+    draw.text((256 * k, 180 * k), cost_text, font=fonts["cost"], fill=(0xf1, 0xc4, 0x0f, 255), anchor="ms")
+    return img.resize((512, 256), Image.BOX)
+
+def pad_labels(levels):
+    """(title, cost, level) for every label the shop pads can show up to `levels` upgrades."""
+    labels = []
+    for pad in PADS:
+        for level in range(1, levels + 1):
+            # costs.<type> starts at base, then Math.floor(base * 1.3 ** level) after each purchase
+            cost = pad["base"] if level == 1 else math.floor(pad["base"] * math.pow(1.3, level))
+            labels.append((pad["title"], cost, level))
+    for level, cost in enumerate(GATE["costs"], start=1):
+        labels.append((GATE["title"], cost, level))
+    return labels
+
+def pad_key(title, cost):
+    """The padTextures cache key in graphics.js (`${title}-${cost}`, with JS's "null")."""
+    return f"{title}-{'null' if cost is None else cost}"
+
+def pad_file(title, cost):
+    slug = re.sub(r"[^a-z0-9]+", "_", title.lower()).strip("_")
+    return f"{PREFIX}pad_{slug}_{'max' if cost is None else cost}.png"
+
+# --- Output ---
+def build_textures(out_dir, seed, levels):
+    os.makedirs(out_dir, exist_ok=True)
+    start = time.perf_counter()
+    fonts = {"title": ImageFont.truetype(FONT_PATH, 40 * SUPERSAMPLE), "cost": ImageFont.truetype(FONT_PATH, 80 * SUPERSAMPLE)}
+    index = {"format": FORMAT_VERSION, "seed": seed, "font": os.path.basename(FONT_PATH), "textures": {}, "pads": {}}
+    written = set()
+
+    def save(img, name):
+        img.save(os.path.join(out_dir, name), optimize=True)
+        written.add(name)
+        return name
+
+    with span("dirt", cat="texture"):
+        index["textures"]["dirt"] = save(dirt_texture(seed), f"{PREFIX}dirt.png")
+    with span("track", cat="texture"):
+        index["textures"]["track"] = save(track_texture(), f"{PREFIX}track.png")
+    with span("pad labels", cat="texture", levels=levels):
+        for title, cost, level in pad_labels(levels):
+            name = save(pad_texture(title, cost, fonts), pad_file(title, cost))
+            index["pads"][pad_key(title, cost)] = {"file": name, "level": level}
+
+    # Drop pads of an earlier run that the index no longer references
+    for name in os.listdir(out_dir):
+        if name.startswith(PREFIX) and name.endswith(".png") and name not in written:
+            os.remove(os.path.join(out_dir, name))
+    with open(os.path.join(out_dir, INDEX_NAME), "w") as f:
+        json.dump(index, f, indent=2)
+
+    size = sum(os.path.getsize(os.path.join(out_dir, name)) for name in written)
+    counter("runtime textures", cat="texture", files=len(written), bytes=size)
+    print(f"   [RUNTIME] {len(written)} textures ({len(index['pads'])} pad labels, font {index['font']}), "
+          f"{size / 1024:.0f} KB in {time.perf_counter() - start:.1f} s")
+    return index
+
+def main():
+    parser = argparse.ArgumentParser(description="Bake the textures graphics.js used to draw on canvases at startup.")
+    parser.add_argument("--out", default=TEXTURES_DIR, help="Output directory")
+    parser.add_argument("--seed", type=int, default=1, help="Dirt speck seed")
+    parser.add_argument("--levels", type=int, default=20, help="Upgrade levels to bake pad labels for")
+    args = parser.parse_args()
+
+    build_textures(args.out, args.seed, args.levels)
+    print(f"✅ Runtime textures written to {os.path.relpath(os.path.join(args.out, INDEX_NAME), ROOT_DIR)}")
+
+if __name__ == "__main__":
+    main()
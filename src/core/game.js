@@ -1,10 +1,10 @@
 import { engine, runner, Runner, Events, Body, Matter } from './physics.js';
-import { initThree, updateGraphics, scene, camera, renderer, bodyMeshMap } from './graphics.js';
+import { initThree, updateGraphics, scene, camera, renderer, bodyMeshMap, loadRuntimeTextures } from './graphics.js';
 import * as THREE from 'three'; 
 import { createMap } from '../entities/map.js';
-import { createBulldozer, getBulldozer } from '../entities/bulldozer.js';
+import { createBulldozer, getBulldozer, loadFootprints } from '../entities/bulldozer.js';
 import { createCollector } from '../entities/collector.js';
-import { initGems, collectGem } from '../entities/gem.js';
+import { initGems, collectGem, loadGemLayouts } from '../entities/gem.js';
 import { updateUI, initUI, showNotification, updateSpeedometer } from './ui.js';
 import { createShopPads, checkShopCollisions } from '../entities/shop.js';
 import { initInput } from './input.js';
@@ -12,6 +12,8 @@ import { initConsole } from './console.js';
 import { BulldozerRenderer } from '../entities/bulldozer_render.js';
 import { initConveyorSystem } from '../entities/conveyor.js';
 import { state } from './state.js';
+import { perfHook, frameSync } from './perf.js';
+import { loadAssetManifest } from '../utils/graphics-utils.js';
 
 // Expose updateUI and showNotification
 window.updateUI = updateUI;
@@ -27,24 +29,61 @@ Events.on(engine, 'afterUpdate', () => {
     checkShopCollisions(getBulldozer());
 });
 
-// Start
+// `?gems=N` spreads N gems over the three zones (render/physics scaling benchmarks);
+// `?gemLayout=random` skips the precomputed layouts (verification/bench_settle.py);
+// `?colliders=boxes` keeps the hand-built dozer boxes instead of the model footprints;
+// `?textures=canvas` draws the dirt, track and pad textures at startup (verification/bench_startup.py);
+// `?parts=off` loads the single-file models instead of streaming their split parts (verification/bench_progressive.py)
+const params = new URLSearchParams(window.location.search);
+
+// Start: hashed asset URLs first (dist builds only), every loader below resolves through them
+await loadAssetManifest();
+if (params.get('textures') !== 'canvas') await loadRuntimeTextures();
+const initStart = performance.now();
 initThree();
+perfHook.startup.initThreeMs = performance.now() - initStart;
 
 // Initialize custom renderers
 let bulldozerRenderer = new BulldozerRenderer(scene);
+// Settles (loaded or failed) once body and plow are in; gates frameSync
+let assetsReady = false;
+let assetLoads = 0;
 loadBulldozerAssets();
 
 function loadBulldozerAssets() {
-    bulldozerRenderer.load('assets/models/bulldozer_components.glb', 'assets/configs/bulldozer_mapping.json')
+    const load = ++assetLoads;
+    assetsReady = false;
+    const loading = params.get('parts') === 'off' ? loadSingleFiles() : streamParts();
+    loading
     .then(() => {
-        return bulldozerRenderer.loadPlow('assets/models/plow.glb', 'assets/configs/plow_mapping.json');
+        if (load === assetLoads) perfHook.startup.dozerCompleteMs = performance.now();
     })
     .catch(err => {
         const msg = (err && err.message) ? err.message : err;
         console.warn('Failed to load bulldozer assets:', msg);
+    })
+    .finally(() => {
+        if (load === assetLoads) assetsReady = true;
+    });
+}
+
+function loadSingleFiles() {
+    return bulldozerRenderer.load('assets/models/bulldozer_components.glb', 'assets/configs/bulldozer_mapping.json')
+    .then(() => {
+        return bulldozerRenderer.loadPlow('assets/models/plow.glb', 'assets/configs/plow_mapping.json');
     });
 }
 
+// Chassis, tracks and blade first, then the cabin, wings and teeth (priorities from the mapping configs)
+async function streamParts() {
+    const dozer = await bulldozerRenderer.loadParts('assets/models/parts/bulldozer_components.parts.json',
+        'assets/configs/bulldozer_mapping.json', 'assets/models/bulldozer_components.glb');
+    const plow = await bulldozerRenderer.loadParts('assets/models/parts/plow.parts.json',
+        'assets/configs/plow_mapping.json', 'assets/models/plow.glb');
+    await dozer.loadRest();
+    await plow.loadRest();
+}
+
 export function rebuildBulldozerRenderer() {
     if (bulldozerRenderer) {
         bulldozerRenderer.destroy();
@@ -53,17 +92,31 @@ export function rebuildBulldozerRenderer() {
     loadBulldozerAssets();
 }
 
+if (params.get('colliders') !== 'boxes') await loadFootprints();
+
 createMap();
 createBulldozer();
 createCollector();
 createShopPads(); 
-initGems();
+const gemParam = Number(params.get('gems'));
+const gemLayouts = params.get('gemLayout') === 'random' ? null : await loadGemLayouts();
+initGems(gemParam > 0 ? Math.ceil(gemParam / 3) : undefined, gemLayouts);
 
 initUI(); 
 updateUI();
 initInput(); 
 window.state = state; 
 
+// Verification hook: apply a state patch the way the shop does, resolving once it is on screen
+window.applyStateAndRender = (patch = {}, frames = 1) => {
+    const dozerChanged = 'dozerLevel' in patch && patch.dozerLevel !== state.dozerLevel;
+    Object.assign(state, patch);
+    if ('dozerLevel' in patch || 'plowLevel' in patch) createBulldozer();
+    if (dozerChanged) rebuildBulldozerRenderer();
+    updateUI();
+    return frameSync.request(frames);
+};
+
 // Performance Monitoring
 let frameCount = 0;
 let lastFpsTime = performance.now();
@@ -130,15 +183,31 @@ function animate(currentTime = performance.now()) {
     accumulator += Math.min(frameTime, 100); 
 
     // Consume accumulator in fixed chunks
+    const physicsStart = performance.now();
+    let physicsSteps = 0;
     while (accumulator >= timeStep) {
         Matter.Engine.update(engine, timeStep);
         accumulator -= timeStep;
+        physicsSteps++;
     }
 
     const alpha = accumulator / timeStep;
     const dozer = getBulldozer();
     
+    const graphicsStart = performance.now();
     updateGraphics(dozer, bulldozerRenderer, alpha);
+    if (perfHook.startup.firstFrameMs === null) {
+        // First frame uploads every texture created so far
+        perfHook.startup.firstFrameMs = performance.now();
+        perfHook.startup.firstRenderMs = perfHook.startup.firstFrameMs - graphicsStart;
+    }
+    if (perfHook.startup.firstDozerFrameMs === null && bulldozerRenderer.isLoaded) {
+        perfHook.startup.firstDozerFrameMs = performance.now();
+    }
+    if (perfHook.active) {
+        perfHook.record(frameTime, graphicsStart - physicsStart, physicsSteps, performance.now() - graphicsStart, renderer.info);
+    }
+    frameSync.rendered(assetsReady);
 
     if (dozer) {
         updateSpeedometer(dozer.speed);
@@ -3,6 +3,7 @@ import { RoomEnvironment } from 'three/examples/jsm/environments/RoomEnvironment
 import { world } from './physics.js';
 import { state } from './state.js';
 import { getShopPads } from '../entities/shop.js';
+import { assetUrl } from '../utils/graphics-utils.js';
 
 export let scene, camera, renderer;
 export const bodyMeshMap = new Map();
@@ -13,7 +14,36 @@ let dirtTexture;
 let lastDozerPos = null;
 const gemInstancedMeshes = {}; // Map of colorHex -> InstancedMesh
 const dummy = new THREE.Object3D();
-const MAX_GEMS_PER_TYPE = 1000;
+const GEM_CAPACITY = 1000; // Initial instances per gem type; grown on demand
+// Prebaked textures (pipeline/textures/runtime_textures.py): the index plus its directory, or null to draw on canvases
+let runtimeTextures = null;
+const textureLoader = new THREE.TextureLoader();
+
+// Fetches the baked dirt and track textures and the pad labels shown at startup, so initThree() only
+// wraps them. Resolves to true when they loaded; anything not in the index is drawn on a canvas as before.
+export async function loadRuntimeTextures(indexUrl = 'assets/textures/runtime_textures.json') {
+  try {
+    const res = await fetch(assetUrl(indexUrl));
+    if (!res.ok) return false;
+    const index = await res.json();
+    const dir = indexUrl.slice(0, indexUrl.lastIndexOf('/') + 1);
+    const load = file => textureLoader.loadAsync(assetUrl(dir + file));
+    const startPads = Object.entries(index.pads).filter(([, pad]) => pad.level === 1);
+    const [dirt, track, ...pads] = await Promise.all([
+      load(index.textures.dirt),
+      load(index.textures.track),
+      ...startPads.map(([, pad]) => load(pad.file))
+    ]);
+    startPads.forEach(([key], i) => padTextures.set(key, pads[i]));
+    dirtTexture = dirt;
+    trackTexture = track;
+    runtimeTextures = { index, dir };
+    return true;
+  } catch (err) {
+    console.warn('Runtime textures unavailable, drawing them at startup:', err.message || err);
+    return false;
+  }
+}
 
 export function initThree() {
   scene = new THREE.Scene();
@@ -57,8 +87,13 @@ export function initThree() {
   dirLight.shadow.camera.bottom = -d;
   scene.add(dirLight);
 
-  createDirtTexture();
-  createTrackTexture();
+  if (runtimeTextures) {
+    configureDirtTexture();
+    configureTrackTexture();
+  } else {
+    createDirtTexture();
+    createTrackTexture();
+  }
 
   // Ground
   const planeGeo = new THREE.PlaneGeometry(10000, 10000);
@@ -91,18 +126,36 @@ export function initThree() {
   ];
 
   mappings.forEach(({ color, geo }) => {
-    const mesh = new THREE.InstancedMesh(geo, new THREE.MeshStandardMaterial({ ...gemMatBase, color: new THREE.Color(color) }), MAX_GEMS_PER_TYPE);
-    mesh.instanceMatrix.setUsage(THREE.DynamicDrawUsage);
-    mesh.castShadow = true;
-    mesh.receiveShadow = true;
-    // Critical Fix: Disable frustum culling because the bounding sphere is not automatically updated
-    // for dynamic instances, causing gems to disappear when far from origin.
-    mesh.frustumCulled = false; 
-    scene.add(mesh);
-    gemInstancedMeshes[color] = mesh;
+    const material = new THREE.MeshStandardMaterial({ ...gemMatBase, color: new THREE.Color(color) });
+    gemInstancedMeshes[color] = createGemMesh(geo, material, GEM_CAPACITY);
   });
 }
 
+function createGemMesh(geo, material, capacity) {
+  const mesh = new THREE.InstancedMesh(geo, material, capacity);
+  mesh.instanceMatrix.setUsage(THREE.DynamicDrawUsage);
+  mesh.castShadow = true;
+  mesh.receiveShadow = true;
+  // Critical Fix: Disable frustum culling because the bounding sphere is not automatically updated
+  // for dynamic instances, causing gems to disappear when far from origin.
+  mesh.frustumCulled = false; 
+  scene.add(mesh);
+  return mesh;
+}
+
+// Instance buffers cannot be resized: swap in a larger mesh, keeping the matrices written so far
+function growGemMesh(color, needed) {
+  const old = gemInstancedMeshes[color];
+  let capacity = old.instanceMatrix.count;
+  while (capacity < needed) capacity *= 2;
+  const mesh = createGemMesh(old.geometry, old.material, capacity);
+  mesh.instanceMatrix.array.set(old.instanceMatrix.array);
+  scene.remove(old);
+  old.dispose();
+  gemInstancedMeshes[color] = mesh;
+  return mesh;
+}
+
 // Map to store textures for pads to avoid recreation if text doesn't change
 const padTextures = new Map();
 
@@ -111,6 +164,14 @@ function getPadTexture(title, cost) {
   const key = `${title}-${cost}`;
   if (padTextures.has(key)) return padTextures.get(key);
 
+  const baked = runtimeTextures?.index.pads[key];
+  if (baked) {
+    // Fills in once loaded (a frame or two after an upgrade)
+    const texture = textureLoader.load(assetUrl(runtimeTextures.dir + baked.file));
+    padTextures.set(key, texture);
+    return texture;
+  }
+
   const canvas = document.createElement('canvas');
   canvas.width = 512;
   canvas.height = 256;
@@ -175,6 +236,10 @@ function createDirtTexture() {
   }
 
   dirtTexture = new THREE.CanvasTexture(canvas);
+  configureDirtTexture();
+}
+
+function configureDirtTexture() {
   dirtTexture.wrapS = THREE.RepeatWrapping;
   dirtTexture.wrapT = THREE.RepeatWrapping;
   dirtTexture.repeat.set(50, 50); // Repeat across the large plane
@@ -204,6 +269,10 @@ function createTrackTexture() {
   ctx.fillRect(0, 0, 64, 64);
 
   trackTexture = new THREE.CanvasTexture(canvas);
+  configureTrackTexture();
+}
+
+function configureTrackTexture() {
   trackTexture.magFilter = THREE.NearestFilter;
   trackTexture.wrapS = THREE.RepeatWrapping;
   trackTexture.wrapT = THREE.RepeatWrapping;
@@ -768,6 +837,7 @@ export function updateGraphics(bulldozer, bulldozerRenderer, alpha = 1.0) {
 
         bulldozerRenderer.setSpeeds(speed, speed);
         bulldozerRenderer.update(1 / 60);
+        bulldozerRenderer.updateLOD(camera);
       }
     }
 
@@ -783,7 +853,7 @@ export function updateGraphics(bulldozer, bulldozerRenderer, alpha = 1.0) {
         const index = typeIndices[color];
         const mesh = gemInstancedMeshes[color];
 
-        if (mesh && index < MAX_GEMS_PER_TYPE) {
+        if (mesh) {
             // Interpolate gems too
             const pX = part.positionPrev.x + (part.position.x - part.positionPrev.x) * alpha;
             const pY = part.positionPrev.y + (part.position.y - part.positionPrev.y) * alpha;
@@ -796,7 +866,8 @@ export function updateGraphics(bulldozer, bulldozerRenderer, alpha = 1.0) {
             dummy.scale.setScalar(r);
             dummy.updateMatrix();
 
-            mesh.setMatrixAt(index, dummy.matrix);
+            // Past capacity the gem is only counted; the mesh grows after this pass
+            if (index < mesh.instanceMatrix.count) mesh.setMatrixAt(index, dummy.matrix);
             typeIndices[color]++;
         }
         return;
@@ -920,9 +991,10 @@ export function updateGraphics(bulldozer, bulldozerRenderer, alpha = 1.0) {
 
   // Update all gem types
   Object.keys(gemInstancedMeshes).forEach(color => {
-    const mesh = gemInstancedMeshes[color];
     const count = typeIndices[color];
-    mesh.count = count;
+    const filled = Math.min(count, gemInstancedMeshes[color].instanceMatrix.count);
+    const mesh = count > filled ? growGemMesh(color, count) : gemInstancedMeshes[color];
+    mesh.count = filled;
     if (count > 0) {
       mesh.instanceMatrix.needsUpdate = true;
     }
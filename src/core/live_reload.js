@@ -0,0 +1,15 @@
+// Live reload for pipeline/scripts/dev_server.py: reloads the page once the watcher has rebuilt an asset.
+// Other servers (http-server, GitHub Pages, the verification servers) answer /__live with a 404, which
+// closes the EventSource for good, so this is inert outside the dev server.
+if (['localhost', '127.0.0.1', '[::1]'].includes(window.location.hostname)) {
+    const events = new EventSource('/__live');
+    events.addEventListener('rebuilt', (e) => {
+        const { stages, files } = JSON.parse(e.data);
+        console.log(`[LIVE] Rebuilt ${stages.join(', ')} (${files.length} file(s)), reloading`);
+        window.location.reload();
+    });
+    events.addEventListener('failed', (e) => {
+        const { stages, error } = JSON.parse(e.data);
+        console.warn(`[LIVE] Rebuilding ${stages.join(', ')} failed: ${error}`);
+    });
+}
@@ -1,10 +1,63 @@
 import * as THREE from 'three';
 import { cb } from '../utils/graphics-utils.js';
 
+// KTX2 variants written by pipeline/textures/compress.py, in order of preference
+const KTX2_FAMILIES = [
+    { family: 's3tc', extensions: ['WEBGL_compressed_texture_s3tc', 'WEBGL_compressed_texture_s3tc_srgb'] },
+    { family: 'etc', extensions: ['WEBGL_compressed_texture_etc'] }
+];
+const KTX2_VK_FORMATS = {
+    132: THREE.RGB_S3TC_DXT1_Format,  // VK_FORMAT_BC1_RGB_SRGB_BLOCK
+    138: THREE.RGBA_S3TC_DXT5_Format, // VK_FORMAT_BC3_SRGB_BLOCK
+    148: THREE.RGB_ETC2_Format        // VK_FORMAT_ETC2_R8G8B8_SRGB_BLOCK
+};
+
+let ktx2Families = null;
+const supportedKTX2Families = () => {
+    if (!ktx2Families) {
+        // Extension support is per device, so a throwaway context answers for the game's renderer too
+        const gl = document.createElement('canvas').getContext('webgl2');
+        ktx2Families = gl ? KTX2_FAMILIES.filter(f => f.extensions.every(ext => gl.getExtension(ext))).map(f => f.family) : [];
+        gl?.getExtension('WEBGL_lose_context')?.loseContext();
+    }
+    return ktx2Families;
+};
+
+const parseKTX2 = (buffer) => {
+    const view = new DataView(buffer);
+    const vkFormat = view.getUint32(12, true);
+    const width = view.getUint32(20, true);
+    const height = view.getUint32(24, true);
+    const levelCount = Math.max(1, view.getUint32(40, true));
+    const mipmaps = [];
+    for (let i = 0; i < levelCount; i++) {
+        const offset = Number(view.getBigUint64(80 + i * 24, true));
+        const length = Number(view.getBigUint64(88 + i * 24, true));
+        mipmaps.push({ data: new Uint8Array(buffer, offset, length), width: Math.max(1, width >> i), height: Math.max(1, height >> i) });
+    }
+    return { vkFormat, width, height, mipmaps };
+};
+
+// Whether a uvTransform maps the unit square into itself (as pipeline/textures/pack_atlas.py checks):
+// a tiling transform cannot wrap inside an atlas rect
+const staysInUnitSquare = (uv = {}) => {
+    const scale = uv.scale ?? 1.0;
+    const [ox, oy] = uv.offset ?? [0, 0];
+    const m = new THREE.Matrix3().setUvTransform(ox, oy, scale, scale, uv.rotation ?? 0, 0.5, 0.5);
+    const eps = 1e-6;
+    return [[0, 0], [1, 0], [0, 1], [1, 1]].every(([x, y]) => {
+        const p = new THREE.Vector2(x, y).applyMatrix3(m);
+        return p.x >= -eps && p.x <= 1 + eps && p.y >= -eps && p.y <= 1 + eps;
+    });
+};
+
 export class MaterialManager {
     constructor() {
         this.texLoader = new THREE.TextureLoader();
         this.textureCache = new Map();
+        // Images (PNG or KTX2), loaded once and shared (cloned) by every component that uses them
+        this.imageCache = new Map();
+        this.atlasLayout = null;
 
         // Define Code-based Material Presets
         this.materialPresets = {
@@ -34,6 +87,46 @@ export class MaterialManager {
         };
     }
 
+    loadImage(texPath, textureFormat = 'png') {
+        const key = `${texPath}|${textureFormat}`;
+        if (!this.imageCache.has(key)) {
+            const loadPNG = () => this.texLoader.loadAsync(cb(texPath));
+            const family = textureFormat === 'ktx2' && texPath.endsWith('.png') ? supportedKTX2Families()[0] : null;
+            const promise = family
+                ? this.loadKTX2(texPath.replace(/\.png$/, `.${family}.ktx2`)).catch(e => {
+                    console.warn(`[CONTRACT WARNING] KTX2 unavailable for ${texPath}, using PNG`, e);
+                    return loadPNG();
+                })
+                : loadPNG();
+            this.imageCache.set(key, promise);
+        }
+        return this.imageCache.get(key);
+    }
+
+    // assets/textures/atlas.json from pipeline/textures/pack_atlas.py; without it every texture loads standalone
+    loadAtlasLayout() {
+        if (!this.atlasLayout) {
+            this.atlasLayout = fetch(cb('assets/textures/atlas.json'))
+                .then(resp => resp.ok ? resp.json() : { textures: {} })
+                .catch(() => ({ textures: {} }));
+        }
+        return this.atlasLayout;
+    }
+
+    async loadKTX2(url) {
+        const resp = await fetch(cb(url));
+        if (!resp.ok) throw new Error(`HTTP ${resp.status} for ${url}`);
+        const { vkFormat, width, height, mipmaps } = parseKTX2(await resp.arrayBuffer());
+        const format = KTX2_VK_FORMATS[vkFormat];
+        if (format === undefined) throw new Error(`Unsupported vkFormat ${vkFormat} in ${url}`);
+        // Stored bottom row first, so no flipY is needed (compressed uploads cannot flip)
+        const tex = new THREE.CompressedTexture(mipmaps, width, height, format);
+        tex.minFilter = THREE.LinearMipmapLinearFilter;
+        tex.magFilter = THREE.LinearFilter;
+        tex.needsUpdate = true;
+        return tex;
+    }
+
     async applyMaterial(mesh, config, overrideName = null) {
         const name = mesh.name;
         const matName = mesh.material ? mesh.material.name : "";
@@ -85,16 +178,21 @@ export class MaterialManager {
             if (settings.ior !== undefined && material.isMeshPhysicalMaterial) material.ior = settings.ior;
 
             if (settings.textureId && settings.textureId !== 'None') {
-                const texPath = settings.textureId.startsWith('http') ? settings.textureId : `assets/textures/${settings.textureId}`;
-                const cacheKey = `${texPath}_${JSON.stringify(settings.uvTransform || {})}`;
+                // Packed by pipeline/textures/pack_atlas.py: sample the shared atlas page instead
+                const packed = (await this.loadAtlasLayout()).textures?.[settings.textureId];
+                const atlas = packed && staysInUnitSquare(settings.uvTransform) ? packed : null;
+                const textureId = atlas ? atlas.textureId : settings.textureId;
+                const texPath = textureId.startsWith('http') ? textureId : `assets/textures/${textureId}`;
+                const cacheKey = `${texPath}_${JSON.stringify(settings.uvTransform || {})}_${JSON.stringify(atlas || {})}`;
 
                 try {
                     let tex;
                     if (this.textureCache.has(cacheKey)) {
                         tex = this.textureCache.get(cacheKey);
                     } else {
-                        tex = await this.texLoader.loadAsync(cb(texPath));
-                        tex.wrapS = tex.wrapT = THREE.RepeatWrapping;
+                        tex = (await this.loadImage(texPath, settings.textureFormat)).clone();
+                        tex.needsUpdate = true;
+                        tex.wrapS = tex.wrapT = atlas ? THREE.ClampToEdgeWrapping : THREE.RepeatWrapping;
                         tex.colorSpace = THREE.SRGBColorSpace;
                         if (settings.uvTransform) {
                             const uv = settings.uvTransform;
@@ -103,6 +201,16 @@ export class MaterialManager {
                             if (uv.offset !== undefined) tex.offset.set(uv.offset[0], uv.offset[1]);
                             tex.center.set(0.5, 0.5);
                         }
+                        if (atlas) {
+                            // Authored transform first, then into the atlas rect
+                            tex.updateMatrix();
+                            tex.matrix.premultiply(new THREE.Matrix3().set(
+                                atlas.scale[0], 0, atlas.offset[0],
+                                0, atlas.scale[1], atlas.offset[1],
+                                0, 0, 1
+                            ));
+                            tex.matrixAutoUpdate = false;
+                        }
                         this.textureCache.set(cacheKey, tex);
                     }
 
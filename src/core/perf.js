@@ -0,0 +1,74 @@
+// Per-frame instrumentation for verification/bench_render.py.
+// Inert until capture() is called; records into preallocated typed arrays so
+// measuring does not allocate inside the frames being measured.
+export const perfHook = {
+    active: false,
+    index: 0,
+    series: null,
+    resolve: null,
+    // Filled in once by game.js: initThree() duration, first frame time (since navigation) and its render cost,
+    // first frame drawing the dozer model and the time its last streamed part was in
+    startup: { initThreeMs: null, firstFrameMs: null, firstRenderMs: null, firstDozerFrameMs: null, dozerCompleteMs: null },
+
+    // Resolves with per-frame series once `frames` frames have been recorded
+    capture(frames) {
+        this.series = {
+            frameMs: new Float64Array(frames),
+            physicsMs: new Float64Array(frames),
+            physicsSteps: new Uint16Array(frames),
+            graphicsMs: new Float64Array(frames),
+            calls: new Uint32Array(frames),
+            triangles: new Uint32Array(frames),
+            geometries: new Uint32Array(frames),
+            textures: new Uint32Array(frames)
+        };
+        this.index = 0;
+        this.active = true;
+        return new Promise(resolve => { this.resolve = resolve; });
+    },
+
+    record(frameMs, physicsMs, physicsSteps, graphicsMs, info) {
+        const s = this.series;
+        const i = this.index++;
+        s.frameMs[i] = frameMs;
+        s.physicsMs[i] = physicsMs;
+        s.physicsSteps[i] = physicsSteps;
+        s.graphicsMs[i] = graphicsMs;
+        s.calls[i] = info.render.calls;
+        s.triangles[i] = info.render.triangles;
+        s.geometries[i] = info.memory.geometries;
+        s.textures[i] = info.memory.textures;
+        if (this.index === s.frameMs.length) {
+            this.active = false;
+            const out = {};
+            for (const key in s) out[key] = Array.from(s[key]);
+            this.resolve(out);
+        }
+    }
+};
+
+window.perfHook = perfHook;
+
+// Frame sync for verification/visual_regression.py: instead of sleeping after
+// a state change, wait until frames rendered with all assets ready show it.
+export const frameSync = {
+    version: 0,
+    waiters: [],
+
+    // Resolves with the new state version once `frames` ready frames have rendered
+    request(frames = 1) {
+        const version = ++this.version;
+        return new Promise(resolve => this.waiters.push({ version, remaining: frames, resolve }));
+    },
+
+    rendered(ready) {
+        if (!ready || this.waiters.length === 0) return;
+        this.waiters = this.waiters.filter(w => {
+            if (--w.remaining > 0) return true;
+            w.resolve(w.version);
+            return false;
+        });
+    }
+};
+
+window.frameSync = frameSync;
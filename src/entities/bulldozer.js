@@ -1,31 +1,44 @@
 import { state } from '../core/state.js';
-import { Bodies, Composite, Body, world, CATEGORIES } from '../core/physics.js';
+import { Bodies, Composite, Body, Matter, world, CATEGORIES } from '../core/physics.js';
 import { removeBodyMesh } from '../core/graphics.js';
+import { assetUrl } from '../utils/graphics-utils.js';
 
 let bulldozer;
+// Convex collision footprints per plow level (pipeline/colliders/footprints.py), or null
+let footprints = null;
 
 export function getBulldozer() {
     return bulldozer;
 }
 
-export function createBulldozer() {
-    let pos = { x: 0, y: 0 };
-    let angle = 0;
-
-    if (bulldozer) {
-        pos = { x: bulldozer.position.x, y: bulldozer.position.y };
-        angle = bulldozer.angle;
-        // Remove meshes associated with old bulldozer parts
-        bulldozer.parts.forEach(p => {
-            removeBodyMesh(p.id);
-        });
-        Composite.remove(world, bulldozer);
+// Resolves to true when the footprints were loaded; createBulldozer() uses the hand-built boxes otherwise.
+export async function loadFootprints(url = 'assets/colliders/footprints.json') {
+    try {
+        const res = await fetch(assetUrl(url));
+        if (!res.ok) return false;
+        footprints = await res.json();
+        return true;
+    } catch (err) {
+        console.warn('Collider footprints unavailable, using box colliders:', err.message || err);
+        return false;
     }
+}
 
-    // New Scaling Logic: Match the visual scaling of BulldozerRenderer
-    // Visual Scale = 1.0 + (state.dozerLevel - 1) * 0.15
-    const visualScale = 1.0 + (state.dozerLevel - 1) * 0.15;
+// Model-space polygons scaled like the renderer (10 x visual scale); chassis origin at (0, 0)
+function footprintParts(level, visualScale) {
+    const scale = footprints.scale * visualScale;
+    const parts = [];
+    for (const [label, polygons] of Object.entries(level)) {
+        for (const polygon of polygons) {
+            const vertices = polygon.map(([x, y]) => ({ x: x * scale, y: y * scale }));
+            // Body.create recentres the vertices on their centroid, so place the part there
+            parts.push(Body.create({ label, vertices, position: Matter.Vertices.centre(vertices) }));
+        }
+    }
+    return parts;
+}
 
+function boxParts(visualScale) {
     // Chassis Size
     // Base 45 approximates Level 1 of previous formula (40 + 5)
     const bodySize = 45 * visualScale;
@@ -46,7 +59,7 @@ export function createBulldozer() {
     const chassis = Bodies.rectangle(0, 0, bodySize, bodySize, { label: 'chassis' });
     const plow = Bodies.rectangle(0, plowOffset, plowWidth, plowHeight, { label: 'plow' });
 
-    let parts = [chassis, plow];
+    const parts = [chassis, plow];
 
     // Wing Logic
     if (state.plowLevel >= 3) {
@@ -88,6 +101,30 @@ export function createBulldozer() {
         parts.push(leftWing, rightWing);
     }
 
+    return parts;
+}
+
+export function createBulldozer() {
+    let pos = { x: 0, y: 0 };
+    let angle = 0;
+
+    if (bulldozer) {
+        pos = { x: bulldozer.position.x, y: bulldozer.position.y };
+        angle = bulldozer.angle;
+        // Remove meshes associated with old bulldozer parts
+        bulldozer.parts.forEach(p => {
+            removeBodyMesh(p.id);
+        });
+        Composite.remove(world, bulldozer);
+    }
+
+    // New Scaling Logic: Match the visual scaling of BulldozerRenderer
+    // Visual Scale = 1.0 + (state.dozerLevel - 1) * 0.15
+    const visualScale = 1.0 + (state.dozerLevel - 1) * 0.15;
+
+    const level = footprints && footprints.levels[state.plowLevel];
+    const parts = level ? footprintParts(level, visualScale) : boxParts(visualScale);
+
     // Create a new parent body and set its parts
     // This is the canonical way to ensure rigidity in Matter.js
     bulldozer = Body.create({
@@ -113,17 +150,21 @@ export function createBulldozer() {
         part.oAngle = part.angle - bulldozer.angle;
     });
 
-    // Also explicitly store chassisOffset for the specialized renderer
-    const chassisPart = bulldozer.parts.find(p => p.label === 'chassis');
-    if (chassisPart) {
-        bulldozer.chassisOffset = chassisPart.oOffset;
-    }
+    // Also explicitly store chassisOffset for the specialized renderer: the model origin, which was (0, 0)
+    // before Body.setParts moved the compound to its CoM (footprint chassis parts sit at their centroid)
+    bulldozer.chassisOffset = { x: -bulldozer.position.x, y: -bulldozer.position.y };
 
     // Refactored Physics Scaling:
     // Use Linear Density scaling instead of Exponential to prevent "Mass Explosion"
     // Base Density 0.002 + small increment per level for "heaviness" feel without ruining physics.
     const density = 0.002 + (state.dozerLevel * 0.0001);
     Body.setDensity(bulldozer, density);
+    if (level) {
+        // Footprints change the shape, not the mass: keep the box layout's, which the drive
+        // tuning (verification/drive_model.py) is balanced around
+        const boxArea = boxParts(visualScale).reduce((sum, part) => sum + part.area, 0);
+        Body.setMass(bulldozer, density * boxArea);
+    }
 
     Body.setPosition(bulldozer, pos);
     Body.setAngle(bulldozer, angle);
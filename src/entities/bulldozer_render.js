@@ -3,6 +3,55 @@ import { GLTFLoader } from 'three/examples/jsm/loaders/GLTFLoader.js';
 import { MaterialManager } from '../core/material-manager.js';
 import { cb } from '../utils/graphics-utils.js';
 
+// LOD contract: level N>0 nodes are named "<name>_LOD<N>" and carry a `lod` extra
+const lodLevel = (node) => (node.userData && node.userData.lod) || 0;
+const lodBaseName = (name) => name.replace(/_LOD\d+$/, '');
+
+// Optimized GLBs (KHR_mesh_quantization) store int16 positions dequantized by the node scale.
+// Geometry that gets a transform baked in must be converted back to floats first.
+const toFloatGeometry = (geometry) => {
+  for (const name of Object.keys(geometry.attributes)) {
+    const attr = geometry.attributes[name];
+    if (!attr.isInterleavedBufferAttribute && attr.array instanceof Float32Array) continue;
+    const size = attr.itemSize;
+    const out = new Float32Array(attr.count * size);
+    for (let i = 0; i < attr.count; i++) {
+      out[i * size] = attr.getX(i);
+      if (size > 1) out[i * size + 1] = attr.getY(i);
+      if (size > 2) out[i * size + 2] = attr.getZ(i);
+      if (size > 3) out[i * size + 3] = attr.getW(i);
+    }
+    geometry.setAttribute(name, new THREE.BufferAttribute(out, size));
+  }
+  return geometry;
+};
+
+// Track paths carry an `arc_lut` extra (pipeline/blender/geometry.py track_path_extras): samples evenly
+// spaced by arc length, interleaved px,py,pz,tx,ty,tz float32, in the path node's parent space.
+// Exposes the getPointAt/getTangentAt pair of a THREE.Curve, as one table lookup and lerp per call.
+const arcLutCurve = (lut, matrix) => {
+  const bytes = Uint8Array.from(atob(lut.data), c => c.charCodeAt(0));
+  const data = new Float32Array(bytes.buffer);
+  const count = lut.count;
+  const v = new THREE.Vector3();
+  for (let i = 0; i < count; i++) {
+    v.fromArray(data, i * 6).applyMatrix4(matrix).toArray(data, i * 6);
+    v.fromArray(data, i * 6 + 3).transformDirection(matrix).toArray(data, i * 6 + 3);
+  }
+  const a = new THREE.Vector3();
+  const sample = (t, offset, out) => {
+    const f = t * count;
+    const i = Math.floor(f) % count;
+    const j = (i + 1) % count;
+    a.fromArray(data, i * 6 + offset);
+    return out.fromArray(data, j * 6 + offset).sub(a).multiplyScalar(f - Math.floor(f)).add(a);
+  };
+  return {
+    getPointAt: (t, out) => sample(t, 0, out),
+    getTangentAt: (t, out) => sample(t, 3, out).normalize(),
+  };
+};
+
 export class BulldozerRenderer {
   constructor(scene) {
     this.scene = scene;
@@ -31,8 +80,12 @@ export class BulldozerRenderer {
       mesh: null,
       teethMesh: null,
       wingL: null,
-      wingR: null
+      wingR: null,
+      // Source node transforms (carry the dequantization scale of optimized GLBs)
+      segmentMatrix: new THREE.Matrix4(),
+      teethMatrix: new THREE.Matrix4()
     };
+    this._instanceMatrix = new THREE.Matrix4();
 
     this.scale = 10.0;
     this._position = new THREE.Vector3();
@@ -41,6 +94,12 @@ export class BulldozerRenderer {
     this.dummy = new THREE.Object3D();
     this.isLoaded = false;
     this.config = null;
+
+    // LOD: alternate geometries per mesh, swapped by updateLOD()
+    this.lodSources = new Map(); // base node name -> [{ level, node }]
+    this.lodTargets = [];        // { mesh, levels: [{ level, geometry }] }
+    this.lodLevel = 0;
+    this.lodRadius = 3.0;
   }
 
   // Expose presets for the UI via the manager
@@ -60,12 +119,77 @@ export class BulldozerRenderer {
 
     return new Promise((resolve, reject) => {
       this.loader.load(cb(url), async (gltf) => {
+        await this.addComponents(gltf);
+        this.isLoaded = true;
+        resolve();
+      }, undefined, reject);
+    });
+  }
+
+  // Streams a model split by pipeline/gltf/split_parts.py: `<name>.parts.json` lists its part GLBs by priority.
+  // Resolves once the first-priority parts are in the scene, with `loadRest()` to fetch the others
+  // (so the caller can get the first parts of several models in before any later ones).
+  // Falls back to `fallbackUrl`, the single-file model, when the build has no parts manifest.
+  async loadParts(partsUrl, configUrlOrObj = null, fallbackUrl = null) {
+    console.log(`[DEBUG]BulldozerRenderer.loadParts: ${partsUrl}`);
+
+    if (configUrlOrObj) {
+      await this.loadConfig(configUrlOrObj);
+    }
+
+    let manifest = null;
+    try {
+      const resp = await fetch(cb(partsUrl));
+      if (resp.ok) manifest = await resp.json();
+    } catch (e) {
+      console.warn("[WARN] Failed to load parts manifest", e);
+    }
+    if (!manifest) {
+      if (!fallbackUrl) throw new Error(`No parts manifest at ${partsUrl}`);
+      console.warn(`[WARN] No parts manifest at ${partsUrl}, loading ${fallbackUrl}`);
+      await this.addComponents(await this.loader.loadAsync(cb(fallbackUrl)));
+      this.updatePlow();
+      this.isLoaded = true;
+      return { loadRest: async () => {} };
+    }
+
+    const dir = partsUrl.slice(0, partsUrl.lastIndexOf('/') + 1);
+    const tiers = new Map();
+    for (const part of manifest.parts) {
+      if (!tiers.has(part.priority)) tiers.set(part.priority, []);
+      tiers.get(part.priority).push(part);
+    }
+    const order = [...tiers.keys()].sort((a, b) => a - b);
+
+    // A tier's parts download in parallel and are added in manifest order, independent of arrival order
+    const loadTier = async (priority) => {
+      const parts = tiers.get(priority);
+      const scenes = await Promise.all(parts.map(p => this.loader.loadAsync(cb(dir + p.file))));
+      for (const gltf of scenes) await this.addComponents(gltf);
+      this.updatePlow();
+      console.log(`[DEBUG] Streamed ${parts.map(p => p.name).join(', ')} (priority ${priority})`);
+    };
+
+    if (order.length) await loadTier(order[0]);
+    this.isLoaded = true;
+    return {
+      loadRest: async () => {
+        for (const priority of order.slice(1)) await loadTier(priority);
+      }
+    };
+  }
+
+  // Adds a loaded glTF's components: the body and tracks get their special setup, everything else
+  // (plow parts included) goes through processGenericNodes(). Split parts carry any subset of them.
+  async addComponents(gltf) {
         let bodyMeshNode = null;
         let trackLinkNode = null;
         let pathLNode = null;
         let pathRNode = null;
 
+        this.collectLODNodes(gltf.scene);
         gltf.scene.traverse(c => {
+          if (lodLevel(c) > 0) return;
           if (c.name.includes("Bulldozer_Body")) bodyMeshNode = c;
           if (c.name.includes("Asset_TrackLink")) trackLinkNode = c;
           if (c.name.includes("Asset_TrackPath_L")) pathLNode = c;
@@ -93,6 +217,17 @@ export class BulldozerRenderer {
           body.userData.damp_id = bodyMeshNode.userData.damp_id; 
           this.group.add(body);
 
+          // Lower LOD children (e.g. Wheel_0_LOD1) are swapped in as geometry, not rendered alongside
+          const lodChildren = [];
+          body.traverse(c => { if (lodLevel(c) > 0) lodChildren.push(c); });
+          lodChildren.forEach(c => c.removeFromParent());
+          if (bodyMeshNode.geometry) {
+              bodyMeshNode.geometry.computeBoundingSphere();
+              this.lodRadius = bodyMeshNode.geometry.boundingSphere.radius * bodyMeshNode.getWorldScale(new THREE.Vector3()).x;
+          }
+
+          this.batchSharedMeshes(body);
+
           const meshes = [];
           body.traverse(c => { if(c.isMesh) meshes.push(c); });
           for (const c of meshes) {
@@ -103,12 +238,14 @@ export class BulldozerRenderer {
               }
               c.castShadow = c.receiveShadow = true;
               await this.applyMaterial(c);
+              this.registerLOD(c, c.name);
           }
         }
 
         // 2. Setup Tracks (Special)
         if (trackLinkNode && pathLNode && pathRNode) {
-          const setupTrack = async (pathNode, side) => {
+          // Fallback for exports without an arc_lut: walk the path polygon with a Catmull-Rom spline
+          const pathCurve = (pathNode) => {
             const attr = pathNode.geometry.attributes.position;
             let rawPoints = [];
             pathNode.updateMatrixWorld(true);
@@ -142,9 +279,20 @@ export class BulldozerRenderer {
                 }
             }
 
-            const curve = new THREE.CatmullRomCurve3(points, true, 'centripetal', 0.5);
+            return new THREE.CatmullRomCurve3(points, true, 'centripetal', 0.5);
+          };
+
+          const setupTrack = async (pathNode, side) => {
+            let curve;
+            if (pathNode.userData.arc_lut) {
+              // The node's own scale is the dequantization step of optimized GLBs; the table is not quantized
+              pathNode.parent.updateMatrixWorld(true);
+              curve = arcLutCurve(pathNode.userData.arc_lut, pathNode.parent.matrixWorld);
+            } else {
+              curve = pathCurve(pathNode);
+            }
             const count = 50;
-            const linkGeo = trackLinkNode.geometry.clone();
+            const linkGeo = toFloatGeometry(trackLinkNode.geometry.clone());
             trackLinkNode.updateMatrixWorld(true);
             linkGeo.applyMatrix4(trackLinkNode.matrixWorld);
             linkGeo.computeBoundingBox();
@@ -160,6 +308,13 @@ export class BulldozerRenderer {
             }
             this.group.add(mesh);
             await this.applyMaterial(mesh);
+            this.registerLOD(mesh, lodBaseName(trackLinkNode.name), (geo, node) => {
+              toFloatGeometry(geo);
+              node.updateMatrixWorld(true);
+              geo.applyMatrix4(node.matrixWorld);
+              geo.translate(-center.x, -center.y, -center.z);
+              return geo;
+            });
             this.animatedInstances.push({ mesh, curve, count, speed: 0.02, offset: 0, side });
           };
           await setupTrack(pathLNode, -1);
@@ -170,17 +325,12 @@ export class BulldozerRenderer {
         // Identify any root children that are NOT special and add them
         const genericRoots = [];
         gltf.scene.children.forEach(child => {
-             if (!isSpecial(child)) {
+             if (!isSpecial(child) && lodLevel(child) === 0) {
                  genericRoots.push(child);
              }
         });
 
         await this.processGenericNodes(genericRoots);
-
-        this.isLoaded = true;
-        resolve();
-      }, undefined, reject);
-    });
   }
 
   async loadPlow(url, configUrlOrObj = null) {
@@ -194,6 +344,7 @@ export class BulldozerRenderer {
       this.loader.load(cb(url), async (gltf) => {
         // Plow assets are likely just the generic components
         const roots = [];
+        this.collectLODNodes(gltf.scene);
         gltf.scene.children.forEach(child => roots.push(child));
 
         await this.processGenericNodes(roots);
@@ -226,7 +377,8 @@ export class BulldozerRenderer {
               ...this.config,
               ...newConfig,
               assembly: { ...this.config.assembly, ...newConfig.assembly },
-              components: { ...this.config.components, ...newConfig.components }
+              components: { ...this.config.components, ...newConfig.components },
+              lod: { ...this.config.lod, ...newConfig.lod }
           };
       }
 
@@ -248,6 +400,9 @@ export class BulldozerRenderer {
 
   async processGenericNodes(nodes) {
         for (const node of nodes) {
+            // Lower LOD levels are registered as alternate geometry by collectLODNodes()
+            if (lodLevel(node) > 0) continue;
+
             // Special handling for instantiable segments
             if (node.name.includes("Plow_Segment")) {
                  console.log(`[DEBUG] Converting ${node.name} to InstancedMesh`);
@@ -268,6 +423,8 @@ export class BulldozerRenderer {
                      await this.applyMaterial(instancedMesh);
 
                      this.plowParams.mesh = instancedMesh;
+                     meshNode.updateMatrixWorld(true);
+                     this.plowParams.segmentMatrix.copy(meshNode.matrixWorld);
                      continue;
                  }
             }
@@ -292,6 +449,8 @@ export class BulldozerRenderer {
                      await this.applyMaterial(instancedMesh);
 
                      this.plowParams.teethMesh = instancedMesh;
+                     meshNode.updateMatrixWorld(true);
+                     this.plowParams.teethMatrix.copy(meshNode.matrixWorld);
                      continue;
                  }
             }
@@ -301,6 +460,8 @@ export class BulldozerRenderer {
                 const clone = node.clone();
                 this.group.add(clone);
                 this.plowParams.wingL = clone;
+                // Per wing: a wing sharing its mirror's mesh carries a negative scale
+                clone.userData.baseScale = node.scale.clone();
                 await this.applyGenericMaterials(clone, node);
                 continue;
             }
@@ -308,6 +469,7 @@ export class BulldozerRenderer {
                 const clone = node.clone();
                 this.group.add(clone);
                 this.plowParams.wingR = clone;
+                clone.userData.baseScale = node.scale.clone();
                 await this.applyGenericMaterials(clone, node);
                 continue;
             }
@@ -319,6 +481,33 @@ export class BulldozerRenderer {
         }
   }
 
+  // Sibling nodes that optimize.py pointed at one mesh (e.g. the wheels) become a single InstancedMesh,
+  // named after the first so material and LOD lookups by name still find it
+  batchSharedMeshes(root) {
+      const groups = new Map();
+      root.traverse(c => {
+          if (c === root || !c.isMesh || c.isInstancedMesh || c.children.length > 0) return;
+          c.updateMatrix();
+          // Mirrored instances would need the opposite winding; leave them as plain meshes
+          if (c.matrix.determinant() <= 0) return;
+          const key = `${c.parent.uuid}/${c.geometry.uuid}/${c.userData.damp_id}`;
+          if (!groups.has(key)) groups.set(key, []);
+          groups.get(key).push(c);
+      });
+      for (const nodes of groups.values()) {
+          if (nodes.length < 2) continue;
+          const first = nodes[0];
+          const instancedMesh = new THREE.InstancedMesh(first.geometry, first.material, nodes.length);
+          instancedMesh.name = first.name;
+          instancedMesh.userData = { ...first.userData };
+          nodes.forEach((c, i) => instancedMesh.setMatrixAt(i, c.matrix));
+          instancedMesh.instanceMatrix.needsUpdate = true;
+          first.parent.add(instancedMesh);
+          nodes.forEach(c => c.removeFromParent());
+          console.log(`[DEBUG] Batched ${nodes.length} nodes sharing ${first.name}'s mesh into an InstancedMesh`);
+      }
+  }
+
   async applyGenericMaterials(clone, sourceRoot) {
         const meshes = [];
         clone.traverse(c => { if(c.isMesh) meshes.push(c); });
@@ -332,9 +521,67 @@ export class BulldozerRenderer {
             }
             c.castShadow = c.receiveShadow = true;
             await this.applyMaterial(c);
+            this.registerLOD(c, c.name);
         }
   }
 
+  collectLODNodes(root) {
+      root.traverse(c => {
+          const level = lodLevel(c);
+          if (level === 0) return;
+          const base = lodBaseName(c.name);
+          if (!this.lodSources.has(base)) this.lodSources.set(base, []);
+          this.lodSources.get(base).push({ level, node: c });
+      });
+  }
+
+  registerLOD(mesh, baseName, prepare = (geo) => geo) {
+      const sources = this.lodSources.get(baseName);
+      if (!sources || !mesh.geometry) return;
+      const levels = [{ level: 0, geometry: mesh.geometry }];
+      for (const { level, node } of sources) {
+          let meshNode = null;
+          node.traverse(c => { if (c.isMesh && !meshNode) meshNode = c; });
+          if (meshNode) levels.push({ level, geometry: prepare(meshNode.geometry.clone(), meshNode) });
+      }
+      levels.sort((a, b) => a.level - b.level);
+      const target = { mesh, levels };
+      this.lodTargets.push(target);
+      this.applyLOD(target);
+  }
+
+  applyLOD(target) {
+      // Highest exported level not above the requested one (generators skip levels that would not simplify)
+      let chosen = target.levels[0];
+      for (const l of target.levels) if (l.level <= this.lodLevel) chosen = l;
+      if (target.mesh.geometry !== chosen.geometry) target.mesh.geometry = chosen.geometry;
+  }
+
+  setLOD(level) {
+      if (level === this.lodLevel) return;
+      this.lodLevel = level;
+      this.lodTargets.forEach(target => this.applyLOD(target));
+      const instances = this.config?.lod?.track_link?.instances;
+      this.animatedInstances.forEach(track => {
+          track.mesh.count = instances ? Math.min(track.count, instances[Math.min(level, instances.length - 1)]) : track.count;
+      });
+  }
+
+  // Picks the LOD level from the asset's projected size (fraction of the viewport height)
+  updateLOD(camera) {
+      const screenSizes = this.config?.lod?.screenSizes;
+      if (!screenSizes || !camera) return;
+      this.group.getWorldPosition(this._position);
+      const distance = Math.max(camera.position.distanceTo(this._position), 1e-6);
+      const halfHeight = camera.isPerspectiveCamera
+          ? distance * Math.tan(THREE.MathUtils.degToRad(camera.fov) / 2)
+          : (camera.top - camera.bottom) / (2 * camera.zoom);
+      const screenSize = (this.lodRadius * this.group.scale.x) / halfHeight;
+      let level = screenSizes.findIndex(s => screenSize >= s);
+      if (level < 0) level = screenSizes.length;
+      this.setLOD(level);
+  }
+
   async applyMaterial(mesh, overrideName = null) {
       // Delegate to the specialized manager
       // Silencing noisy logs (optional refactor: pass a logLevel to manager)
@@ -403,7 +650,8 @@ export class BulldozerRenderer {
       for (let i = 0; i < count; i++) {
           this.dummy.position.set(startX + i * width, 0, zOffset);
           this.dummy.updateMatrix();
-          this.plowParams.mesh.setMatrixAt(i, this.dummy.matrix);
+          this._instanceMatrix.multiplyMatrices(this.dummy.matrix, this.plowParams.segmentMatrix);
+          this.plowParams.mesh.setMatrixAt(i, this._instanceMatrix);
       }
       this.plowParams.mesh.instanceMatrix.needsUpdate = true;
 
@@ -416,7 +664,8 @@ export class BulldozerRenderer {
              for (let i = 0; i < count; i++) {
                 this.dummy.position.set(startX + i * width, 0, zOffset);
                 this.dummy.updateMatrix();
-                this.plowParams.teethMesh.setMatrixAt(i, this.dummy.matrix);
+                this._instanceMatrix.multiplyMatrices(this.dummy.matrix, this.plowParams.teethMatrix);
+                this.plowParams.teethMesh.setMatrixAt(i, this._instanceMatrix);
             }
             this.plowParams.teethMesh.instanceMatrix.needsUpdate = true;
           }
@@ -428,12 +677,12 @@ export class BulldozerRenderer {
       
       if (this.plowParams.wingL) {
           this.plowParams.wingL.visible = this.plowParams.hasWings;
-          this.plowParams.wingL.scale.setScalar(wingScale);
+          this.plowParams.wingL.scale.copy(this.plowParams.wingL.userData.baseScale).multiplyScalar(wingScale);
           this.plowParams.wingL.position.set(-wingOffset, 0, zOffset);
       }
       if (this.plowParams.wingR) {
           this.plowParams.wingR.visible = this.plowParams.hasWings;
-          this.plowParams.wingR.scale.setScalar(wingScale);
+          this.plowParams.wingR.scale.copy(this.plowParams.wingR.userData.baseScale).multiplyScalar(wingScale);
           this.plowParams.wingR.position.set(wingOffset, 0, zOffset);
       }
   }
@@ -442,8 +691,8 @@ export class BulldozerRenderer {
     if (!this.isLoaded) return;
     this.animatedInstances.forEach(track => {
       if (Math.abs(track.speed) > 0.001) track.offset = (track.offset - track.speed * delta) % 1.0;
-      for (let i = 0; i < track.count; i++) {
-        let t = (i / 50 + track.offset) % 1.0;
+      for (let i = 0; i < track.mesh.count; i++) {
+        let t = (i / track.mesh.count + track.offset) % 1.0;
         if (t < 0) t += 1.0;
         track.curve.getPointAt(t, this._position);
         track.curve.getTangentAt(t, this._tangent);
@@ -467,6 +716,11 @@ export class BulldozerRenderer {
       if (c.geometry) c.geometry.dispose();
       if (c.material) Array.isArray(c.material) ? c.material.forEach(m => m.dispose()) : c.material.dispose();
     });
+    this.lodTargets.forEach(target => target.levels.forEach(l => {
+      if (l.geometry !== target.mesh.geometry) l.geometry.dispose();
+    }));
+    this.lodTargets = [];
+    this.lodSources.clear();
     this.animatedInstances = [];
     this.isLoaded = false;
   }
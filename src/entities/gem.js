@@ -3,6 +3,7 @@ import { Bodies, Composite, Body, world, CATEGORIES } from '../core/physics.js';
 import { removeBodyMesh, spawnParticles, spawnCoinDrop } from '../core/graphics.js';
 import { updateUI, showNotification } from '../core/ui.js';
 import { createMap } from './map.js';
+import { assetUrl } from '../utils/graphics-utils.js';
 
 const gems = [];
 const gemColors = {
@@ -12,7 +13,36 @@ const gemColors = {
   '#00FF00': 0x00FF00  // Green
 };
 
-export function initGems() {
+export const GEMS_PER_ZONE = 400;
+
+// Precomputed non-overlapping layouts (pipeline/layouts/gem_layouts.py). Resolves to
+// { zoneId: { x, y, radius, color, value, colors, count } } with one seeded variant
+// picked per zone, or null when the layouts have not been built.
+export async function loadGemLayouts(indexUrl = 'assets/layouts/gems.json') {
+  try {
+    const res = await fetch(assetUrl(indexUrl));
+    if (!res.ok) return null;
+    const index = await res.json();
+    const dir = indexUrl.slice(0, indexUrl.lastIndexOf('/') + 1);
+    const types = { float32: Float32Array, uint8: Uint8Array };
+    const layouts = {};
+    await Promise.all(Object.entries(index.zones).map(async ([zoneId, zone]) => {
+      const variant = zone.variants[Math.floor(Math.random() * zone.variants.length)];
+      const buffer = await (await fetch(assetUrl(dir + variant.file))).arrayBuffer();
+      const layout = { colors: zone.colors, count: variant.count };
+      for (const { name, type } of index.columns) {
+        layout[name] = new types[type](buffer, variant.offsets[name], variant.count);
+      }
+      layouts[zoneId] = layout;
+    }));
+    return layouts;
+  } catch (err) {
+    console.warn('Gem layouts unavailable, sampling at runtime:', err.message || err);
+    return null;
+  }
+}
+
+export function initGems(perZone = GEMS_PER_ZONE, layouts = null) {
   // Clear existing
   for (const g of gems) {
     removeBodyMesh(g.id);
@@ -25,10 +55,28 @@ export function initGems() {
     state.zoneProgress[2] = { total: 0, collected: 0 };
     state.zoneProgress[3] = { total: 0, collected: 0 };
 
-    spawnZoneGems(1, 400, -500, 500, -500, 500, 8, 12, ['#00FFFF', '#FF00FF']);
-    spawnZoneGems(2, 400, -500, 500, -1700, -700, 25, 40, ['#FFFF00']);
-    // Inflation Adjustment: Zone 3 Gems are now "Big Ticket" items (100-200)
-    spawnZoneGems(3, 400, -500, 500, -2900, -1900, 100, 200, ['#00FF00']);
+    const zones = [
+      [1, -500, 500, -500, 500, 8, 12, ['#00FFFF', '#FF00FF']],
+      [2, -500, 500, -1700, -700, 25, 40, ['#FFFF00']],
+      // Inflation Adjustment: Zone 3 Gems are now "Big Ticket" items (100-200)
+      [3, -500, 500, -2900, -1900, 100, 200, ['#00FF00']]
+    ];
+    for (const [zoneId, ...zone] of zones) {
+      const layout = layouts && layouts[zoneId];
+      // Any prefix of a layout is still overlap-free, so smaller counts reuse it
+      if (layout && layout.count >= perZone) {
+        spawnLayoutGems(zoneId, perZone, layout);
+      } else {
+        spawnZoneGems(zoneId, perZone, ...zone);
+      }
+    }
+}
+
+function spawnLayoutGems(zoneId, count, layout) {
+    state.zoneProgress[zoneId].total += count;
+    for (let i = 0; i < count; i++) {
+        addGem(zoneId, layout.x[i], layout.y[i], layout.radius[i], layout.colors[layout.color[i]], layout.value[i]);
+    }
 }
 
 function spawnZoneGems(zoneId, count, xMin, xMax, yMin, yMax, valMin, valMax, colors) {
@@ -38,10 +86,15 @@ function spawnZoneGems(zoneId, count, xMin, xMax, yMin, yMax, valMin, valMax, co
         const y = yMin + Math.random() * (yMax - yMin);
 
         const colorStr = colors[Math.floor(Math.random() * colors.length)];
-        const colorVal = gemColors[colorStr];
         const radius = 8 + Math.random() * 4; // Consistent size around 8-12
+        const value = Math.floor(valMin + Math.random() * (valMax - valMin));
+
+        addGem(zoneId, x, y, radius, colorStr, value);
+    }
+}
 
-        const gem = Bodies.circle(x, y, radius, {
+function addGem(zoneId, x, y, radius, colorStr, value) {
+    const gem = Bodies.circle(x, y, radius, {
       restitution: 0.5,
       friction: 0.0,
       frictionAir: 0.02,
@@ -53,17 +106,13 @@ function spawnZoneGems(zoneId, count, xMin, xMax, yMin, yMax, valMin, valMax, co
       }
     });
 
-                    gem.renderColor = colorVal;
-
-                    gem.gemColorHex = colorStr; // e.g. '#00FFFF'
-
-                    gem.value = Math.floor(valMin + Math.random() * (valMax - valMin));
-
-                    gem.zoneId = zoneId;
-
-                    gems.push(gem);
+    gem.renderColor = gemColors[colorStr];
+    gem.gemColorHex = colorStr; // e.g. '#00FFFF'
+    gem.value = value;
+    gem.zoneId = zoneId;
 
-                    Composite.add(world, gem);  }
+    gems.push(gem);
+    Composite.add(world, gem);
 }
 
 export function collectGem(gem) {
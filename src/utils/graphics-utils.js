@@ -1,13 +1,42 @@
+// Logical asset path -> content-hashed URL, from the manifest pipeline/scripts/hash_assets.py writes
+// for `task build:dist`. Empty in development (no manifest), where every path maps to itself.
+let assetManifest = {};
+
+/**
+ * Loads the content-hash manifest, if the build has one.
+ * @param {string} url - Manifest URL (fetched without long-lived caching; its name never changes).
+ * @returns {Promise<boolean>} - Whether a manifest was loaded.
+ */
+export async function loadAssetManifest(url = 'assets/asset-manifest.json') {
+    try {
+        const res = await fetch(url, { cache: 'no-cache' });
+        if (!res.ok) return false;
+        assetManifest = (await res.json()).assets || {};
+        return true;
+    } catch (err) {
+        console.warn('Asset manifest unavailable, using plain asset paths:', err.message || err);
+        return false;
+    }
+}
+
+/**
+ * Resolves a logical asset path (e.g. `assets/models/plow.glb`) to its hashed URL.
+ * @param {string} u - The logical path.
+ * @returns {string} - The hashed URL, or `u` when the manifest does not list it.
+ */
+export const assetUrl = (u) => assetManifest[u] ?? u;
 
 /**
  * Cache-busting utility for asset URLs.
  * Appends a timestamp to the URL query string to prevent stale cache.
+ * Content-hashed assets are returned as is: their URL already changes with their content.
  * @param {string} u - The URL to cache-bust.
  * @returns {string} - The URL with the cb query parameter.
  */
 export const cb = (u) => {
     if (typeof u !== 'string') return u;
     if (u.startsWith('http')) return u;
+    if (u in assetManifest) return assetManifest[u];
     const separator = u.includes('?') ? '&' : '?';
     return `${u}${separator}cb=${Date.now()}`;
 };
@@ -69,6 +69,12 @@ const ComponentAccordion = ({ name, data, textures, presets, materialPresets, on
                         ${textures.map(t => html`<option key=${t} value=${t}>${t}</option>`)}
                     </select>
 
+                    <label>Delivery</label>
+                    <select value=${data.textureFormat || 'png'} onChange=${e => update('textureFormat', e.target.value)}>
+                        <option value="png">PNG</option>
+                        <option value="ktx2">KTX2 (compressed)</option>
+                    </select>
+
                     <${Slider} label="Scale" min=${0.1} max=${20} step=${0.1} value=${data.uvTransform?.scale ?? 1.0} onChange=${v => updateUV('scale', v)} />
                     <${Slider} label="Rotation" min=${0} max=${360} step=${1} value=${Math.round((data.uvTransform?.rotation ?? 0) * (180/Math.PI))} unit="°" 
                             onChange=${v => updateUV('rotation', v * (Math.PI/180))} />
@@ -179,7 +185,10 @@ const App = () => {
         const clock = new THREE.Clock();
         const animate = () => {
             requestAnimationFrame(animate);
-            if (dozerRef.current) dozerRef.current.update(clock.getDelta());
+            if (dozerRef.current) {
+                dozerRef.current.update(clock.getDelta());
+                dozerRef.current.updateLOD(camera);
+            }
             controls.update();
             renderer.render(scene, camera);
         };
@@ -0,0 +1,281 @@
+"""
+Headless physics benchmark on verification/scaling_harness.html.
+
+Each scenario runs in its own browser context (concurrently) and drives the
+real game physics through `window.simulation`: `setup(level, level)`, then one
+`run(frames)` per key phase, which steps every frame inside the page and
+returns the per-frame speed, angle and step time in a single round trip.
+
+Results go to JSON with the commit and VERSION. Against a stored baseline the
+run fails (exit 1) when an acceleration/turning curve drifts or per-step time
+regresses; any scenario also fails on a speed explosion.
+
+The per-scenario page calls (scenario_steps) and the checks (check_scenario,
+compare and the tolerances) are shared with verification/test_physics.py,
+which drives them with sync Playwright through drive().
+
+    python3 verification/bench_physics.py
+    python3 verification/bench_physics.py --update-baseline
+    python3 verification/bench_physics.py --plot docs/living/guide/progression_curves_new.png
+
+Step times are machine-dependent: record the baseline on the machine that
+checks against it (or pass --no-timing).
+"""
+import argparse
+import asyncio
+import datetime
+import functools
+import http.server
+import json
+import os
+import subprocess
+import sys
+import threading
+
+from playwright.async_api import async_playwright
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+HARNESS = "verification/scaling_harness.html"
+RESULTS_PATH = os.path.join(ROOT_DIR, "verification", "reports", "physics_bench.json")
+BASELINE_PATH = os.path.join(ROOT_DIR, "verification", "baselines", "physics_bench.json")
+
+# name: (engine/plow level, [(keys held, frames), ...])
+SCENARIOS = {
+    "accel_l1": (1, [({"KeyW": True}, 300)]),
+    "accel_l5": (5, [({"KeyW": True}, 300)]),
+    "accel_l10": (10, [({"KeyW": True}, 300)]),
+    "accel_l20": (20, [({"KeyW": True}, 300)]),
+    "turn_l20": (20, [({"KeyW": True}, 120), ({"KeyW": True, "KeyD": True}, 120)]),
+}
+EXPLOSION_SPEED = 100
+# Allowed curve drift (fraction of the curve's max speed, rad) and step-time increase (fraction)
+SPEED_TOLERANCE = 0.02
+ANGLE_TOLERANCE = 0.01
+TIME_TOLERANCE = 0.25
+
+# --- Server ---
+class QuietHandler(http.server.SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+def start_server():
+    """Serves the repo root on a free port; ready as soon as it is bound."""
+    handler = functools.partial(QuietHandler, directory=ROOT_DIR)
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+# --- Scenarios ---
+def percentile(values, q):
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    k = (len(ordered) - 1) * q
+    lo, hi = int(k), min(int(k) + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (k - lo)
+
+# Steps yield one call on the page at a time and get its result sent back, so the same
+# sequence runs on a sync Playwright page (drive) and an async one (drive_async)
+def drive(page, steps):
+    result = None
+    try:
+        while True:
+            result = steps.send(result)(page)
+    except StopIteration as done:
+        return done.value
+
+async def drive_async(page, steps):
+    result = None
+    try:
+        while True:
+            result = await steps.send(result)(page)
+    except StopIteration as done:
+        return done.value
+
+def scenario_steps(base_url, level, phases):
+    """Loads the harness, sets up `level` and runs every key phase. Returns the per-frame series."""
+    yield lambda page: page.goto(f"{base_url}/{HARNESS}")
+    yield lambda page: page.wait_for_function("() => window.simulation !== undefined")
+    yield lambda page: page.evaluate("([e, p]) => window.simulation.setup(e, p)", [level, level])
+    series = {"speed": [], "angle": [], "stepMs": []}
+    for keys, frames in phases:
+        yield lambda page: page.evaluate("(k) => window.simulation.setKeys(k)", keys)
+        data = yield lambda page: page.evaluate("(n) => window.simulation.run(n)", frames)
+        if data is None:
+            raise RuntimeError("simulation has no bulldozer")
+        for key in series:
+            series[key] += data[key]
+    return series
+
+def summarize(level, series, errors):
+    step = series["stepMs"]
+    return {
+        "level": level,
+        "frames": len(step),
+        "speed": series["speed"],
+        "angle": series["angle"],
+        "maxSpeed": max(series["speed"]),
+        "finalSpeed": series["speed"][-1],
+        "stepMs": {"p50": percentile(step, 0.5), "p95": percentile(step, 0.95), "max": max(step), "total": sum(step)},
+        "pageErrors": errors,
+    }
+
+def check_scenario(name, result):
+    """Failures that need no baseline: page errors and a speed explosion."""
+    failures = [f"{name}: page error {e}" for e in result["pageErrors"]]
+    if result["maxSpeed"] > EXPLOSION_SPEED:
+        failures.append(f"{name}: speed explosion (max {result['maxSpeed']:.1f} > {EXPLOSION_SPEED})")
+    return failures
+
+async def run_scenario(browser, base_url, name, level, phases, semaphore):
+    async with semaphore:
+        context = await browser.new_context()
+        try:
+            page = await context.new_page()
+            errors = []
+            page.on("pageerror", lambda exc: errors.append(str(exc)))
+            series = await drive_async(page, scenario_steps(base_url, level, phases))
+        finally:
+            await context.close()
+
+    result = summarize(level, series, errors)
+    print(f"   [BENCH] {name}: level {level}, {result['frames']} frames, final speed {result['finalSpeed']:.2f}, "
+          f"max {result['maxSpeed']:.2f}, step p50 {result['stepMs']['p50']:.3f} ms / p95 {result['stepMs']['p95']:.3f} ms")
+    return name, result
+
+async def run_all(names, jobs):
+    server = start_server()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    semaphore = asyncio.Semaphore(jobs)
+    try:
+        async with async_playwright() as p:
+            browser = await p.chromium.launch(headless=True)
+            try:
+                results = await asyncio.gather(*(
+                    run_scenario(browser, base_url, name, *SCENARIOS[name], semaphore) for name in names
+                ))
+            finally:
+                await browser.close()
+    finally:
+        server.shutdown()
+    return dict(results)
+
+# --- Comparison ---
+def curve_drift(current, baseline):
+    """Largest per-frame difference over the common length (inf if the lengths differ)."""
+    if len(current) != len(baseline):
+        return float("inf")
+    return max((abs(a - b) for a, b in zip(current, baseline)), default=0.0)
+
+def compare(results, baseline, speed_tolerance=SPEED_TOLERANCE, angle_tolerance=ANGLE_TOLERANCE,
+            time_tolerance=TIME_TOLERANCE, check_timing=True):
+    regressions = []
+    for name, base in baseline.get("scenarios", {}).items():
+        current = results.get(name)
+        if current is None:
+            continue
+        # Relative to the curve's own scale so low levels are not held to high-level slack
+        allowed = speed_tolerance * max(base["maxSpeed"], 1.0)
+        drift = curve_drift(current["speed"], base["speed"])
+        if drift > allowed:
+            regressions.append(f"{name}: speed curve off by {drift:.3f} (allowed {allowed:.3f})")
+        drift = curve_drift(current["angle"], base["angle"])
+        if drift > angle_tolerance:
+            regressions.append(f"{name}: angle curve off by {drift:.4f} rad (allowed {angle_tolerance})")
+        if check_timing:
+            for stat in ("p50", "p95"):
+                now, before = current["stepMs"][stat], base["stepMs"][stat]
+                # Sub-0.05 ms differences are timer resolution, not regressions
+                if now > before * (1 + time_tolerance) and now - before > 0.05:
+                    regressions.append(f"{name}: step {stat} {now:.3f} ms vs baseline {before:.3f} ms (+{(now / before - 1) * 100:.0f}%)")
+    return regressions
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], cwd=ROOT_DIR, capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        return None
+
+def read_version():
+    path = os.path.join(ROOT_DIR, "VERSION")
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return f.read().strip()
+
+def plot(results, path):
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    plt.figure(figsize=(10, 6))
+    for name, result in results.items():
+        if name.startswith("accel_"):
+            plt.plot(range(len(result["speed"])), result["speed"], label=f"Level {result['level']}")
+    plt.title("Bulldozer Acceleration Curves (0-5s)")
+    plt.xlabel("Frames")
+    plt.ylabel("Speed (px/frame)")
+    plt.legend()
+    plt.grid(True)
+    plt.savefig(path)
+    print(f"   [BENCH] Graph saved to {path}")
+
+# --- Execution ---
+def main():
+    parser = argparse.ArgumentParser(description="Headless physics benchmark with baseline regression checks.")
+    parser.add_argument("scenarios", nargs="*", help=f"Scenarios to run (default: all of {', '.join(SCENARIOS)})")
+    parser.add_argument("--jobs", type=int, default=len(SCENARIOS), help="Concurrent browser contexts")
+    parser.add_argument("--output", default=RESULTS_PATH, help="Results JSON")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="Baseline JSON to compare against")
+    parser.add_argument("--update-baseline", action="store_true", help="Write this run as the new baseline")
+    parser.add_argument("--speed-tolerance", type=float, default=SPEED_TOLERANCE, help="Allowed speed drift, fraction of the curve's max")
+    parser.add_argument("--angle-tolerance", type=float, default=ANGLE_TOLERANCE, help="Allowed angle drift (rad)")
+    parser.add_argument("--time-tolerance", type=float, default=TIME_TOLERANCE, help="Allowed step-time increase (fraction)")
+    parser.add_argument("--no-timing", action="store_true", help="Only check curves (e.g. on a different machine)")
+    parser.add_argument("--plot", metavar="PNG", help="Also plot the acceleration curves (needs matplotlib)")
+    args = parser.parse_args()
+
+    names = args.scenarios or list(SCENARIOS)
+    unknown = [n for n in names if n not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenario(s): {', '.join(unknown)}")
+
+    results = asyncio.run(run_all(names, max(1, args.jobs)))
+    report = {
+        "generatedAt": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "commit": git_commit(),
+        "version": read_version(),
+        "scenarios": results,
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"   [BENCH] Results written to {os.path.relpath(args.output, ROOT_DIR)}")
+    if args.plot:
+        plot(results, args.plot)
+
+    failures = [f for name, result in results.items() for f in check_scenario(name, result)]
+
+    if args.update_baseline:
+        os.makedirs(os.path.dirname(os.path.abspath(args.baseline)), exist_ok=True)
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"   [BENCH] Baseline updated: {os.path.relpath(args.baseline, ROOT_DIR)}")
+    elif os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        failures += compare(results, baseline, args.speed_tolerance, args.angle_tolerance, args.time_tolerance, not args.no_timing)
+        print(f"   [BENCH] Compared against baseline {baseline.get('version')} ({(baseline.get('commit') or '?')[:8]})")
+    else:
+        print(f"   [BENCH] No baseline at {os.path.relpath(args.baseline, ROOT_DIR)}; run with --update-baseline to record one")
+
+    for failure in failures:
+        print(f"   [REGRESSION] {failure}")
+    if failures:
+        print(f"❌ {len(failures)} regression(s)")
+        return 1
+    print("✅ Physics benchmark passed")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
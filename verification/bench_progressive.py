@@ -0,0 +1,128 @@
+"""
+Progressive loading benchmark: single-file models vs streamed component parts.
+
+Loads the game in a fresh, cache-disabled context per run with the network
+throttled through the DevTools protocol, once with `?parts=off` (one GLB per
+model) and once streaming the parts pipeline/gltf/split_parts.py writes
+(chassis, tracks and blade first), and reads perfHook.startup:
+
+- first dozer frame ms: time from navigation to the first frame drawing the
+  dozer model,
+- complete ms: time until its last part (cabin, wings, teeth) was in.
+
+    python3 verification/bench_progressive.py
+    python3 verification/bench_progressive.py --network 3g --runs 10
+
+Needs the models built and split first (`task assets:geometry`).
+"""
+import argparse
+import asyncio
+import datetime
+import json
+import os
+import sys
+
+from playwright.async_api import async_playwright
+
+from bench_physics import git_commit, percentile, read_version, start_server
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+PARTS_DIR = os.path.join(ROOT_DIR, "assets", "models", "parts")
+MANIFESTS = [os.path.join(PARTS_DIR, name) for name in ("bulldozer_components.parts.json", "plow.parts.json")]
+RESULTS_PATH = os.path.join(ROOT_DIR, "verification", "reports", "progressive_bench.json")
+MODES = {"single": "index.html?parts=off", "parts": "index.html"}
+METRICS = ("firstDozerFrameMs", "dozerCompleteMs")
+# Round-trip latency (ms) and throughput (bytes/s), as DevTools' presets
+NETWORKS = {
+    "slow-4g": {"latency": 150, "downloadThroughput": 1.6e6 / 8, "uploadThroughput": 750e3 / 8},
+    "3g": {"latency": 300, "downloadThroughput": 750e3 / 8, "uploadThroughput": 250e3 / 8},
+}
+
+async def measure(browser, base_url, path, network):
+    context = await browser.new_context()
+    try:
+        page = await context.new_page()
+        errors = []
+        page.on("pageerror", lambda exc: errors.append(str(exc)))
+        cdp = await context.new_cdp_session(page)
+        await cdp.send("Network.enable")
+        await cdp.send("Network.setCacheDisabled", {"cacheDisabled": True})
+        await cdp.send("Network.emulateNetworkConditions", {"offline": False, **network})
+        await page.goto(f"{base_url}/{path}", wait_until="commit")
+        await page.wait_for_function("() => window.perfHook !== undefined && window.perfHook.startup.dozerCompleteMs !== null",
+                                     timeout=120000)
+        startup = await page.evaluate("() => window.perfHook.startup")
+    finally:
+        await context.close()
+    return {**startup, "pageErrors": errors}
+
+async def run_all(runs, network):
+    server = start_server()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    results = {mode: [] for mode in MODES}
+    try:
+        async with async_playwright() as p:
+            browser = await p.chromium.launch(headless=True)
+            try:
+                # Interleaved so both modes see the same machine load
+                for run in range(runs):
+                    for mode, path in MODES.items():
+                        r = await measure(browser, base_url, path, network)
+                        results[mode].append(r)
+                        print(f"   [PROGRESSIVE] run {run + 1} {mode:>6}: first dozer frame at {r['firstDozerFrameMs']:.0f} ms, "
+                              f"complete at {r['dozerCompleteMs']:.0f} ms")
+            finally:
+                await browser.close()
+    finally:
+        server.shutdown()
+    return results
+
+def summarize(runs):
+    return {metric: {"p50": percentile([r[metric] for r in runs], 0.5), "max": max(r[metric] for r in runs)}
+            for metric in METRICS}
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare time-to-first-dozer-frame for single-file and streamed models.")
+    parser.add_argument("--runs", type=int, default=5, help="Runs per mode")
+    parser.add_argument("--network", choices=sorted(NETWORKS), default="slow-4g", help="Throttling profile")
+    parser.add_argument("--output", default=RESULTS_PATH, help="Results JSON")
+    args = parser.parse_args()
+
+    missing = [path for path in MANIFESTS if not os.path.exists(path)]
+    if missing:
+        raise SystemExit(f"❌ {', '.join(os.path.relpath(p, ROOT_DIR) for p in missing)} missing; build the models first")
+
+    results = asyncio.run(run_all(args.runs, NETWORKS[args.network]))
+    summary = {mode: summarize(runs) for mode, runs in results.items()}
+    print(f"{'mode':>7} | {'first dozer frame p50':>21} | {'complete p50':>12}")
+    for mode, s in summary.items():
+        print(f"{mode:>7} | {s['firstDozerFrameMs']['p50']:>21.0f} | {s['dozerCompleteMs']['p50']:>12.0f}")
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump({
+            "generatedAt": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+            "commit": git_commit(),
+            "version": read_version(),
+            "network": {"profile": args.network, **NETWORKS[args.network]},
+            "summary": summary,
+            "runs": results,
+        }, f, indent=2)
+    print(f"   [PROGRESSIVE] Results written to {os.path.relpath(args.output, ROOT_DIR)}")
+
+    errors = [e for runs in results.values() for r in runs for e in r["pageErrors"]]
+    for error in errors:
+        print(f"   [PROGRESSIVE] page error: {error}")
+    if errors:
+        print(f"❌ {len(errors)} page error(s)")
+        return 1
+    before, after = summary["single"], summary["parts"]
+    if after["firstDozerFrameMs"]["p50"] > before["firstDozerFrameMs"]["p50"]:
+        print("❌ Streamed parts do not bring the first dozer frame forward")
+        return 1
+    print(f"✅ Streamed parts ({args.network}): first dozer frame {before['firstDozerFrameMs']['p50']:.0f} -> "
+          f"{after['firstDozerFrameMs']['p50']:.0f} ms")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
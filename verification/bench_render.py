@@ -0,0 +1,152 @@
+"""
+Render-performance scaling harness.
+
+Loads the real game (index.html) with `?gems=N` for each gem count, lets it
+warm up, then captures per-frame timings through `window.perfHook`
+(src/core/perf.js): frame interval (capped at 60 FPS by the game loop),
+physics time and steps, updateGraphics + render CPU time, and renderer.info
+(draw calls, triangles, geometries, textures). Prints p50/p95/p99 tables,
+writes a summary CSV (one row per gem count) and the raw per-frame series as
+JSON, and reports the first count whose p95 frame time misses 30 FPS.
+
+    python3 verification/bench_render.py
+    python3 verification/bench_render.py --gems 1000 5000 --frames 600 --csv /tmp/render.csv
+
+Counts run one after another (not concurrently) so they do not compete for the
+CPU/GPU. Headless Chromium renders with a software GL unless given GPU flags
+(--browser-arg=--use-angle=gl, --headed); times are CPU-side, GPU work is
+only visible through the frame interval.
+"""
+import argparse
+import asyncio
+import csv
+import datetime
+import json
+import os
+import sys
+
+from playwright.async_api import async_playwright
+
+from bench_physics import git_commit, percentile, read_version, start_server
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+REPORTS_DIR = os.path.join(ROOT_DIR, "verification", "reports")
+GEM_COUNTS = [1000, 5000, 10000, 20000]
+FRAME_BUDGET_MS = 1000 / 30
+TIMINGS = ["frameMs", "physicsMs", "graphicsMs"]
+COUNTERS = ["calls", "triangles", "geometries", "textures"]
+
+def summarize(series):
+    summary = {}
+    for key in TIMINGS:
+        values = series[key]
+        summary[key] = {q: round(percentile(values, p), 3) for q, p in (("p50", 0.5), ("p95", 0.95), ("p99", 0.99))}
+        summary[key]["max"] = round(max(values), 3)
+    for key in COUNTERS:
+        summary[key] = max(series[key])
+    summary["physicsStepsPerFrame"] = round(sum(series["physicsSteps"]) / len(series["physicsSteps"]), 3)
+    return summary
+
+async def measure(browser, base_url, gems, warmup, frames, drive, viewport):
+    context = await browser.new_context(viewport=viewport)
+    try:
+        page = await context.new_page()
+        errors = []
+        page.on("pageerror", lambda exc: errors.append(str(exc)))
+        await page.goto(f"{base_url}/index.html?gems={gems}")
+        await page.wait_for_function("() => window.perfHook !== undefined && window.bulldozer !== undefined")
+        if drive:
+            # Keep the dozer pushing gems so contacts and instance updates are exercised
+            await page.keyboard.down("KeyW")
+        await page.evaluate("(n) => window.perfHook.capture(n)", warmup)
+        series = await page.evaluate("(n) => window.perfHook.capture(n)", frames)
+        if drive:
+            await page.keyboard.up("KeyW")
+    finally:
+        await context.close()
+    return series, errors
+
+async def run_all(counts, warmup, frames, drive, viewport, headed, browser_args):
+    server = start_server()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    results = {}
+    try:
+        async with async_playwright() as p:
+            browser = await p.chromium.launch(headless=not headed, args=browser_args)
+            try:
+                for gems in counts:
+                    series, errors = await measure(browser, base_url, gems, warmup, frames, drive, viewport)
+                    summary = summarize(series)
+                    results[gems] = {"summary": summary, "series": series, "pageErrors": errors}
+                    frame = summary["frameMs"]
+                    print(f"   [RENDER] {gems:>6} gems: frame p50 {frame['p50']:.2f} / p95 {frame['p95']:.2f} / "
+                          f"p99 {frame['p99']:.2f} ms, {summary['calls']} draw calls")
+            finally:
+                await browser.close()
+    finally:
+        server.shutdown()
+    return results
+
+def print_table(results):
+    header = f"{'gems':>7} | " + " | ".join(f"{key:^23}" for key in TIMINGS) + " | calls | triangles | geoms"
+    print(header)
+    print(f"{'':>7} | " + " | ".join(f"{'p50':>7}{'p95':>8}{'p99':>8}" for _ in TIMINGS) + " |       |           |")
+    print("-" * len(header))
+    for gems, result in results.items():
+        s = result["summary"]
+        cells = " | ".join(f"{s[k]['p50']:>7.2f}{s[k]['p95']:>8.2f}{s[k]['p99']:>8.2f}" for k in TIMINGS)
+        print(f"{gems:>7} | {cells} | {s['calls']:>5} | {s['triangles']:>9} | {s['geometries']:>5}")
+
+def write_csv(results, path):
+    columns = ["gems"] + [f"{k}_{q}" for k in TIMINGS for q in ("p50", "p95", "p99", "max")] + COUNTERS + ["physicsStepsPerFrame"]
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(columns)
+        for gems, result in results.items():
+            s = result["summary"]
+            row = [gems] + [s[k][q] for k in TIMINGS for q in ("p50", "p95", "p99", "max")]
+            writer.writerow(row + [s[k] for k in COUNTERS] + [s["physicsStepsPerFrame"]])
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure how frame time, draw calls and physics scale with gem count.")
+    parser.add_argument("--gems", type=int, nargs="+", default=GEM_COUNTS, help="Total gem counts to test")
+    parser.add_argument("--frames", type=int, default=300, help="Frames captured per count")
+    parser.add_argument("--warmup", type=int, default=120, help="Frames discarded before capturing")
+    parser.add_argument("--no-drive", action="store_true", help="Leave the dozer idle instead of holding W")
+    parser.add_argument("--viewport", default="1280x720", help="WIDTHxHEIGHT")
+    parser.add_argument("--headed", action="store_true", help="Run a visible browser (real GPU)")
+    parser.add_argument("--browser-arg", action="append", default=[], help="Extra Chromium flag (repeatable)")
+    parser.add_argument("--csv", default=os.path.join(REPORTS_DIR, "render_scaling.csv"))
+    parser.add_argument("--json", default=os.path.join(REPORTS_DIR, "render_scaling.json"))
+    args = parser.parse_args()
+
+    width, height = (int(v) for v in args.viewport.lower().split("x"))
+    results = asyncio.run(run_all(sorted(args.gems), args.warmup, args.frames, not args.no_drive,
+                                  {"width": width, "height": height}, args.headed, args.browser_arg))
+    print_table(results)
+
+    for path in (args.csv, args.json):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    write_csv(results, args.csv)
+    with open(args.json, "w") as f:
+        json.dump({
+            "generatedAt": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+            "commit": git_commit(),
+            "version": read_version(),
+            "viewport": args.viewport,
+            "results": {str(g): r for g, r in results.items()},
+        }, f, indent=2)
+    print(f"   [RENDER] Wrote {os.path.relpath(args.csv, ROOT_DIR)} and {os.path.relpath(args.json, ROOT_DIR)}")
+
+    for gems, result in results.items():
+        for error in result["pageErrors"]:
+            print(f"   [RENDER] page error at {gems} gems: {error}")
+    over = [g for g, r in results.items() if r["summary"]["frameMs"]["p95"] > FRAME_BUDGET_MS]
+    if over:
+        print(f"⚠️ p95 frame time exceeds {FRAME_BUDGET_MS:.1f} ms (30 FPS) from {over[0]} gems")
+    else:
+        print(f"✅ p95 frame time within {FRAME_BUDGET_MS:.1f} ms up to {max(results)} gems")
+    return 1 if any(r["pageErrors"] for r in results.values()) else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,190 @@
+"""
+Gem settle-time benchmark: runtime uniform sampling vs precomputed layouts.
+
+Loads the game twice per run, once with `?gemLayout=random` (what
+spawnZoneGems did before pipeline/layouts/gem_layouts.py) and once with the
+precomputed Poisson-disk layouts, and from the first frame records:
+
+- overlapping gem pairs at spawn,
+- the settle time: when the fastest gem drops below --rest-speed for good,
+- physics ms per frame over the first second (the startup spike, via perfHook),
+- gems that ended up outside their zone (knocked through walls and gates).
+
+    python3 verification/bench_settle.py
+    python3 verification/bench_settle.py --runs 5 --frames 900
+
+Needs the layouts built first (`task assets:layouts`).
+"""
+import argparse
+import asyncio
+import datetime
+import json
+import os
+import sys
+
+from playwright.async_api import async_playwright
+
+from bench_physics import git_commit, percentile, read_version, start_server
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+INDEX_PATH = os.path.join(ROOT_DIR, "assets", "layouts", "gems.json")
+RESULTS_PATH = os.path.join(ROOT_DIR, "verification", "reports", "settle_bench.json")
+MODES = {"random": "index.html?gemLayout=random", "layout": "index.html"}
+STARTUP_FRAMES = 60
+ESCAPE_MARGIN = 20
+
+# Runs in the page from the first frame after initGems
+SAMPLE_GEMS = """async (frames) => {
+    const { world, Matter } = await import('/src/core/physics.js');
+    const gems = Matter.Composite.allBodies(world).filter(b => b.label === 'gem');
+    let overlaps = 0;
+    for (let i = 0; i < gems.length; i++) {
+        const a = gems[i];
+        for (let j = i + 1; j < gems.length; j++) {
+            const b = gems[j];
+            const dx = a.position.x - b.position.x, dy = a.position.y - b.position.y;
+            const r = a.circleRadius + b.circleRadius;
+            if (dx * dx + dy * dy < r * r) overlaps++;
+        }
+    }
+    const timing = window.perfHook.capture(frames);
+    const maxSpeed = new Float32Array(frames);
+    const elapsedMs = new Float64Array(frames);
+    const start = performance.now();
+    for (let f = 0; f < frames; f++) {
+        await new Promise(resolve => requestAnimationFrame(resolve));
+        let fastest = 0;
+        for (const g of gems) if (g.speed > fastest) fastest = g.speed;
+        maxSpeed[f] = fastest;
+        elapsedMs[f] = performance.now() - start;
+    }
+    return {
+        count: gems.length,
+        overlaps,
+        maxSpeed: Array.from(maxSpeed),
+        elapsedMs: Array.from(elapsedMs),
+        timing: await timing,
+        final: gems.map(g => [g.zoneId, g.position.x, g.position.y]),
+    };
+}"""
+
+def settle_index(max_speed, rest_speed):
+    """First frame after which no gem moves faster than rest_speed, or None."""
+    for i in range(len(max_speed) - 1, -1, -1):
+        if max_speed[i] >= rest_speed:
+            return i + 1 if i + 1 < len(max_speed) else None
+    return 0
+
+def escaped(final, zones):
+    count = 0
+    for zone_id, x, y in final:
+        x0, x1, y0, y1 = zones[str(zone_id)]["bounds"]
+        if not (x0 - ESCAPE_MARGIN <= x <= x1 + ESCAPE_MARGIN and y0 - ESCAPE_MARGIN <= y <= y1 + ESCAPE_MARGIN):
+            count += 1
+    return count
+
+async def measure(browser, base_url, path, frames, rest_speed, zones):
+    context = await browser.new_context()
+    try:
+        page = await context.new_page()
+        errors = []
+        page.on("pageerror", lambda exc: errors.append(str(exc)))
+        await page.goto(f"{base_url}/{path}", wait_until="commit")
+        await page.wait_for_function("() => window.state !== undefined && window.perfHook !== undefined")
+        data = await page.evaluate(SAMPLE_GEMS, frames)
+    finally:
+        await context.close()
+
+    settle = settle_index(data["maxSpeed"], rest_speed)
+    physics = data["timing"]["physicsMs"][:STARTUP_FRAMES]
+    return {
+        "gems": data["count"],
+        "overlapsAtSpawn": data["overlaps"],
+        "settleFrame": settle,
+        "settleMs": None if settle is None else (data["elapsedMs"][settle] if settle else 0.0),
+        "peakGemSpeed": max(data["maxSpeed"]),
+        "startupPhysicsMs": {"p50": percentile(physics, 0.5), "p95": percentile(physics, 0.95), "max": max(physics), "total": sum(physics)},
+        "escaped": escaped(data["final"], zones),
+        "pageErrors": errors,
+    }
+
+async def run_all(runs, frames, rest_speed, zones):
+    server = start_server()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    results = {mode: [] for mode in MODES}
+    try:
+        async with async_playwright() as p:
+            browser = await p.chromium.launch(headless=True)
+            try:
+                # Sequential and interleaved so both modes see the same machine load
+                for run in range(runs):
+                    for mode, path in MODES.items():
+                        r = await measure(browser, base_url, path, frames, rest_speed, zones)
+                        results[mode].append(r)
+                        settle = "never" if r["settleMs"] is None else f"{r['settleMs']:.0f} ms"
+                        print(f"   [SETTLE] run {run + 1} {mode:>6}: {r['overlapsAtSpawn']} overlaps, settled {settle}, "
+                              f"startup physics p95 {r['startupPhysicsMs']['p95']:.2f} ms, {r['escaped']} escaped")
+            finally:
+                await browser.close()
+    finally:
+        server.shutdown()
+    return results
+
+def summarize(runs):
+    settled = [r["settleMs"] for r in runs if r["settleMs"] is not None]
+    return {
+        "overlapsAtSpawn": sum(r["overlapsAtSpawn"] for r in runs) / len(runs),
+        "settleMs": sum(settled) / len(settled) if settled else None,
+        "unsettledRuns": len(runs) - len(settled),
+        "startupPhysicsP95": sum(r["startupPhysicsMs"]["p95"] for r in runs) / len(runs),
+        "startupPhysicsTotal": sum(r["startupPhysicsMs"]["total"] for r in runs) / len(runs),
+        "escaped": sum(r["escaped"] for r in runs) / len(runs),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare gem settle time with and without precomputed layouts.")
+    parser.add_argument("--runs", type=int, default=3, help="Runs per mode")
+    parser.add_argument("--frames", type=int, default=600, help="Frames sampled per run")
+    parser.add_argument("--rest-speed", type=float, default=0.05, help="Gem speed (px/frame) that counts as settled")
+    parser.add_argument("--output", default=RESULTS_PATH, help="Results JSON")
+    args = parser.parse_args()
+
+    if not os.path.exists(INDEX_PATH):
+        raise SystemExit(f"❌ {os.path.relpath(INDEX_PATH, ROOT_DIR)} missing; build the gem layouts first")
+    with open(INDEX_PATH) as f:
+        zones = json.load(f)["zones"]
+
+    results = asyncio.run(run_all(args.runs, args.frames, args.rest_speed, zones))
+    summary = {mode: summarize(runs) for mode, runs in results.items()}
+    print(f"{'mode':>7} | {'overlaps':>8} | {'settle ms':>9} | {'physics p95':>11} | {'physics 1s':>10} | escaped")
+    for mode, s in summary.items():
+        settle = "never" if s["settleMs"] is None else f"{s['settleMs']:.0f}"
+        print(f"{mode:>7} | {s['overlapsAtSpawn']:>8.1f} | {settle:>9} | {s['startupPhysicsP95']:>11.2f} | "
+              f"{s['startupPhysicsTotal']:>10.1f} | {s['escaped']:.1f}")
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump({
+            "generatedAt": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+            "commit": git_commit(),
+            "version": read_version(),
+            "summary": summary,
+            "runs": results,
+        }, f, indent=2)
+    print(f"   [SETTLE] Results written to {os.path.relpath(args.output, ROOT_DIR)}")
+
+    errors = [e for runs in results.values() for r in runs for e in r["pageErrors"]]
+    for error in errors:
+        print(f"   [SETTLE] page error: {error}")
+    if errors:
+        print(f"❌ {len(errors)} page error(s)")
+        return 1
+    before, after = summary["random"], summary["layout"]
+    if after["overlapsAtSpawn"] or (after["settleMs"] is None and before["settleMs"] is not None):
+        print("❌ Precomputed layouts do not settle better than runtime sampling")
+        return 1
+    print("✅ Precomputed layouts spawn without overlaps")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
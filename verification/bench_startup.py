@@ -0,0 +1,115 @@
+"""
+Startup benchmark: textures drawn on canvases at startup vs prebaked PNGs.
+
+Loads the game in a fresh context per run, once with `?textures=canvas` (what
+graphics.js did before pipeline/textures/runtime_textures.py) and once with
+the prebaked textures, and reads perfHook.startup:
+
+- initThree ms: main-thread time of initThree(), which drew the dirt and track
+  canvases,
+- first frame ms: time from navigation to the first rendered frame,
+- first render ms: that frame's updateGraphics(), which uploads the textures
+  (and drew the pad labels on canvases).
+
+    python3 verification/bench_startup.py
+    python3 verification/bench_startup.py --runs 10
+
+Needs the textures built first (`task assets:textures:runtime`).
+"""
+import argparse
+import asyncio
+import datetime
+import json
+import os
+import sys
+
+from playwright.async_api import async_playwright
+
+from bench_physics import git_commit, percentile, read_version, start_server
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+INDEX_PATH = os.path.join(ROOT_DIR, "assets", "textures", "runtime_textures.json")
+RESULTS_PATH = os.path.join(ROOT_DIR, "verification", "reports", "startup_bench.json")
+MODES = {"canvas": "index.html?textures=canvas", "baked": "index.html"}
+METRICS = ("initThreeMs", "firstFrameMs", "firstRenderMs")
+
+async def measure(browser, base_url, path):
+    context = await browser.new_context()
+    try:
+        page = await context.new_page()
+        errors = []
+        page.on("pageerror", lambda exc: errors.append(str(exc)))
+        await page.goto(f"{base_url}/{path}", wait_until="commit")
+        await page.wait_for_function("() => window.perfHook !== undefined && window.perfHook.startup.firstFrameMs !== null")
+        startup = await page.evaluate("() => window.perfHook.startup")
+    finally:
+        await context.close()
+    return {**startup, "pageErrors": errors}
+
+async def run_all(runs):
+    server = start_server()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    results = {mode: [] for mode in MODES}
+    try:
+        async with async_playwright() as p:
+            browser = await p.chromium.launch(headless=True)
+            try:
+                # Interleaved so both modes see the same machine load
+                for run in range(runs):
+                    for mode, path in MODES.items():
+                        r = await measure(browser, base_url, path)
+                        results[mode].append(r)
+                        print(f"   [STARTUP] run {run + 1} {mode:>6}: initThree {r['initThreeMs']:.1f} ms, "
+                              f"first frame at {r['firstFrameMs']:.0f} ms ({r['firstRenderMs']:.1f} ms to render)")
+            finally:
+                await browser.close()
+    finally:
+        server.shutdown()
+    return results
+
+def summarize(runs):
+    return {metric: {"p50": percentile([r[metric] for r in runs], 0.5), "max": max(r[metric] for r in runs)}
+            for metric in METRICS}
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare startup with canvas-drawn and prebaked runtime textures.")
+    parser.add_argument("--runs", type=int, default=5, help="Runs per mode")
+    parser.add_argument("--output", default=RESULTS_PATH, help="Results JSON")
+    args = parser.parse_args()
+
+    if not os.path.exists(INDEX_PATH):
+        raise SystemExit(f"❌ {os.path.relpath(INDEX_PATH, ROOT_DIR)} missing; bake the runtime textures first")
+
+    results = asyncio.run(run_all(args.runs))
+    summary = {mode: summarize(runs) for mode, runs in results.items()}
+    print(f"{'mode':>7} | {'initThree p50':>13} | {'first frame p50':>15} | {'first render p50':>16}")
+    for mode, s in summary.items():
+        print(f"{mode:>7} | {s['initThreeMs']['p50']:>13.1f} | {s['firstFrameMs']['p50']:>15.0f} | "
+              f"{s['firstRenderMs']['p50']:>16.1f}")
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump({
+            "generatedAt": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+            "commit": git_commit(),
+            "version": read_version(),
+            "summary": summary,
+            "runs": results,
+        }, f, indent=2)
+    print(f"   [STARTUP] Results written to {os.path.relpath(args.output, ROOT_DIR)}")
+
+    errors = [e for runs in results.values() for r in runs for e in r["pageErrors"]]
+    for error in errors:
+        print(f"   [STARTUP] page error: {error}")
+    if errors:
+        print(f"❌ {len(errors)} page error(s)")
+        return 1
+    before, after = summary["canvas"], summary["baked"]
+    if after["initThreeMs"]["p50"] > before["initThreeMs"]["p50"]:
+        print("❌ Prebaked textures do not shorten initThree()")
+        return 1
+    print(f"✅ Prebaked textures: initThree {before['initThreeMs']['p50']:.1f} -> {after['initThreeMs']['p50']:.1f} ms")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,175 @@
+"""
+Shared fixtures for the pytest verification suite.
+
+One in-process static server (ephemeral port) and one Chromium serve the
+whole run; tests only open contexts, drawn from a small per-worker pool.
+Under pytest-xdist the controller starts both and hands the URL and the
+browser's CDP endpoint to every worker, so sharding tests over workers still
+means a single browser launch:
+
+    python3 -m pytest verification -n auto
+    python3 -m pytest verification -k physics
+
+Without -n everything lives in the one process. A per-test wall-clock table
+is printed at the end of the run.
+"""
+import os
+import shutil
+import tempfile
+import time
+
+import pytest
+
+VIEWPORT = {"width": 1280, "height": 720}
+# nodeid -> setup + call + teardown seconds (under xdist, reports reach the controller)
+TIMINGS = {}
+
+def pytest_addoption(parser):
+    group = parser.getgroup("verification")
+    group.addoption("--contexts", type=int, default=2, help="Browser contexts pooled per worker")
+    group.addoption("--headed", action="store_true", help="Run a visible browser (single process only)")
+
+# --- Shared server and browser (controller) ---
+class SharedBrowser:
+    """Started once in the xdist controller; workers connect over CDP."""
+
+    def __init__(self):
+        from playwright.sync_api import sync_playwright
+
+        from bench_physics import start_server
+
+        self.server = start_server()
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self.profile = tempfile.mkdtemp(prefix="verification-chromium-")
+        self.playwright = sync_playwright().start()
+        # A persistent context writes DevToolsActivePort, which gives us the ephemeral CDP port
+        self.context = self.playwright.chromium.launch_persistent_context(
+            self.profile, headless=True, args=["--remote-debugging-port=0"])
+        self.cdp_url = f"http://127.0.0.1:{self._devtools_port()}"
+
+    def _devtools_port(self, timeout=10.0):
+        path = os.path.join(self.profile, "DevToolsActivePort")
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if os.path.exists(path):
+                with open(path) as f:
+                    port = f.readline().strip()
+                if port:
+                    return int(port)
+            time.sleep(0.05)
+        raise RuntimeError("Chromium did not report a DevTools port")
+
+    def pytest_configure_node(self, node):
+        node.workerinput["verification_base_url"] = self.base_url
+        node.workerinput["verification_cdp_url"] = self.cdp_url
+
+    def close(self):
+        self.context.close()
+        self.playwright.stop()
+        self.server.shutdown()
+        shutil.rmtree(self.profile, ignore_errors=True)
+
+def pytest_configure(config):
+    config._verification_started = time.perf_counter()
+    is_controller = not hasattr(config, "workerinput")
+    if is_controller and config.pluginmanager.hasplugin("xdist") and config.getoption("numprocesses", None):
+        try:
+            shared = SharedBrowser()
+        except ImportError:
+            return  # Browser tests skip themselves without Playwright
+        config._verification_shared = shared
+        config.pluginmanager.register(shared, "verification-shared-browser")
+
+def pytest_unconfigure(config):
+    shared = getattr(config, "_verification_shared", None)
+    if shared:
+        shared.close()
+
+# --- Fixtures (per worker) ---
+class ContextPool:
+    """Reuses warm browser contexts between tests; each test gets a fresh page."""
+
+    def __init__(self, browser, size, init_scripts=()):
+        self.browser = browser
+        self.init_scripts = init_scripts
+        self.idle = [self._create() for _ in range(max(1, size))]
+
+    def _create(self):
+        context = self.browser.new_context(viewport=VIEWPORT, device_scale_factor=1)
+        for script in self.init_scripts:
+            context.add_init_script(script)
+        return context
+
+    def acquire(self):
+        return self.idle.pop() if self.idle else self._create()
+
+    def release(self, context):
+        for page in context.pages:
+            page.close()
+        context.clear_cookies()
+        self.idle.append(context)
+
+    def close(self):
+        for context in self.idle:
+            context.close()
+        self.idle = []
+
+@pytest.fixture(scope="session")
+def base_url(request):
+    pytest.importorskip("playwright.sync_api")
+    workerinput = getattr(request.config, "workerinput", {})
+    if "verification_base_url" in workerinput:
+        yield workerinput["verification_base_url"]
+        return
+    from bench_physics import start_server
+
+    server = start_server()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+
+@pytest.fixture(scope="session")
+def browser(request):
+    sync_api = pytest.importorskip("playwright.sync_api")
+
+    workerinput = getattr(request.config, "workerinput", {})
+    with sync_api.sync_playwright() as p:
+        if "verification_cdp_url" in workerinput:
+            browser = p.chromium.connect_over_cdp(workerinput["verification_cdp_url"])
+        else:
+            browser = p.chromium.launch(headless=not request.config.getoption("headed"))
+        yield browser
+        # Over CDP this only disconnects; the controller owns the process
+        browser.close()
+
+@pytest.fixture(scope="session")
+def context_pool(request, browser):
+    from visual_regression import SEED, SEEDED_RANDOM
+
+    # Seeded Math.random everywhere: physics ignores it, screenshots depend on it
+    pool = ContextPool(browser, request.config.getoption("contexts"), [SEEDED_RANDOM % SEED])
+    yield pool
+    pool.close()
+
+@pytest.fixture
+def page(context_pool):
+    context = context_pool.acquire()
+    page = context.new_page()
+    page.errors = []
+    page.on("pageerror", lambda exc: page.errors.append(str(exc)))
+    yield page
+    context_pool.release(context)
+
+# --- Timing report ---
+def pytest_runtest_logreport(report):
+    TIMINGS[report.nodeid] = TIMINGS.get(report.nodeid, 0.0) + report.duration
+
+def pytest_terminal_summary(terminalreporter, config):
+    if not TIMINGS:
+        return
+    wall = time.perf_counter() - config._verification_started
+    terminalreporter.section("verification timings")
+    for nodeid, seconds in sorted(TIMINGS.items(), key=lambda item: -item[1]):
+        terminalreporter.write_line(f"{seconds:8.2f}s  {nodeid}")
+    total = sum(TIMINGS.values())
+    terminalreporter.write_line(f"{total:8.2f}s  summed over {len(TIMINGS)} test(s), {wall:.2f}s wall clock "
+                                f"({total / wall if wall else 0:.1f}x parallel)")
@@ -0,0 +1,297 @@
+# /// script
+# dependencies = [
+#   "numpy",
+#   "playwright",
+# ]
+# ///
+"""
+Offline drive-model simulator for progression tuning.
+
+Re-implements the bulldozer's drive in NumPy: the compound body mass from
+src/entities/bulldozer.js (part areas x level density), the power / load
+factor, steering and lateral friction from src/core/input.js, and Matter.js
+0.19 Verlet integration with frictionAir at a fixed 1000/60 ms step. There
+are no collisions in the model, which matches scaling_harness.html (a lone
+dozer in an empty world).
+
+Every dozerLevel x plowLevel combination, times every value of any swept
+tuning parameter, is stepped together as one array, so the full 20x20 grid
+(or thousands of candidate configs) runs in well under a second:
+
+    uv run verification/drive_model.py
+    uv run verification/drive_model.py --param powerGrowth=1.15,1.18,1.2 --param frictionAir=0.015,0.02,0.03
+    uv run verification/drive_model.py --cross-check                # replay bench scenarios in the browser
+    uv run verification/drive_model.py --cross-check verification/baselines/physics_bench.json
+
+The sweep writes one CSV row per combination and fails (exit 1) when any
+combination shows a speed explosion while turning. --cross-check replays the
+bench_physics.py scenarios through the model and checks the speed / angle
+curves against the real harness (live with Playwright, or from a stored
+report) with the same tolerances as the benchmark.
+"""
+import argparse
+import csv
+import itertools
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+SWEEP_PATH = os.path.join(ROOT_DIR, "verification", "reports", "drive_sweep.csv")
+
+# Constants as they are in bulldozer.js / input.js; any of them can be swept with --param
+DEFAULTS = {
+    "frictionAir": 0.02,
+    "turnSpeed": 0.04,
+    "angularDamping": 0.9,
+    "lateralFriction": 0.15,
+    "basePower": 0.002,
+    "powerGrowth": 1.20,
+    "loadStep": 0.1,
+    "loadClamp": 2.0,
+    "baseDensity": 0.002,
+    "densityStep": 0.0001,
+}
+DELTA_MS = 1000 / 60
+LEVELS = range(1, 21)
+# Same scenarios as bench_physics.py
+ACCEL_PHASES = [({"KeyW": True}, 300)]
+TURN_PHASES = [({"KeyW": True}, 120), ({"KeyW": True, "KeyD": True}, 120)]
+EXPLOSION_SPEED = 100
+# Turning never adds energy, so a turn faster than the straight-line top speed is an explosion
+OVERSHOOT = 1.05
+
+# --- Model ---
+def dozer_area(dozer, plow):
+    """Summed part areas of the compound body (chassis, plow, wings from plow level 3)."""
+    visual_scale = 1.0 + (dozer - 1) * 0.15
+    body_size = 45 * visual_scale
+    plow_width = (26 + plow * 14) * 1.5 * visual_scale
+    plow_height = 22 * visual_scale
+    wing_scale = 1.0 + (plow - 3) * 0.1
+    wings = 2 * (40 * wing_scale * visual_scale) * (15 * wing_scale * visual_scale)
+    return body_size * body_size + plow_width * plow_height + np.where(plow >= 3, wings, 0.0)
+
+def dozer_mass(dozer, plow, params):
+    # Body.setDensity on the parent: mass = density * total area
+    return (params["baseDensity"] + dozer * params["densityStep"]) * dozer_area(dozer, plow)
+
+def drive_power(dozer, plow, params):
+    clamp = params["loadClamp"]
+    load = 1.0 + np.clip(dozer - plow, -clamp, clamp) * params["loadStep"]
+    return params["basePower"] * params["powerGrowth"] ** dozer * load
+
+def terminal_speed(dozer, plow, params):
+    """Fixed point of v = v * (1 - frictionAir) + F / m * dt^2 under full throttle."""
+    accel = drive_power(dozer, plow, params) / dozer_mass(dozer, plow, params) * DELTA_MS ** 2
+    return accel / params["frictionAir"]
+
+def controls(keys):
+    """Throttle / turn exactly as the keyboard branch of input.js derives them."""
+    throttle = (1 if keys.get("ArrowUp") or keys.get("KeyW") else 0) - (1 if keys.get("ArrowDown") or keys.get("KeyS") else 0)
+    turn = (1 if keys.get("ArrowRight") or keys.get("KeyD") else 0) - (1 if keys.get("ArrowLeft") or keys.get("KeyA") else 0)
+    return throttle, turn
+
+def simulate(dozer, plow, phases, params=None):
+    """Steps every combination from rest through `phases` ([(keys, frames), ...]).
+
+    dozer, plow and any entry of params may be scalars or arrays; they are
+    broadcast to one flat batch. Returns (speed, angle), each (frames, batch).
+    """
+    params = {**DEFAULTS, **(params or {})}
+    names = list(params)
+    arrays = np.broadcast_arrays(np.asarray(dozer, float), np.asarray(plow, float), *(np.asarray(params[n], float) for n in names))
+    dozer, plow = (a.ravel() for a in arrays[:2])
+    p = {n: a.ravel() for n, a in zip(names, arrays[2:])}
+
+    # dt^2 / m folded in once: the force only ever appears as F / m * dt^2
+    accel = drive_power(dozer, plow, p) / dozer_mass(dozer, plow, p) * DELTA_MS ** 2
+    damping = 1.0 - p["frictionAir"]
+
+    n = dozer.size
+    total = sum(frames for _, frames in phases)
+    speed_out = np.empty((total, n))
+    angle_out = np.empty((total, n))
+    vx, vy, angle, spin = np.zeros(n), np.zeros(n), np.zeros(n), np.zeros(n)
+
+    frame = 0
+    for keys, frames in phases:
+        throttle, turn = controls(keys)
+        for _ in range(frames):
+            # beforeUpdate (input.js): steering, then lateral friction, then drive force
+            if turn:
+                spin = turn * p["turnSpeed"] * np.ones(n)
+            else:
+                spin = spin * p["angularDamping"]
+            cos_a, sin_a = np.cos(angle), np.sin(angle)
+            lateral = np.where(np.hypot(vx, vy) > 0.1, (vx * cos_a + vy * sin_a) * p["lateralFriction"], 0.0)
+            vx = vx - cos_a * lateral
+            vy = vy - sin_a * lateral
+
+            # Body.update: Verlet with frictionAir; heading is angle - PI/2, i.e. (sin a, -cos a)
+            drive = throttle * accel
+            vx = vx * damping + sin_a * drive
+            vy = vy * damping - cos_a * drive
+            spin = spin * damping
+            angle = angle + spin
+
+            speed_out[frame] = np.hypot(vx, vy)
+            angle_out[frame] = angle
+            frame += 1
+    return speed_out, angle_out
+
+# --- Sweep ---
+def parse_params(specs):
+    swept = {}
+    for spec in specs:
+        name, _, values = spec.partition("=")
+        if name not in DEFAULTS:
+            raise ValueError(f"unknown parameter '{name}' (one of {', '.join(DEFAULTS)})")
+        swept[name] = [float(v) for v in values.split(",") if v]
+    return swept
+
+def sweep(levels, swept):
+    """Cartesian product of dozer level x plow level x swept values, simulated in one batch."""
+    names = list(swept)
+    combos = list(itertools.product(levels, levels, *(swept[n] for n in names)))
+    grid = np.array(combos, dtype=float).reshape(len(combos), 2 + len(names))
+    dozer, plow = grid[:, 0], grid[:, 1]
+    params = {**DEFAULTS, **{n: grid[:, 2 + i] for i, n in enumerate(names)}}
+
+    accel_speed, _ = simulate(dozer, plow, ACCEL_PHASES, params)
+    turn_speed, _ = simulate(dozer, plow, TURN_PHASES, params)
+
+    top = terminal_speed(dozer, plow, params)
+    reached = accel_speed >= 0.9 * top
+    frames_to_90 = np.where(reached.any(axis=0), reached.argmax(axis=0) + 1, -1)
+    turn_max = np.nan_to_num(turn_speed.max(axis=0), nan=np.inf)
+    explosion = (turn_max > EXPLOSION_SPEED) | (turn_max > top * OVERSHOOT)
+    return {
+        "names": names,
+        "dozer": dozer.astype(int),
+        "plow": plow.astype(int),
+        "params": params,
+        "mass": dozer_mass(dozer, plow, params),
+        "terminalSpeed": top,
+        "finalSpeed": accel_speed[-1],
+        "framesTo90": frames_to_90,
+        "turnMaxSpeed": turn_max,
+        "explosion": explosion,
+    }
+
+def write_sweep(result, path):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    names = result["names"]
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["dozerLevel", "plowLevel"] + names + ["mass", "terminalSpeed", "finalSpeed", "framesTo90", "turnMaxSpeed", "explosion"])
+        for i in range(result["dozer"].size):
+            writer.writerow(
+                [result["dozer"][i], result["plow"][i]]
+                + [result["params"][n][i] for n in names]
+                + [f"{result['mass'][i]:.4f}", f"{result['terminalSpeed'][i]:.4f}", f"{result['finalSpeed'][i]:.4f}",
+                   result["framesTo90"][i], f"{result['turnMaxSpeed'][i]:.4f}", int(result["explosion"][i])]
+            )
+
+def print_balanced(result):
+    """Balanced progression (engine == plow) at the default constants: the curve tuning targets."""
+    mask = result["dozer"] == result["plow"]
+    for name in result["names"]:
+        mask &= result["params"][name] == DEFAULTS[name]
+    if not mask.any():
+        return
+    print(f"{'level':>5} | {'mass':>8} | {'top speed':>9} | {'5s speed':>8} | {'to 90%':>6} | gain")
+    previous = None
+    for i in np.flatnonzero(mask):
+        top = result["terminalSpeed"][i]
+        gain = f"{(top / previous - 1) * 100:+.1f}%" if previous else ""
+        frames = result["framesTo90"][i]
+        print(f"{result['dozer'][i]:>5} | {result['mass'][i]:>8.2f} | {top:>9.2f} | {result['finalSpeed'][i]:>8.2f} | "
+              f"{frames if frames > 0 else '>300':>6} | {gain}")
+        previous = top
+
+# --- Cross-check ---
+def cross_check(report_path, speed_tolerance, angle_tolerance):
+    """Replays the bench_physics.py scenarios through the model and diffs against the harness curves."""
+    # Imported here so sweeps do not start a browser stack
+    from bench_physics import SCENARIOS, curve_drift, run_all
+
+    if report_path:
+        with open(report_path) as f:
+            harness = json.load(f)["scenarios"]
+        print(f"   [MODEL] Cross-checking against {os.path.relpath(report_path, ROOT_DIR)}")
+    else:
+        import asyncio
+        print("   [MODEL] Running scaling_harness.html scenarios in Chromium...")
+        harness = asyncio.run(run_all(list(SCENARIOS), len(SCENARIOS)))
+
+    failures = []
+    for name, (level, phases) in SCENARIOS.items():
+        real = harness.get(name)
+        if real is None:
+            continue
+        speed, angle = simulate(level, level, phases)
+        allowed = speed_tolerance * max(real["maxSpeed"], 1.0)
+        speed_drift = curve_drift(speed[:, 0].tolist(), real["speed"])
+        angle_drift = curve_drift(angle[:, 0].tolist(), real["angle"])
+        print(f"   [MODEL] {name}: speed drift {speed_drift:.4f} (allowed {allowed:.4f}), angle drift {angle_drift:.5f} rad")
+        if speed_drift > allowed:
+            failures.append(f"{name}: model speed curve off by {speed_drift:.4f}")
+        if angle_drift > angle_tolerance:
+            failures.append(f"{name}: model angle curve off by {angle_drift:.5f} rad")
+    return failures
+
+# --- Execution ---
+def main():
+    parser = argparse.ArgumentParser(description="Vectorized bulldozer drive model for progression sweeps.")
+    parser.add_argument("--levels", type=int, default=max(LEVELS), help="Sweep levels 1..N for engine and plow")
+    parser.add_argument("--param", action="append", default=[], metavar="NAME=V1,V2,...",
+                        help=f"Sweep a tuning constant (repeatable): {', '.join(DEFAULTS)}")
+    parser.add_argument("--output", default=SWEEP_PATH, help="Sweep CSV")
+    parser.add_argument("--cross-check", nargs="?", const="", metavar="REPORT",
+                        help="Check the model against the harness: live, or from a bench_physics.py JSON")
+    parser.add_argument("--speed-tolerance", type=float, default=0.02, help="Allowed speed drift, fraction of the curve's max")
+    parser.add_argument("--angle-tolerance", type=float, default=0.01, help="Allowed angle drift (rad)")
+    args = parser.parse_args()
+
+    if args.cross_check is not None:
+        failures = cross_check(args.cross_check or None, args.speed_tolerance, args.angle_tolerance)
+        for failure in failures:
+            print(f"   [MISMATCH] {failure}")
+        if failures:
+            print(f"❌ Model disagrees with the harness ({len(failures)} curve(s))")
+            return 1
+        print("✅ Model matches the harness")
+        return 0
+
+    try:
+        swept = parse_params(args.param)
+    except ValueError as e:
+        parser.error(str(e))
+
+    start = time.perf_counter()
+    result = sweep(range(1, args.levels + 1), swept)
+    elapsed = time.perf_counter() - start
+    print(f"   [MODEL] {result['dozer'].size} combinations x {ACCEL_PHASES[0][1]} + "
+          f"{sum(f for _, f in TURN_PHASES)} frames in {elapsed:.2f}s")
+    print_balanced(result)
+    write_sweep(result, args.output)
+    print(f"   [MODEL] Sweep written to {os.path.relpath(args.output, ROOT_DIR)}")
+
+    exploded = np.flatnonzero(result["explosion"])
+    for i in exploded[:10]:
+        config = ", ".join(f"{n}={result['params'][n][i]:g}" for n in result["names"])
+        print(f"   [EXPLOSION] engine {result['dozer'][i]}, plow {result['plow'][i]}"
+              f"{' (' + config + ')' if config else ''}: turning speed {result['turnMaxSpeed'][i]:.1f} "
+              f"vs top speed {result['terminalSpeed'][i]:.1f}")
+    if exploded.size:
+        print(f"❌ Speed explosion in {exploded.size} combination(s)")
+        return 1
+    print("✅ No speed explosions")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,39 @@
+"""NumPy drive model: self-consistency, and agreement with the real harness when a browser is available."""
+import numpy as np
+import pytest
+
+from drive_model import DEFAULTS, simulate, sweep, terminal_speed
+
+def test_speed_converges_to_terminal_speed():
+    speed, _ = simulate(np.arange(1, 21), np.arange(1, 21), [({"KeyW": True}, 2000)])
+    levels = np.arange(1, 21, dtype=float)
+    assert np.allclose(speed[-1], terminal_speed(levels, levels, DEFAULTS), rtol=1e-6)
+
+def test_batch_matches_single_runs():
+    phases = [({"KeyW": True}, 60), ({"KeyW": True, "KeyA": True}, 60)]
+    batch, batch_angle = simulate([1, 7, 20], [3, 7, 1], phases)
+    for i, (dozer, plow) in enumerate([(1, 3), (7, 7), (20, 1)]):
+        speed, angle = simulate(dozer, plow, phases)
+        assert np.array_equal(speed[:, 0], batch[:, i])
+        assert np.array_equal(angle[:, 0], batch_angle[:, i])
+
+def test_default_grid_has_no_explosion():
+    result = sweep(range(1, 21), {})
+    assert result["dozer"].size == 400
+    assert not result["explosion"].any()
+
+def test_unstable_lateral_friction_is_flagged():
+    result = sweep([1, 10], {"lateralFriction": [0.15, -0.5]})
+    unstable = result["params"]["lateralFriction"] < 0
+    assert result["explosion"][unstable].all()
+    assert not result["explosion"][~unstable].any()
+
+@pytest.mark.parametrize("name", ["accel_l1", "accel_l10", "turn_l20"])
+def test_matches_harness(page, base_url, name):
+    from bench_physics import SCENARIOS, curve_drift, drive, scenario_steps, summarize
+
+    level, phases = SCENARIOS[name]
+    real = summarize(level, drive(page, scenario_steps(base_url, level, phases)), page.errors)
+    speed, angle = simulate(level, level, phases)
+    assert curve_drift(speed[:, 0].tolist(), real["speed"]) <= 0.02 * max(max(real["speed"]), 1.0)
+    assert curve_drift(angle[:, 0].tolist(), real["angle"]) <= 0.01
@@ -0,0 +1,23 @@
+"""Physics scenarios from bench_physics.py against the stored baseline (curves only, no timing)."""
+import json
+import os
+
+import pytest
+
+pytest.importorskip("playwright.sync_api")
+
+from bench_physics import BASELINE_PATH, SCENARIOS, check_scenario, compare, drive, scenario_steps, summarize
+
+@pytest.mark.parametrize("name", list(SCENARIOS))
+def test_scenario(page, base_url, name):
+    level, phases = SCENARIOS[name]
+    result = summarize(level, drive(page, scenario_steps(base_url, level, phases)), page.errors)
+    assert check_scenario(name, result) == []
+
+    if not os.path.exists(BASELINE_PATH):
+        pytest.skip("no physics baseline recorded (bench_physics.py --update-baseline)")
+    with open(BASELINE_PATH) as f:
+        baseline = json.load(f)
+    if name not in baseline.get("scenarios", {}):
+        pytest.skip(f"{name} not in the baseline")
+    assert compare({name: result}, baseline, check_timing=False) == []
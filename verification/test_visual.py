@@ -0,0 +1,20 @@
+"""Visual regression cases from visual_regression.py, one test per case."""
+import os
+
+import pytest
+
+pytest.importorskip("playwright.sync_api")
+
+from bench_physics import drive
+from visual_regression import BASELINE_DIR, CASES, REPORT_DIR, capture_steps, check_capture
+
+@pytest.mark.parametrize("name", list(CASES))
+def test_case(page, base_url, name):
+    if not os.path.exists(os.path.join(BASELINE_DIR, f"{name}.png")):
+        pytest.skip("no baseline recorded (visual_regression.py --update-baseline)")
+
+    os.makedirs(REPORT_DIR, exist_ok=True)
+    path = os.path.join(REPORT_DIR, f"{name}.png")
+    drive(page, capture_steps(base_url, name, path))
+    assert not page.errors
+    assert check_capture(name, path)[1] == []
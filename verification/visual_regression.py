@@ -0,0 +1,221 @@
+# /// script
+# dependencies = [
+#   "numpy",
+#   "Pillow",
+#   "playwright",
+# ]
+# ///
+"""
+Visual regression runner for the game view.
+
+Every case loads index.html in its own page (in parallel) with a seeded
+Math.random, applies a state change through `window.applyStateAndRender`
+(src/core/game.js) and screenshots once `frameSync` reports a frame rendered
+with that state and all dozer assets loaded, with no sleeps. Animations
+(the coin drop) are paused at a fixed time first.
+
+Screenshots are compared with stored baselines: per-channel delta (share of
+pixels off by more than --pixel-threshold) and SSIM on luminance, both in
+NumPy. Failing cases get a heatmap next to the capture in
+verification/reports/visual/. The per-case steps (capture_steps, check_capture)
+and the thresholds are shared with verification/test_visual.py.
+
+    uv run verification/visual_regression.py
+    uv run verification/visual_regression.py plow_lvl_3 coin_drop
+    uv run verification/visual_regression.py --update-baseline
+"""
+import argparse
+import asyncio
+import os
+import sys
+
+import numpy as np
+from PIL import Image
+from playwright.async_api import async_playwright
+
+from bench_physics import drive_async, start_server
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+BASELINE_DIR = os.path.join(ROOT_DIR, "verification", "baselines", "visual")
+REPORT_DIR = os.path.join(ROOT_DIR, "verification", "reports", "visual")
+VIEWPORT = {"width": 1280, "height": 720}
+SEED = 1337
+# Elements whose text changes between runs regardless of what is rendered
+MASKED = ["#fps-counter", "#build-timestamp"]
+# Lowest accepted mean SSIM, highest accepted share of changed pixels, and the
+# channel delta (0-1) that counts a pixel as changed
+MIN_SSIM = 0.98
+MAX_CHANGED = 0.005
+PIXEL_THRESHOLD = 0.1
+
+# name: (state patch, script run after the patch or None)
+CASES = {
+    "plow_lvl_1": ({"plowLevel": 1}, None),
+    "plow_lvl_3": ({"plowLevel": 3}, None),
+    "plow_lvl_6": ({"plowLevel": 6}, None),
+    "dozer_lvl_1": ({"dozerLevel": 1, "plowLevel": 1}, None),
+    "dozer_lvl_5": ({"dozerLevel": 5, "plowLevel": 1}, None),
+    "dozer_lvl_10": ({"dozerLevel": 10, "plowLevel": 1}, None),
+    # Coin drop frozen halfway through its 800 ms flight to the money counter
+    "coin_drop": ({}, """() => {
+        window.spawnCoinDrop(100, { x: 0, y: 0 });
+        document.getAnimations().forEach(a => { a.pause(); a.currentTime = 400; });
+        return window.frameSync.request(1);
+    }"""),
+}
+
+# mulberry32, installed before any module runs so gem layout and noise textures repeat
+SEEDED_RANDOM = """(seed => {
+    let a = seed >>> 0;
+    Math.random = () => {
+        a = (a + 0x6D2B79F5) >>> 0;
+        let t = a;
+        t = Math.imul(t ^ (t >>> 15), t | 1);
+        t ^= t + Math.imul(t ^ (t >>> 7), t | 61);
+        return ((t ^ (t >>> 14)) >>> 0) / 4294967296;
+    };
+})(%d);"""
+
+# --- Capture ---
+def capture_steps(base_url, name, path):
+    """Page calls (see bench_physics.drive) that apply case `name` and screenshot it to `path`."""
+    patch, script = CASES[name]
+    yield lambda page: page.goto(f"{base_url}/index.html")
+    yield lambda page: page.wait_for_function("() => window.applyStateAndRender !== undefined && window.frameSync !== undefined")
+    # Two frames: the first can still carry the previous camera zoom
+    yield lambda page: page.evaluate("(p) => window.applyStateAndRender(p, 2)", patch)
+    if script:
+        yield lambda page: page.evaluate(script)
+    yield lambda page: page.screenshot(path=path, mask=[page.locator(s) for s in MASKED], animations="allow")
+
+async def capture(browser, base_url, name, semaphore, out_dir):
+    path = os.path.join(out_dir, f"{name}.png")
+    async with semaphore:
+        context = await browser.new_context(viewport=VIEWPORT, device_scale_factor=1)
+        try:
+            await context.add_init_script(SEEDED_RANDOM % SEED)
+            page = await context.new_page()
+            errors = []
+            page.on("pageerror", lambda exc: errors.append(str(exc)))
+            await drive_async(page, capture_steps(base_url, name, path))
+        finally:
+            await context.close()
+    return name, path, errors
+
+async def capture_all(names, out_dir, jobs):
+    server = start_server()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    semaphore = asyncio.Semaphore(jobs)
+    try:
+        async with async_playwright() as p:
+            browser = await p.chromium.launch(headless=True)
+            try:
+                return await asyncio.gather(*(capture(browser, base_url, n, semaphore, out_dir) for n in names))
+            finally:
+                await browser.close()
+    finally:
+        server.shutdown()
+
+# --- Comparison ---
+def load_rgb(path):
+    with Image.open(path) as img:
+        return np.asarray(img.convert("RGB"), dtype=np.float64) / 255.0
+
+def gaussian_blur(img, sigma=1.5, radius=5):
+    """Separable Gaussian over the last two axes (edge-padded), as shifted weighted sums."""
+    x = np.arange(-radius, radius + 1)
+    kernel = np.exp(-(x * x) / (2 * sigma * sigma))
+    kernel /= kernel.sum()
+    size = 2 * radius + 1
+    padded = np.pad(img, radius, mode="edge")
+    rows = sum(w * padded[k:k + padded.shape[0] - size + 1, :] for k, w in enumerate(kernel))
+    return sum(w * rows[:, k:k + rows.shape[1] - size + 1] for k, w in enumerate(kernel))
+
+def ssim_map(a, b):
+    """SSIM (Wang et al. 2004) on Rec. 601 luminance with an 11x11 Gaussian window."""
+    luma = np.array([0.299, 0.587, 0.114])
+    x, y = a @ luma, b @ luma
+    c1, c2 = 0.01 ** 2, 0.03 ** 2
+    mu_x, mu_y = gaussian_blur(x), gaussian_blur(y)
+    var_x = gaussian_blur(x * x) - mu_x * mu_x
+    var_y = gaussian_blur(y * y) - mu_y * mu_y
+    cov = gaussian_blur(x * y) - mu_x * mu_y
+    return ((2 * mu_x * mu_y + c1) * (2 * cov + c2)) / ((mu_x ** 2 + mu_y ** 2 + c1) * (var_x + var_y + c2))
+
+def compare_images(current, baseline, pixel_threshold):
+    delta = np.abs(current - baseline)
+    changed = delta.max(axis=2) > pixel_threshold
+    ssim = ssim_map(current, baseline)
+    return {
+        "ssim": float(ssim.mean()),
+        "changedFraction": float(changed.mean()),
+        "maxDelta": float(delta.max()),
+        "channelMeanDelta": [float(v) for v in delta.mean(axis=(0, 1))],
+    }, changed, ssim
+
+def write_heatmap(baseline, changed, ssim, path):
+    """Dimmed grey baseline with structural loss in red and changed pixels in yellow."""
+    grey = (baseline.mean(axis=2, keepdims=True) * 0.4).repeat(3, axis=2)
+    loss = np.clip(1.0 - ssim, 0.0, 1.0)[..., None] * 4.0
+    heat = np.clip(grey + loss * np.array([1.0, 0.0, 0.0]), 0.0, 1.0)
+    heat[changed] = np.maximum(heat[changed], [1.0, 1.0, 0.0])
+    Image.fromarray((heat * 255).astype(np.uint8)).save(path)
+
+def check_capture(name, path, min_ssim=MIN_SSIM, max_changed=MAX_CHANGED, pixel_threshold=PIXEL_THRESHOLD):
+    """Compares a capture with its baseline. Returns (stats or None, failures); failing cases get a heatmap."""
+    baseline_path = os.path.join(BASELINE_DIR, f"{name}.png")
+    if not os.path.exists(baseline_path):
+        return None, [f"{name}: no baseline (run with --update-baseline)"]
+    current, baseline = load_rgb(path), load_rgb(baseline_path)
+    if current.shape != baseline.shape:
+        return None, [f"{name}: size {current.shape[1]}x{current.shape[0]} vs baseline {baseline.shape[1]}x{baseline.shape[0]}"]
+    stats, changed, ssim = compare_images(current, baseline, pixel_threshold)
+    if stats["ssim"] >= min_ssim and stats["changedFraction"] <= max_changed:
+        return stats, []
+    heatmap = os.path.join(REPORT_DIR, f"{name}.diff.png")
+    os.makedirs(REPORT_DIR, exist_ok=True)
+    write_heatmap(baseline, changed, ssim, heatmap)
+    return stats, [f"{name}: SSIM {stats['ssim']:.4f} (min {min_ssim}), changed {stats['changedFraction'] * 100:.2f}% "
+                   f"(max {max_changed * 100:.2f}%); see {os.path.relpath(heatmap, ROOT_DIR)}"]
+
+# --- Execution ---
+def main():
+    parser = argparse.ArgumentParser(description="Screenshot game states and diff them against baselines.")
+    parser.add_argument("cases", nargs="*", help=f"Cases to run (default: all of {', '.join(CASES)})")
+    parser.add_argument("--jobs", type=int, default=4, help="Concurrent pages")
+    parser.add_argument("--update-baseline", action="store_true", help="Store these captures as the baselines")
+    parser.add_argument("--min-ssim", type=float, default=MIN_SSIM, help="Lowest accepted mean SSIM")
+    parser.add_argument("--max-changed", type=float, default=MAX_CHANGED, help="Highest accepted share of changed pixels")
+    parser.add_argument("--pixel-threshold", type=float, default=PIXEL_THRESHOLD, help="Channel delta (0-1) that counts a pixel as changed")
+    args = parser.parse_args()
+
+    names = args.cases or list(CASES)
+    unknown = [n for n in names if n not in CASES]
+    if unknown:
+        parser.error(f"unknown case(s): {', '.join(unknown)}")
+
+    out_dir = BASELINE_DIR if args.update_baseline else REPORT_DIR
+    os.makedirs(out_dir, exist_ok=True)
+    captures = asyncio.run(capture_all(names, out_dir, max(1, args.jobs)))
+
+    failures = []
+    for name, path, errors in captures:
+        failures += [f"{name}: page error {e}" for e in errors]
+        if args.update_baseline:
+            print(f"   [VISUAL] {name}: baseline stored")
+            continue
+        stats, problems = check_capture(name, path, args.min_ssim, args.max_changed, args.pixel_threshold)
+        if stats:
+            print(f"   [VISUAL] {name}: SSIM {stats['ssim']:.4f}, changed {stats['changedFraction'] * 100:.2f}%, max delta {stats['maxDelta']:.3f}")
+        failures += problems
+
+    for failure in failures:
+        print(f"   [REGRESSION] {failure}")
+    if failures:
+        print(f"❌ {len(failures)} visual regression(s)")
+        return 1
+    print(f"✅ {len(captures)} case(s) {'recorded' if args.update_baseline else 'match their baselines'}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())